@@ -12,23 +12,140 @@ import os
 import sys
 import threading
 import time
+import struct
+import concurrent.futures
+from contextlib import contextmanager
+from functools import lru_cache
 import numpy as np
 import cv2
-from PIL import Image, ImageTk
+from PIL import Image
 
 # 添加项目根目录到Python路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # 导入项目模块
+# 注：格密码/秘密共享/隐写模块较重 (含 Numba JIT 编译)，改为首次使用时延迟导入，
+# 见 StegoApp._get_* 系列方法
 from src.config import Config
-from src.crypto_lattice.keygen import KeyGenerator
-from src.crypto_lattice.signer import ThresholdSigner, SignatureAggregator
-from src.secret_sharing.splitter import ImageCRTSplitter
-from src.secret_sharing.reconstructor import ImageCRTReconstructor
-from src.image_stego.orchestrator import Module3Orchestrator
-from src.image_stego.img_process import ImageProcessor
-from src.image_stego.dct_embed import DCTEmbedder
-from src.image_stego.dct_extract import DCTExtractor
+
+# 签名二进制格式: 头部 <版本(B), 行数(H), 列数(H)> + int32 小端系数
+# 系数取值可达 Q-1 (约 2^23)，超出 int16 范围，故使用 int32
+_SIG_HEADER = struct.Struct('<BHH')
+_SIG_VERSION = 1
+
+# 日志面板保留的最大行数
+LOG_MAX_LINES = 2000
+
+# 中间结果PNG的快速压缩参数：低压缩级别 + RLE策略，zlib耗时显著降低而体积略增
+PNG_FAST_PARAMS = [cv2.IMWRITE_PNG_COMPRESSION, 1,
+                   cv2.IMWRITE_PNG_STRATEGY, cv2.IMWRITE_PNG_STRATEGY_RLE]
+PNG_FAST_LEVEL = 1
+
+
+class TaskCancelled(Exception):
+    """
+    后台任务在检查点发现用户已取消时抛出
+    """
+
+
+def _pack_signature(signature):
+    """
+    将签名多项式向量 (L x N) 序列化为紧凑的二进制字节串
+    """
+    sig_arr = np.ascontiguousarray(signature, dtype='<i4')
+    return _SIG_HEADER.pack(_SIG_VERSION, *sig_arr.shape) + sig_arr.tobytes()
+
+
+def _unpack_signature(data):
+    """
+    解析 _pack_signature 生成的字节串，返回 (L, N) int32 矩阵；格式不符时返回None
+    """
+    if not data or len(data) < _SIG_HEADER.size:
+        return None
+    version, rows, cols = _SIG_HEADER.unpack_from(data)
+    body = memoryview(data)[_SIG_HEADER.size:]
+    if version != _SIG_VERSION or len(body) != rows * cols * 4:
+        return None
+    return np.frombuffer(body, dtype='<i4').reshape(rows, cols)
+
+
+def _fit_thumbnail(img, max_width, max_height, bgr=True):
+    """
+    将BGR/灰度图像等比缩放到指定范围内，并转换为RGB
+    bgr为False时表示输入已是RGB，不再转换通道顺序
+    """
+    # 调整图像大小以适应标签 (INTER_AREA 适合缩小)
+    height, width = img.shape[:2]
+    if width > max_width or height > max_height:
+        ratio = min(max_width / width, max_height / height)
+        new_width = max(1, int(width * ratio))
+        new_height = max(1, int(height * ratio))
+        img = cv2.resize(img, (new_width, new_height), interpolation=cv2.INTER_AREA)
+
+    # 仅对最终缩略图做 BGR -> RGB 转换
+    if img.ndim == 2:
+        return cv2.cvtColor(img, cv2.COLOR_GRAY2RGB)
+    if not bgr:
+        return np.ascontiguousarray(img)
+    return cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+
+
+def _write_png(path, image, params=PNG_FAST_PARAMS):
+    """
+    在内存中编码PNG后一次性写入文件 (经由系统页缓存，不等待落盘)
+    与 cv2.imwrite 不同，路径交给 Python 处理，含中文的路径在 Windows 下也可写入
+    """
+    ok, encoded = cv2.imencode('.png', image, params)
+    if not ok:
+        raise ValueError(f"PNG编码失败: {path}")
+    
+    view = memoryview(encoded).cast('B')
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+
+@lru_cache(maxsize=4)
+def _read_image_cached(path, mtime):
+    """
+    按 (路径, 修改时间) 缓存解码后的BGR图像，文件被修改后自动重新读取
+    返回只读矩阵，多处共享同一份解码结果
+    """
+    img = cv2.imread(path, cv2.IMREAD_COLOR)
+    if img is None:
+        raise ValueError(f"无法读取图像: {path}")
+    img.setflags(write=False)
+    return img
+
+
+def _photo_from_rgb(rgb):
+    """
+    由RGB矩阵构造Tk图像：拼接二进制PPM (P6) 头部后整块交给Tk解析，
+    避免 ImageTk.PhotoImage 逐块写入像素的开销
+    """
+    height, width = rgb.shape[:2]
+    header = b'P6\n%d %d\n255\n' % (width, height)
+    return tk.PhotoImage(data=header + np.ascontiguousarray(rgb, dtype=np.uint8).tobytes())
+
+
+@lru_cache(maxsize=32)
+def _decode_thumbnail(path, mtime, max_width, max_height):
+    """
+    解码并缩放图像文件，按 (路径, 修改时间, 尺寸) 缓存RGB缩略图矩阵
+    """
+    with Image.open(path) as img:
+        # draft 模式：JPEG 直接按 DCT 缩放解码到接近目标尺寸，跳过全分辨率IDCT
+        img.draft('RGB', (max_width * 2, max_height * 2))
+        rgb = np.asarray(img.convert('RGB'))
+
+    rgb = _fit_thumbnail(rgb, max_width, max_height, bgr=False)
+    rgb.setflags(write=False)  # 缓存共享，禁止就地修改
+    return rgb
+
 
 class StegoApp:
     """
@@ -110,15 +227,11 @@ class StegoApp:
                             background="#4299e1",
                             troughcolor="#e2e8f0")
         
-        # 初始化模块
-        self.image_processor = ImageProcessor()
-        self.crt_splitter = ImageCRTSplitter()
-        self.crt_reconstructor = ImageCRTReconstructor()
-        self.stego_orchestrator = Module3Orchestrator()
-        self.embedder = DCTEmbedder()
-        self.extractor = DCTExtractor()
-        self.keygen = KeyGenerator()
-        self.aggregator = SignatureAggregator()
+        # 模块实例延迟创建 (首次使用或切换到对应标签页时预热)
+        self._image_processor = self._crt_splitter = self._crt_reconstructor = None
+        self._stego_orchestrator = self._embedder = self._extractor = None
+        self._keygen = self._aggregator = None
+        self._lazy_lock = threading.Lock()
         
         # 变量初始化
         self.carrier_image_path = ""
@@ -129,6 +242,34 @@ class StegoApp:
         self.extracted_share_paths = []
         self.stego_paths = []
         self.is_processing = False
+        self._last_idle_ts = 0.0  # 上次 update_idletasks 的时间 (见 _throttled_idle)
+        # 每个后台任务各有一个取消事件 (由“取消”按钮置位，工作函数在检查点响应)；
+        # 工作线程经线程局部变量取得自己任务的事件，新任务不会“撤销”旧任务的取消
+        self._current_future = None  # 当前占用 is_processing 的任务
+        self._current_cancel = None  # 当前任务的取消事件
+        self._task_local = threading.local()
+        self._sig_cache = {}  # message -> (私钥, 签名)
+        self._cached_keys = None  # (公钥, 私钥)，仅在用户要求重新生成时失效
+        self._signer = None  # 与 _cached_keys 中私钥绑定的签名者实例
+        self._scratch = {}  # (shape, dtype) -> 可复用的工作缓冲区
+        self._thumb_cache = {}  # (路径, 修改时间, 宽, 高) -> PhotoImage
+        self._pending_thumbs = {}  # 标签 -> 正在后台解码的缩略图键
+        self._last_embed = None  # (载体路径, 含密路径, 载体矩阵, 含密矩阵)，供PSNR复用
+        self._last_stego_img = None  # 完整流程最近一次的含密图像 (BGR矩阵)
+        self._last_recovered_img = None  # 完整流程最近一次的重构图像 (PIL.Image)
+        # 完整流程中的倍数映射恒为零：预分配一份只读的 32x32x3 零矩阵反复使用
+        self._zero_mult_map_32 = np.zeros((32, 32, 3), dtype=np.uint8)
+        self._zero_mult_map_32.setflags(write=False)
+        
+        # 常驻工作线程池：耗时操作在此执行，结果通过 root.after 回到Tk主线程
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count())
+        # 任务内部的I/O (如图像解码) 单独使用小线程池，与计算重叠且不占用任务线程
+        self._io_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        
+        # 输出目录在启动时创建一次，之后由 _ensure_dir 记录，不再重复检查
+        self._ensured_dirs = set()
+        self._ensure_dir(Config.STEGO_DIR)
+        self._ensure_dir(Config.SHARES_DIR)
         
         # 设置窗口背景色
         self.root.configure(bg="#f7fafc")
@@ -281,6 +422,11 @@ class StegoApp:
                   width=20, 
                   style="TButton").pack(pady=12, fill=tk.X)
         
+        ttk.Button(buttons_frame, text="重新生成密钥", 
+                  command=self.regenerate_keys, 
+                  width=20, 
+                  style="TButton").pack(pady=12, fill=tk.X)
+        
         ttk.Button(buttons_frame, text="生成签名", 
                   command=self.generate_signature, 
                   width=20, 
@@ -572,87 +718,159 @@ class StegoApp:
         生成格密码密钥对
         """
         def task():
-            try:
-                self.update_status("正在生成密钥对...")
-                self.show_progress("生成格密码密钥对...", 0)
-                self.lattice_log.insert(tk.END, "开始生成密钥对...\n")
-                self.lattice_log.see(tk.END)
-                
-                # 生成密钥对
-                self.show_progress("生成格密码密钥对...", 30)
-                pk, sk = self.keygen.generate_keys()
-                
-                self.show_progress("生成格密码密钥对...", 100)
-                self.lattice_log.insert(tk.END, "密钥对生成成功！\n")
-                self.lattice_log.insert(tk.END, f"公钥大小: {Config.PK_SIZE_BYTES} 字节\n")
-                self.lattice_log.insert(tk.END, f"私钥包含 {len(sk['s1'])} 个多项式\n")
-                self.lattice_log.see(tk.END)
-                
-                # 保存密钥（仅在内存中）
-                self.pk = pk
-                self.sk = sk
-                
-                self.update_status("密钥对生成成功")
-                self.hide_progress()
-                messagebox.showinfo("成功", "密钥对生成成功！")
-                
-            except Exception as e:
-                self.lattice_log.insert(tk.END, f"生成密钥对失败: {str(e)}\n")
-                self.lattice_log.see(tk.END)
-                self.update_status(f"生成密钥对失败: {str(e)}")
-                self.hide_progress()
-                messagebox.showerror("错误", f"生成密钥对失败: {str(e)}")
+            # 生成密钥对 (show_progress 可在工作线程调用，会自动转交主线程)
+            self.show_progress("生成格密码密钥对...", 30)
+            pk, sk = self._get_keygen().generate_keys()
+            self.show_progress("生成格密码密钥对...", 100)
+            return pk, sk
+        
+        if self.run_in_thread(task, on_done=self._on_generate_keys_done) is None:
+            return
+        
+        self.update_status("正在生成密钥对...")
+        self.show_progress("生成格密码密钥对...", 0)
+        self._append_log(self.lattice_log, "开始生成密钥对...\n")
+    
+    def _on_generate_keys_done(self, pk, sk):
+        """
+        密钥生成完成回调（Tk主线程）
+        """
+        with self._buffered_log(self.lattice_log) as log:
+            log("密钥对生成成功！\n")
+            log(f"公钥大小: {Config.PK_SIZE_BYTES} 字节\n")
+            log(f"私钥包含 {len(sk['s1'])} 个多项式\n")
+        
+        # 保存密钥（仅在内存中）
+        self.pk = pk
+        self.sk = sk
+        self._cached_keys = (pk, sk)
         
-        self.run_in_thread(task)
+        self.update_status("密钥对生成成功")
+        self.hide_progress()
+        messagebox.showinfo("成功", "密钥对生成成功！")
     
     def generate_signature(self):
         """
         生成格密码签名
         """
         try:
-            if not hasattr(self, 'sk'):
+            if self._cached_keys is None:
                 raise ValueError("请先生成密钥对")
+        except Exception as e:
+            messagebox.showerror("错误", f"生成签名失败: {str(e)}")
+            return
+        
+        if not self._submit(self._generate_signature_worker, self._on_generate_signature_done):
+            return
+        
+        self.lattice_log.insert(tk.END, "开始生成签名...\n")
+        self.lattice_log.see(tk.END)
+    
+    def _generate_signature_worker(self):
+        """
+        签名工作函数（在线程池中执行，不访问Tk控件）
+        返回:
+            聚合后的签名，全部尝试被拒绝时返回None
+        """
+        return self._ensure_signature(b"Hello Quantum World", log_widget=self.lattice_log)
+    
+    def _ensure_signature(self, message, log_widget=None):
+        """
+        获取消息的门限签名（工作线程中调用）
+        仅在尚无密钥时生成密钥；同一消息在同一私钥下只签名一次，结果缓存于 self._sig_cache
+        参数:
+            message: 待签名消息 (bytes)
+            log_widget: 可选，输出尝试次数的日志控件
+        返回:
+            聚合后的签名，全部尝试被拒绝时返回None
+        """
+        pk, sk = self._ensure_keys()
+        
+        # 缓存项记录签名所用私钥，重新生成密钥后自动失效
+        cached = self._sig_cache.get(message)
+        if cached is not None and cached[0] is sk:
+            return cached[1]
+        
+        signer = self._get_signer(sk)
+        aggregator = self._get_aggregator()
+        
+        # 阶段1: 一次生成 max_attempts 组候选掩码的承诺，并分别聚合
+        max_attempts = 5
+        W_shares = signer.phase1_commitment_batch(max_attempts)
+        W_sums = [aggregator.aggregate_w_shares([W_share]) for W_share in W_shares]
+        
+        # 阶段2: 批量生成响应并做拒绝检查，取第一个通过的候选
+        candidates, flags = signer.phase2_response_batch(W_sums, message)
+        idx = int(np.argmax(flags))
+        z_share = candidates[idx] if flags[idx] else None
+        
+        if log_widget is not None:
+            accepted = int(np.count_nonzero(flags))
+            self._post(self._append_log, log_widget,
+                       f"批量尝试 {max_attempts} 组掩码，{accepted} 组通过拒绝采样\n")
+        
+        if z_share is None:
+            return None
+        
+        # 聚合响应
+        signature = aggregator.aggregate_responses([z_share])
+        self._sig_cache[message] = (sk, signature)
+        return signature
+    
+    def _ensure_keys(self):
+        """
+        获取缓存的密钥对，尚无密钥时生成一次 (工作线程中调用)
+        """
+        if self._cached_keys is None:
+            self._cached_keys = self._get_keygen().generate_keys()
+            self.pk, self.sk = self._cached_keys
+        return self._cached_keys
+    
+    def _get_signer(self, sk):
+        """
+        获取绑定私钥 sk 的签名者；构造时需展开公共矩阵A，故按私钥复用
+        """
+        if self._signer is None or self._signer.sk is not sk:
+            from src.crypto_lattice.signer import ThresholdSigner
+            self._signer = ThresholdSigner(sk, 0)
+        return self._signer
+    
+    def regenerate_keys(self):
+        """
+        使缓存的密钥对失效，下次签名时重新生成
+        """
+        if self.is_processing:
+            self.update_status("已有任务正在执行，请稍候")
+            return
+        
+        self._cached_keys = None
+        self._signer = None
+        self._sig_cache.clear()
+        for attr in ('pk', 'sk', 'signature'):
+            if hasattr(self, attr):
+                delattr(self, attr)
+        
+        self._append_log(self.lattice_log, "已清除缓存的密钥对，下次签名时将重新生成\n")
+        self.update_status("密钥对已失效")
+    
+    def _on_generate_signature_done(self, future):
+        """
+        签名完成回调（Tk主线程）
+        """
+        try:
+            Z_sum = future.result()
             
-            self.lattice_log.insert(tk.END, "开始生成签名...\n")
-            self.lattice_log.see(tk.END)
-            
-            # 创建签名者实例
-            signer = ThresholdSigner(self.sk, 0)
-            
-            # 阶段1: 生成承诺
-            W_share = signer.phase1_commitment()
-            
-            # 聚合承诺
-            W_sum = self.aggregator.aggregate_commitments([W_share])
-            
-            # 阶段2: 生成挑战
-            message = b"Hello Quantum World"
-            challenge_c = self.aggregator.derive_challenge(message, W_sum)
-            
-            # 阶段3: 生成响应
-            max_attempts = 5
-            for attempt in range(max_attempts):
-                self.lattice_log.insert(tk.END, f"尝试生成签名 ({attempt+1}/{max_attempts})...\n")
-                self.lattice_log.see(tk.END)
-                
-                z_share = signer.phase2_response(challenge_c)
-                if z_share is not None:
-                    break
-            
-            if z_share is not None:
-                # 聚合响应
-                Z_sum = self.aggregator.aggregate_responses([z_share])
-                
-                self.lattice_log.insert(tk.END, "签名生成成功！\n")
-                self.lattice_log.insert(tk.END, f"签名包含 {len(Z_sum)} 个多项式\n")
-                self.lattice_log.see(tk.END)
+            if Z_sum is not None:
+                with self._buffered_log(self.lattice_log) as log:
+                    log("签名生成成功！\n")
+                    log(f"签名包含 {len(Z_sum)} 个多项式\n")
                 
                 # 保存签名
                 self.signature = Z_sum
             else:
                 self.lattice_log.insert(tk.END, "签名生成失败：所有尝试都被拒绝\n")
                 self.lattice_log.see(tk.END)
-                messagebox.warning("警告", "签名生成失败：所有尝试都被拒绝")
+                messagebox.showwarning("警告", "签名生成失败：所有尝试都被拒绝")
                 
         except Exception as e:
             self.lattice_log.insert(tk.END, f"生成签名失败: {str(e)}\n")
@@ -671,9 +889,9 @@ class StegoApp:
             self.lattice_log.see(tk.END)
             
             # 这里仅做模拟验证，实际验证需要完整的验证算法
-            self.lattice_log.insert(tk.END, "签名验证成功！\n")
-            self.lattice_log.insert(tk.END, "（注：这里是模拟验证，实际验证需要完整的验证算法）\n")
-            self.lattice_log.see(tk.END)
+            with self._buffered_log(self.lattice_log) as log:
+                log("签名验证成功！\n")
+                log("（注：这里是模拟验证，实际验证需要完整的验证算法）\n")
             
             messagebox.showinfo("成功", "签名验证成功！")
             
@@ -687,8 +905,9 @@ class StegoApp:
         清除格密码日志
         """
         self.lattice_log.delete(1.0, tk.END)
-        self.lattice_log.insert(tk.END, "格密码门限签名系统已初始化\n")
-        self.lattice_log.insert(tk.END, "点击按钮执行相应操作\n")
+        with self._buffered_log(self.lattice_log) as log:
+            log("格密码门限签名系统已初始化\n")
+            log("点击按钮执行相应操作\n")
     
     def select_crt_secret_image(self):
         """
@@ -712,33 +931,40 @@ class StegoApp:
         try:
             if not self.secret_image_path:
                 raise ValueError("请选择秘密图像")
+        except Exception as e:
+            messagebox.showerror("错误", f"图像分割失败: {str(e)}")
+            return
+        
+        self._submit(self._split_image_worker, self._on_split_done)
+    
+    def _split_image_worker(self):
+        """
+        图像分割工作函数（在线程池中执行）
+        返回:
+            (share_paths, signature)
+        """
+        # 生成签名数据（已有签名时直接复用）
+        signature = getattr(self, 'signature', None)
+        if signature is None:
+            signature = self._ensure_signature(b"CRT Secret Sharing")
+            if signature is None:
+                raise ValueError("无法生成签名")
+        
+        signature_data = _pack_signature(signature)
+        self._check_cancel()
+        
+        # 分割图像 (全部份额以 SoA 布局写入单个 shares.npz)
+        share_paths = self._get_crt_splitter().split_image(self.secret_image_path, signature_data=signature_data, bundle=True)
+        return share_paths, signature
+    
+    def _on_split_done(self, future):
+        """
+        图像分割完成回调（Tk主线程）
+        """
+        try:
+            self.share_paths, self.signature = future.result()
             
-            # 生成签名数据（模拟）
-            if not hasattr(self, 'signature'):
-                pk, sk = self.keygen.generate_keys()
-                signer = ThresholdSigner(sk, 0)
-                W_share = signer.phase1_commitment()
-                W_sum = self.aggregator.aggregate_commitments([W_share])
-                message = b"CRT Secret Sharing"
-                challenge_c = self.aggregator.derive_challenge(message, W_sum)
-                
-                max_attempts = 5
-                for attempt in range(max_attempts):
-                    z_share = signer.phase2_response(challenge_c)
-                    if z_share is not None:
-                        break
-                
-                if z_share is None:
-                    raise ValueError("无法生成签名")
-                
-                self.signature = z_share
-            
-            signature_data = str(self.signature).encode('utf-8')
-            
-            # 分割图像
-            self.share_paths = self.crt_splitter.split_image(self.secret_image_path, signature_data=signature_data)
-            
-            messagebox.showinfo("成功", f"图像分割成功！生成了 {len(self.share_paths)} 个份额")
+            messagebox.showinfo("成功", f"图像分割成功！生成了 {self._get_crt_splitter().n} 个份额")
             
         except Exception as e:
             messagebox.showerror("错误", f"图像分割失败: {str(e)}")
@@ -749,7 +975,7 @@ class StegoApp:
         """
         file_paths = filedialog.askopenfilenames(
             title="选择份额文件",
-            filetypes=[("NumPy文件", "*.npy"), ("所有文件", "*.*")]
+            filetypes=[("份额包", "*.npz"), ("NumPy文件", "*.npy"), ("所有文件", "*.*")]
         )
         if file_paths:
             self.share_paths = list(file_paths)
@@ -763,28 +989,63 @@ class StegoApp:
             if not self.share_paths:
                 raise ValueError("请选择份额文件")
             
-            # 确保至少选择了t个份额
-            if len(self.share_paths) < Config.T_THRESHOLD:
+            # 确保至少选择了t个份额 (份额包内含全部份额，由重构器按实际数量校验)
+            is_bundle = any(path.endswith(".npz") for path in self.share_paths)
+            if not is_bundle and len(self.share_paths) < Config.T_THRESHOLD:
                 raise ValueError(f"至少需要选择 {Config.T_THRESHOLD} 个份额")
+        except Exception as e:
+            messagebox.showerror("错误", f"图像重构失败: {str(e)}")
+            return
+        
+        self._submit(self._reconstruct_image_worker, self._on_reconstruct_done, list(self.share_paths))
+    
+    def _reconstruct_image_worker(self, share_paths):
+        """
+        图像重构工作函数（在线程池中执行）
+        返回:
+            (重构图像, 保存路径, 恢复出的签名矩阵或None)
+        注：图像在此不写盘，由完成回调先显示预览，再在后台保存
+        """
+        # 重构图像
+        reconstructed_img, recovered_sig = self._get_crt_reconstructor().reconstruct_image(
+            share_paths, cancel_event=self._task_cancel_event())
+        signature = _unpack_signature(recovered_sig)
+        
+        output_dir = os.path.join(Config.DATASET_DIR, "reconstructed")
+        self._ensure_dir(output_dir)
+        
+        output_path = os.path.join(output_dir, "reconstructed_image.png")
+        return reconstructed_img, output_path, signature
+    
+    def _on_reconstruct_done(self, future):
+        """
+        图像重构完成回调（Tk主线程）
+        """
+        try:
+            reconstructed_img, output_path, self.recovered_signature = future.result()
             
-            # 重构图像
-            reconstructed_img, recovered_sig = self.crt_reconstructor.reconstruct_image(self.share_paths)
-            
-            # 保存重构图像
-            output_dir = os.path.join(Config.DATASET_DIR, "reconstructed")
-            os.makedirs(output_dir, exist_ok=True)
-            
-            self.reconstructed_image_path = os.path.join(output_dir, "reconstructed_image.png")
-            reconstructed_img.save(self.reconstructed_image_path)
+            # 直接由内存图像显示预览，省去一次PNG编码+解码
+            self.display_image(self.crt_reconstructed_image_label, reconstructed_img)
             
-            # 显示重构图像
-            self.display_image(self.crt_reconstructed_image_label, self.reconstructed_image_path)
+            # PNG编码与写盘在后台执行
+            self.reconstructed_image_path = output_path
+            save_future = self.executor.submit(reconstructed_img.save, output_path,
+                                               format='PNG', compress_level=PNG_FAST_LEVEL)
+            save_future.add_done_callback(self._on_reconstruct_saved)
             
             messagebox.showinfo("成功", "图像重构成功！")
             
         except Exception as e:
             messagebox.showerror("错误", f"图像重构失败: {str(e)}")
     
+    def _on_reconstruct_saved(self, future):
+        """
+        重构图像后台保存完成回调（工作线程），失败时在主线程提示
+        """
+        error = future.exception()
+        if error is not None:
+            self._post(messagebox.showerror, "错误", f"保存重构图像失败: {str(error)}")
+    
     def select_stego_carrier(self):
         """
         选择隐写载体图像
@@ -817,46 +1078,66 @@ class StegoApp:
         """
         嵌入数据到载体图像
         """
-        def task():
-            try:
-                if not self.carrier_image_path:
-                    raise ValueError("请选择载体图像")
-                
-                if not self.stego_image_path:
-                    raise ValueError("请选择保存路径")
-                
-                self.update_status("正在嵌入数据...")
-                self.show_progress("嵌入数据到载体图像...", 0)
-                
-                # 读取载体图像
-                self.show_progress("嵌入数据到载体图像...", 20)
-                carrier = self.image_processor.read_image(self.carrier_image_path)
-                
-                # 生成测试数据
-                test_data = b"This is a test message for steganography"
-                
-                # 嵌入数据
-                self.show_progress("嵌入数据到载体图像...", 60)
-                stego = self.embedder.embed(carrier, test_data)
-                
-                # 保存含密图像
-                self.show_progress("嵌入数据到载体图像...", 80)
-                self.image_processor.save_image(stego, self.stego_image_path)
-                
-                # 显示含密图像
-                self.show_progress("嵌入数据到载体图像...", 100)
-                self.display_image(self.stego_stego_label, self.stego_image_path)
-                
-                self.update_status("数据嵌入成功")
-                self.hide_progress()
-                messagebox.showinfo("成功", "数据嵌入成功！")
-                
-            except Exception as e:
-                self.update_status(f"数据嵌入失败: {str(e)}")
-                self.hide_progress()
-                messagebox.showerror("错误", f"数据嵌入失败: {str(e)}")
+        try:
+            if not self.carrier_image_path:
+                raise ValueError("请选择载体图像")
+            
+            if not self.stego_image_path:
+                raise ValueError("请选择保存路径")
+        except Exception as e:
+            messagebox.showerror("错误", f"数据嵌入失败: {str(e)}")
+            return
+        
+        if not self._submit(self._embed_data_worker, self._on_embed_done,
+                            self.carrier_image_path, self.stego_image_path):
+            return
+        
+        self.update_status("正在嵌入数据...")
+        self.show_progress("嵌入数据到载体图像...", 0)
+    
+    def _embed_data_worker(self, carrier_path, stego_path):
+        """
+        数据嵌入工作函数（在线程池中执行）
+        返回:
+            (含密图像的保存路径, 载体矩阵, 含密矩阵)
+        """
+        # 读取载体图像
+        self._progress_checkpoint("嵌入数据到载体图像...", 20)
+        carrier = self._read_cached(carrier_path)
+        
+        # 生成测试数据
+        test_data = b"This is a test message for steganography"
         
-        self.run_in_thread(task)
+        # 嵌入数据
+        self._progress_checkpoint("嵌入数据到载体图像...", 60)
+        stego = self._get_embedder().embed(
+            carrier, test_data, out=self._scratch_like(carrier.shape, np.float32))
+        
+        # 保存含密图像
+        self._progress_checkpoint("嵌入数据到载体图像...", 80)
+        self._get_image_processor().save_image(stego, stego_path)
+        return stego_path, carrier, stego
+    
+    def _on_embed_done(self, future):
+        """
+        数据嵌入完成回调（Tk主线程）
+        """
+        try:
+            stego_path, carrier, stego = future.result()
+            self._last_embed = (self.carrier_image_path, stego_path, carrier, stego)
+            
+            # 显示含密图像
+            self.show_progress("嵌入数据到载体图像...", 100)
+            self.display_image(self.stego_stego_label, stego_path)
+            
+            self.update_status("数据嵌入成功")
+            self.hide_progress()
+            messagebox.showinfo("成功", "数据嵌入成功！")
+            
+        except Exception as e:
+            self.update_status(f"数据嵌入失败: {str(e)}")
+            self.hide_progress()
+            messagebox.showerror("错误", f"数据嵌入失败: {str(e)}")
     
     def extract_data(self):
         """
@@ -865,12 +1146,25 @@ class StegoApp:
         try:
             if not self.stego_image_path:
                 raise ValueError("请先生成含密图像")
-            
-            # 读取含密图像
-            stego = self.image_processor.read_image(self.stego_image_path)
-            
-            # 提取数据
-            extracted_data = self.extractor.extract(stego)
+        except Exception as e:
+            messagebox.showerror("错误", f"数据提取失败: {str(e)}")
+            return
+        
+        self._submit(self._extract_data_worker, self._on_extract_done, self.stego_image_path)
+    
+    def _extract_data_worker(self, stego_path):
+        """
+        数据提取工作函数（在线程池中执行）
+        """
+        # 提取数据 (提取器按路径自行解码含密图像，此处无需预先读取)
+        return self._get_extractor().extract(stego_path)
+    
+    def _on_extract_done(self, future):
+        """
+        数据提取完成回调（Tk主线程）
+        """
+        try:
+            extracted_data = future.result()
             
             messagebox.showinfo("成功", f"数据提取成功！\n提取的数据: {extracted_data.decode('utf-8', errors='replace')}")
             
@@ -888,12 +1182,17 @@ class StegoApp:
             if not self.stego_image_path:
                 raise ValueError("请先生成含密图像")
             
-            # 读取图像
-            carrier = self.image_processor.read_image(self.carrier_image_path)
-            stego = self.image_processor.read_image(self.stego_image_path)
+            # 优先复用嵌入步骤留在内存中的图像，路径变化时才重新读取
+            last = self._last_embed
+            if last is not None and last[:2] == (self.carrier_image_path, self.stego_image_path):
+                carrier, stego = last[2], last[3]
+            else:
+                # 与嵌入步骤共用解码缓存
+                carrier = self._read_cached(self.carrier_image_path)
+                stego = self._read_cached(self.stego_image_path)
             
             # 计算PSNR
-            psnr = self.image_processor.calculate_psnr(carrier, stego)
+            psnr = self._get_image_processor().calculate_psnr(carrier, stego)
             
             messagebox.showinfo("PSNR计算结果", f"PSNR值: {psnr:.2f} dB")
             
@@ -928,169 +1227,200 @@ class StegoApp:
         """
         执行完整的嵌入流程
         """
-        def task():
-            try:
-                if not self.carrier_image_path:
-                    raise ValueError("请选择载体图像")
-                
-                if not self.secret_image_path:
-                    raise ValueError("请选择秘密图像")
-                
-                self.update_status("正在执行嵌入流程...")
-                self.show_progress("执行完整嵌入流程...", 0)
-                self.full_process_log.insert(tk.END, "开始执行嵌入流程...\n")
-                self.full_process_log.see(tk.END)
-                
-                # 1. 生成签名
-                self.show_progress("执行完整嵌入流程...", 20)
-                self.full_process_log.insert(tk.END, "1. 生成格密码签名...\n")
-                self.full_process_log.see(tk.END)
-                
-                pk, sk = self.keygen.generate_keys()
-                signer = ThresholdSigner(sk, 0)
-                W_share = signer.phase1_commitment()
-                W_sum = self.aggregator.aggregate_commitments([W_share])
-                message = b"Full Process Signature"
-                challenge_c = self.aggregator.derive_challenge(message, W_sum)
-                
-                max_attempts = 5
-                for attempt in range(max_attempts):
-                    z_share = signer.phase2_response(challenge_c)
-                    if z_share is not None:
-                        break
-                
-                if z_share is None:
-                    raise ValueError("无法生成签名")
-                
-                signature_data = str(z_share).encode('utf-8')
-                
-                # 2. 分割秘密图像
-                self.show_progress("执行完整嵌入流程...", 50)
-                self.full_process_log.insert(tk.END, "2. 分割秘密图像...\n")
-                self.full_process_log.see(tk.END)
-                
-                self.share_paths = self.crt_splitter.split_image(self.secret_image_path, signature_data=signature_data)
-                
-                # 3. 嵌入到载体图像
-                self.show_progress("执行完整嵌入流程...", 80)
-                self.full_process_log.insert(tk.END, "3. 嵌入数据到载体图像...\n")
-                self.full_process_log.see(tk.END)
-                
-                # 加载份额数据
-                share_data = np.load(self.share_paths[0], allow_pickle=True).item()
-                remainder_img = share_data['data'].reshape((32, 32, 3))
-                multiple_map = np.zeros_like(remainder_img, dtype=np.uint8)
-                
-                # 执行嵌入
-                stego_img = self.stego_orchestrator.process_step_3_embedding(
-                    self.carrier_image_path,
-                    remainder_img,
-                    multiple_map
-                )
-                
-                # 保存含密图像
-                self.stego_image_path = os.path.join(Config.STEGO_DIR, "full_process_stego.png")
-                os.makedirs(Config.STEGO_DIR, exist_ok=True)
-                cv2.imwrite(self.stego_image_path, stego_img)
-                
-                self.stego_paths = [self.stego_image_path]
-                
-                self.show_progress("执行完整嵌入流程...", 100)
-                self.full_process_log.insert(tk.END, "嵌入流程执行成功！\n")
-                self.full_process_log.insert(tk.END, f"含密图像已保存到: {self.stego_image_path}\n")
-                self.full_process_log.see(tk.END)
-                
-                self.update_status("嵌入流程执行成功")
-                self.hide_progress()
-                messagebox.showinfo("成功", "嵌入流程执行成功！")
-                
-            except Exception as e:
-                self.full_process_log.insert(tk.END, f"嵌入流程执行失败: {str(e)}\n")
-                self.full_process_log.see(tk.END)
-                self.update_status(f"嵌入流程执行失败: {str(e)}")
-                self.hide_progress()
-                messagebox.showerror("错误", f"嵌入流程执行失败: {str(e)}")
+        try:
+            if not self.carrier_image_path:
+                raise ValueError("请选择载体图像")
+            
+            if not self.secret_image_path:
+                raise ValueError("请选择秘密图像")
+        except Exception as e:
+            messagebox.showerror("错误", f"嵌入流程执行失败: {str(e)}")
+            return
+        
+        if not self._submit(self._embedding_process_worker, self._on_embedding_process_done,
+                            self.carrier_image_path, self.secret_image_path):
+            return
+        
+        self.update_status("正在执行嵌入流程...")
+        self.show_progress("执行完整嵌入流程...", 0)
+        self._append_log(self.full_process_log, "开始执行嵌入流程...\n")
+    
+    def _embedding_process_worker(self, carrier_path, secret_path):
+        """
+        完整嵌入流程工作函数（在线程池中执行）
+        返回:
+            (share_paths, stego_image_path, stego_img)
+        """
+        # 载体解码与签名生成互不依赖：OpenCV 解码时释放GIL，可与签名计算并行
+        carrier_future = self._io_pool.submit(self._read_cached, carrier_path)
+        
+        # 1. 生成签名
+        self._post_step("执行完整嵌入流程...", 20, self.full_process_log, "1. 生成格密码签名...\n")
+        
+        z_share = self._ensure_signature(b"Full Process Signature")
+        if z_share is None:
+            raise ValueError("无法生成签名")
+        signature_data = _pack_signature(z_share)
+        
+        # 2. 分割秘密图像
+        self._post_step("执行完整嵌入流程...", 50, self.full_process_log, "2. 分割秘密图像...\n")
+        
+        share_paths = self._get_crt_splitter().split_image(secret_path, signature_data=signature_data, bundle=True)
+        
+        # 3. 嵌入到载体图像
+        self._post_step("执行完整嵌入流程...", 80, self.full_process_log, "3. 嵌入数据到载体图像...\n")
+        
+        # 加载份额数据
+        share_data = self._get_crt_reconstructor().load_bundle(share_paths[0])[0]
+        # 使用份额中记录的形状，而不是假定固定的 32x32x3 (reshape 为零拷贝视图)
+        remainder_img = share_data['data'].reshape(tuple(share_data['shape']))
+        # 编排器只序列化倍数映射、不修改它，形状相符时直接复用预分配的零矩阵
+        if remainder_img.shape == self._zero_mult_map_32.shape:
+            multiple_map = self._zero_mult_map_32
+        else:
+            multiple_map = np.zeros(remainder_img.shape, dtype=np.uint8)
+        
+        # 执行嵌入
+        stego_img = self._get_stego_orchestrator().process_step_3_embedding(
+            carrier_future.result(),
+            remainder_img,
+            multiple_map
+        )
+        
+        # 保存含密图像
+        stego_image_path = os.path.join(Config.STEGO_DIR, "full_process_stego.png")
+        self._ensure_dir(Config.STEGO_DIR)
+        _write_png(stego_image_path, stego_img)
         
-        self.run_in_thread(task)
+        return share_paths, stego_image_path, stego_img
+    
+    def _on_embedding_process_done(self, future):
+        """
+        完整嵌入流程完成回调（Tk主线程）
+        """
+        try:
+            self.share_paths, self.stego_image_path, self._last_stego_img = future.result()
+            self.stego_paths = [self.stego_image_path]
+            
+            self.show_progress("执行完整嵌入流程...", 100)
+            with self._buffered_log(self.full_process_log) as log:
+                log("嵌入流程执行成功！\n")
+                log(f"含密图像已保存到: {self.stego_image_path}\n")
+            
+            self.update_status("嵌入流程执行成功")
+            self.hide_progress()
+            messagebox.showinfo("成功", "嵌入流程执行成功！")
+            
+        except Exception as e:
+            self._append_log(self.full_process_log, f"嵌入流程执行失败: {str(e)}\n")
+            self.update_status(f"嵌入流程执行失败: {str(e)}")
+            self.hide_progress()
+            messagebox.showerror("错误", f"嵌入流程执行失败: {str(e)}")
     
     def execute_extraction_process(self):
         """
         执行完整的提取流程
         """
-        def task():
-            try:
-                if not self.stego_paths:
-                    raise ValueError("请先执行嵌入流程")
-                
-                self.update_status("正在执行提取流程...")
-                self.show_progress("执行完整提取流程...", 0)
-                self.full_process_log.insert(tk.END, "开始执行提取流程...\n")
-                self.full_process_log.see(tk.END)
-                
-                # 1. 提取数据
-                self.show_progress("执行完整提取流程...", 30)
-                self.full_process_log.insert(tk.END, "1. 从含密图像中提取数据...\n")
-                self.full_process_log.see(tk.END)
-                
-                recovered_remainder, recovered_multiple = self.stego_orchestrator.process_step_3_extraction(
-                    self.stego_paths[0]
-                )
-                
-                # 2. 保存提取的份额
-                self.show_progress("执行完整提取流程...", 60)
-                self.full_process_log.insert(tk.END, "2. 保存提取的份额...\n")
-                self.full_process_log.see(tk.END)
-                
-                extracted_share_path = os.path.join(Config.SHARES_DIR, "extracted_share.npy")
-                os.makedirs(Config.SHARES_DIR, exist_ok=True)
-                
-                np.save(extracted_share_path, {
-                    'index': 0,
-                    'modulus': self.crt_splitter.moduli[0],
-                    'shape': recovered_remainder.shape,
-                    'signature': b'test_signature',
-                    'data': recovered_remainder.flatten()
-                })
-                
-                self.extracted_share_paths = [extracted_share_path]
-                
-                # 3. 重构图像
-                self.show_progress("执行完整提取流程...", 90)
-                self.full_process_log.insert(tk.END, "3. 重构秘密图像...\n")
-                self.full_process_log.see(tk.END)
-                
-                # 这里需要至少t个份额，使用原始份额进行测试
-                if len(self.share_paths) >= Config.T_THRESHOLD:
-                    selected_shares = self.share_paths[:Config.T_THRESHOLD]
-                else:
-                    selected_shares = self.share_paths
-                
-                recovered_img, recovered_sig = self.crt_reconstructor.reconstruct_image(selected_shares)
-                
-                # 保存重构图像
-                output_dir = os.path.join(Config.DATASET_DIR, "reconstructed")
-                os.makedirs(output_dir, exist_ok=True)
-                
-                self.reconstructed_image_path = os.path.join(output_dir, "reconstructed_full_process.png")
-                recovered_img.save(self.reconstructed_image_path)
-                
-                self.show_progress("执行完整提取流程...", 100)
-                self.full_process_log.insert(tk.END, "提取流程执行成功！\n")
-                self.full_process_log.insert(tk.END, f"重构图像已保存到: {self.reconstructed_image_path}\n")
-                self.full_process_log.see(tk.END)
-                
-                self.update_status("提取流程执行成功")
-                self.hide_progress()
-                messagebox.showinfo("成功", "提取流程执行成功！")
-                
-            except Exception as e:
-                self.full_process_log.insert(tk.END, f"提取流程执行失败: {str(e)}\n")
-                self.full_process_log.see(tk.END)
-                self.update_status(f"提取流程执行失败: {str(e)}")
-                self.hide_progress()
-                messagebox.showerror("错误", f"提取流程执行失败: {str(e)}")
+        try:
+            if not self.stego_paths:
+                raise ValueError("请先执行嵌入流程")
+        except Exception as e:
+            messagebox.showerror("错误", f"提取流程执行失败: {str(e)}")
+            return
+        
+        if not self._submit(self._extraction_process_worker, self._on_extraction_process_done,
+                            list(self.stego_paths), list(self.share_paths)):
+            return
+        
+        self.update_status("正在执行提取流程...")
+        self.show_progress("执行完整提取流程...", 0)
+        self._append_log(self.full_process_log, "开始执行提取流程...\n")
+    
+    def _extraction_process_worker(self, stego_paths, share_paths):
+        """
+        完整提取流程工作函数（在线程池中执行）
+        返回:
+            (extracted_share_paths, reconstructed_image_path, signature, recovered_img)
+        """
+        # 1. 提取数据
+        self._post_step("执行完整提取流程...", 30, self.full_process_log, "1. 从含密图像中提取数据...\n")
+        
+        recovered_remainder, recovered_multiple = self._get_stego_orchestrator().process_step_3_extraction(
+            stego_paths[0]
+        )
+        
+        # 2. 保存提取的份额
+        self._post_step("执行完整提取流程...", 60, self.full_process_log, "2. 保存提取的份额...\n")
+        
+        extracted_share_path = os.path.join(Config.SHARES_DIR, "extracted_share.npz")
+        self._ensure_dir(Config.SHARES_DIR)
+        
+        # 扁平 .npz 布局：各字段为独立数组，读取时无需 pickle
+        np.savez(
+            extracted_share_path,
+            index=np.int32(0),
+            modulus=np.int64(self._get_crt_splitter().moduli[0]),
+            shape=np.asarray(recovered_remainder.shape, dtype=np.int32),
+            signature=np.frombuffer(b'test_signature', dtype=np.uint8),
+            data=recovered_remainder.ravel()
+        )
+        
+        # 3. 重构图像
+        self._post_step("执行完整提取流程...", 90, self.full_process_log, "3. 重构秘密图像...\n")
+        
+        # 这里需要至少t个份额，使用原始份额进行测试
+        if len(share_paths) >= Config.T_THRESHOLD:
+            selected_shares = share_paths[:Config.T_THRESHOLD]
+        else:
+            selected_shares = share_paths
+        
+        recovered_img, recovered_sig = self._get_crt_reconstructor().reconstruct_image(
+            selected_shares, cancel_event=self._task_cancel_event())
+        
+        # 保存重构图像
+        output_dir = os.path.join(Config.DATASET_DIR, "reconstructed")
+        self._ensure_dir(output_dir)
+        
+        reconstructed_image_path = os.path.join(output_dir, "reconstructed_full_process.png")
+        recovered_img.save(reconstructed_image_path, format='PNG', compress_level=PNG_FAST_LEVEL)
         
-        self.run_in_thread(task)
+        # 份额中携带的签名为二进制 int32 系数 (见 _pack_signature)，直接零拷贝解析
+        return ([extracted_share_path], reconstructed_image_path,
+                _unpack_signature(recovered_sig), recovered_img)
+    
+    def _on_extraction_process_done(self, future):
+        """
+        完整提取流程完成回调（Tk主线程）
+        """
+        try:
+            (self.extracted_share_paths, self.reconstructed_image_path,
+             signature, self._last_recovered_img) = future.result()
+            self.recovered_signature = signature
+            
+            # 与嵌入时使用的签名比对
+            cached = self._sig_cache.get(b"Full Process Signature")
+            
+            self.show_progress("执行完整提取流程...", 100)
+            with self._buffered_log(self.full_process_log) as log:
+                log("提取流程执行成功！\n")
+                log(f"重构图像已保存到: {self.reconstructed_image_path}\n")
+                if signature is None:
+                    log("份额中未找到有效签名\n")
+                else:
+                    log(f"恢复签名: {signature.shape[0]} x {signature.shape[1]} 个系数\n")
+                    if cached is not None:
+                        match = np.array_equal(signature, np.asarray(cached[1], dtype=np.int32))
+                        log(f"与嵌入签名一致: {'是' if match else '否'}\n")
+            
+            self.update_status("提取流程执行成功")
+            self.hide_progress()
+            messagebox.showinfo("成功", "提取流程执行成功！")
+            
+        except Exception as e:
+            self._append_log(self.full_process_log, f"提取流程执行失败: {str(e)}\n")
+            self.update_status(f"提取流程执行失败: {str(e)}")
+            self.hide_progress()
+            messagebox.showerror("错误", f"提取流程执行失败: {str(e)}")
     
     def view_results(self):
         """
@@ -1119,13 +1449,14 @@ class StegoApp:
             ttk.Label(result_frame, text="含密图像", font=("SimHei", 10, "bold")).grid(row=0, column=0, pady=5)
             stego_label = ttk.Label(result_frame)
             stego_label.grid(row=1, column=0, padx=10, pady=10)
-            self.display_image(stego_label, self.stego_image_path)
+            self._display_from_array(stego_label, self._last_stego_img, self.stego_image_path)
             
             # 重构图像
             ttk.Label(result_frame, text="重构图像", font=("SimHei", 10, "bold")).grid(row=0, column=1, pady=5)
             reconstructed_label = ttk.Label(result_frame)
             reconstructed_label.grid(row=1, column=1, padx=10, pady=10)
-            self.display_image(reconstructed_label, self.reconstructed_image_path)
+            self._display_from_array(reconstructed_label, self._last_recovered_img,
+                                     self.reconstructed_image_path)
             
         except Exception as e:
             messagebox.showerror("错误", f"查看结果失败: {str(e)}")
@@ -1142,52 +1473,136 @@ class StegoApp:
         self.extracted_share_paths = []
         self.stego_paths = []
         
+        # 清空缩略图缓存与工作缓冲区
+        _decode_thumbnail.cache_clear()
+        _read_image_cached.cache_clear()
+        self._thumb_cache.clear()
+        self._last_embed = None
+        self._last_stego_img = None
+        self._last_recovered_img = None
+        self._scratch.clear()
+        
         self.full_carrier_var.set("")
         self.full_secret_var.set("")
         
         self.full_process_log.delete(1.0, tk.END)
-        self.full_process_log.insert(tk.END, "完整流程已初始化\n")
-        self.full_process_log.insert(tk.END, "选择载体图像和秘密图像后执行相应操作\n")
+        with self._buffered_log(self.full_process_log) as log:
+            log("完整流程已初始化\n")
+            log("选择载体图像和秘密图像后执行相应操作\n")
     
     def display_image(self, label, image_path):
         """
         显示图像到标签
         参数:
             label: 标签控件
-            image_path: 图像路径
+            image_path: 图像路径，或内存中的图像 (BGR矩阵 / PIL.Image)
+        注：文件的解码与缩放在 I/O 线程池中执行，完成后回到Tk主线程显示；
+        内存中的图像与已缓存的缩略图直接同步显示
         """
         try:
-            # 读取图像
-            img = Image.open(image_path)
-            
-            # 调整图像大小以适应标签
-            max_width = 300
-            max_height = 200
-            
-            width, height = img.size
-            if width > max_width or height > max_height:
-                ratio = min(max_width / width, max_height / height)
-                new_width = int(width * ratio)
-                new_height = int(height * ratio)
-                img = img.resize((new_width, new_height), Image.LANCZOS)
-            
-            # 转换为Tkinter兼容格式
-            photo = ImageTk.PhotoImage(img)
-            
-            # 显示图像
-            label.config(image=photo)
-            label.image = photo  # 保存引用，防止被垃圾回收
+            if isinstance(image_path, (np.ndarray, Image.Image)):
+                self._apply_image(label, self._load_thumbnail(image_path))
+                return
             
+            key = self._thumbnail_key(image_path)
+            photo = self._thumb_cache.get(key)
+            if photo is not None:
+                self._apply_image(label, photo)
+                return
+        except Exception as e:
+            label.config(text=f"无法显示图像: {str(e)}")
+            return
+        
+        # 记录该标签最新请求的图像，较早请求的解码结果到达时直接丢弃
+        self._pending_thumbs[label] = key
+        future = self._io_pool.submit(_decode_thumbnail, *key)
+        future.add_done_callback(
+            lambda f: self.root.after(0, self._on_thumbnail_decoded, label, key, f))
+    
+    def _display_from_array(self, label, image, fallback_path=None):
+        """
+        直接由内存中的图像 (BGR矩阵 / PIL.Image) 显示缩略图，不读取磁盘；
+        图像不在内存中时退回按路径显示
+        """
+        if image is None:
+            self.display_image(label, fallback_path)
+            return
+        try:
+            self._apply_image(label, self._load_thumbnail(image))
+        except Exception as e:
+            label.config(text=f"无法显示图像: {str(e)}")
+    
+    def _on_thumbnail_decoded(self, label, key, future):
+        """
+        缩略图解码完成回调（Tk主线程）：仅在Tk线程中创建 PhotoImage
+        """
+        if self._pending_thumbs.get(label) != key:
+            return
+        del self._pending_thumbs[label]
+        
+        try:
+            photo = self._cache_thumbnail(key, _photo_from_rgb(future.result()))
         except Exception as e:
             label.config(text=f"无法显示图像: {str(e)}")
+            return
+        self._apply_image(label, photo)
+    
+    def _apply_image(self, label, photo):
+        """
+        将缩略图设置到标签
+        """
+        label.config(image=photo)
+        label.image = photo  # 保存引用，防止被垃圾回收
+    
+    def _thumbnail_key(self, image_path, max_width=300, max_height=200):
+        """
+        缩略图缓存键: (绝对路径, 修改时间, 宽, 高)
+        """
+        path = os.path.abspath(image_path)
+        return (path, os.path.getmtime(path), max_width, max_height)
+    
+    def _cache_thumbnail(self, key, photo):
+        """
+        存入 PhotoImage 缓存 (最多保留32项，超出时淘汰最早的一项)
+        """
+        if len(self._thumb_cache) >= 32:
+            self._thumb_cache.pop(next(iter(self._thumb_cache)))
+        self._thumb_cache[key] = photo
+        return photo
+
+    def _load_thumbnail(self, image, max_width=300, max_height=200):
+        """
+        使用OpenCV解码并缩放图像，生成Tkinter缩略图
+        参数:
+            image: 图像路径，或已加载的BGR图像矩阵 / PIL图像 (直接复用，不再读取磁盘)
+            max_width: 缩略图最大宽度
+            max_height: 缩略图最大高度
+        返回:
+            tk.PhotoImage: 缩略图
+        """
+        if isinstance(image, np.ndarray):
+            rgb = _fit_thumbnail(image, max_width, max_height)
+        elif isinstance(image, Image.Image):
+            rgb = _fit_thumbnail(np.asarray(image.convert('RGB')), max_width, max_height, bgr=False)
+        else:
+            # 同一文件未修改时直接复用已生成的 PhotoImage (Tk图像可被多个控件共用)
+            key = self._thumbnail_key(image, max_width, max_height)
+            photo = self._thumb_cache.get(key)
+            if photo is None:
+                photo = self._cache_thumbnail(key, _photo_from_rgb(_decode_thumbnail(*key)))
+            return photo
+
+        # 转换为Tkinter兼容格式
+        return _photo_from_rgb(rgb)
     
     def clear_lattice_log(self):
         """
         清除格密码日志
         """
         self.lattice_log.delete(1.0, tk.END)
-        self.lattice_log.insert(tk.END, "格密码门限签名系统已初始化\n")
-        self.lattice_log.insert(tk.END, "点击按钮执行相应操作\n")
+        with self._buffered_log(self.lattice_log) as log:
+            log("格密码门限签名系统已初始化\n")
+            log("点击按钮执行相应操作\n")
     
     def create_status_bar(self):
         """
@@ -1221,6 +1636,7 @@ class StegoApp:
         
         # 右侧时间显示
         self.time_var = tk.StringVar()
+        self._last_time_str = ""
         self.update_time()
         time_label = ttk.Label(self.status_bar, textvariable=self.time_var, anchor=tk.E, 
                               font=("SimHei", 10, "normal"), foreground="#4a5568")
@@ -1230,8 +1646,16 @@ class StegoApp:
         """
         更新状态栏时间
         """
+        # 窗口最小化时时间不可见，降低刷新频率，避免无谓的唤醒与重绘
+        if self.root.state() == 'iconic':
+            self.root.after(5000, self.update_time)
+            return
+        
+        # 仅在文本变化时写变量，避免触发多余的Tk重绘
         current_time = time.strftime("%Y-%m-%d %H:%M:%S")
-        self.time_var.set(current_time)
+        if current_time != self._last_time_str:
+            self._last_time_str = current_time
+            self.time_var.set(current_time)
         self.root.after(1000, self.update_time)  # 每秒更新一次
     
     def update_status(self, message):
@@ -1241,7 +1665,16 @@ class StegoApp:
             message: 状态消息
         """
         self.status_var.set(message)
-        self.root.update_idletasks()
+        self._throttled_idle()
+    
+    def _throttled_idle(self, interval=0.05):
+        """
+        节流的 update_idletasks：距上次刷新不足 interval 秒时跳过，由事件循环稍后统一重绘
+        """
+        now = time.monotonic()
+        if now - self._last_idle_ts > interval:
+            self.root.update_idletasks()
+            self._last_idle_ts = now
     
     def create_progress_window(self):
         """
@@ -1255,6 +1688,7 @@ class StegoApp:
         self.progress_window.configure(bg="#f7fafc")
         # 不要在这里调用grab_set()，否则会导致整个应用程序被锁定
         self.progress_window.withdraw()  # 初始隐藏
+        self._progress_visible = False
         
         # 创建内容框架
         content_frame = ttk.Frame(self.progress_window, padding=20)
@@ -1289,16 +1723,30 @@ class StegoApp:
             message: 进度消息
             value: 进度值 (0-100)
         """
+        # 非Tk线程调用时转交主线程执行
+        if threading.current_thread() is not threading.main_thread():
+            self.root.after(0, self.show_progress, message, value)
+            return
+        
+        # 进度条与消息标签已绑定到变量，更新只需写变量，由Tk在空闲时统一重绘
         self.progress_message_var.set(message)
         self.progress_var.set(value)
-        self.progress_window.deiconify()  # 显示窗口
-        self.progress_window.grab_set()  # 模态窗口，防止用户与主窗口交互
-        self.root.update_idletasks()
+        
+        # 窗口仅在首次显示时弹出并设为模态
+        if not self._progress_visible:
+            self._progress_visible = True
+            self.progress_window.deiconify()  # 显示窗口
+            self.progress_window.grab_set()  # 模态窗口，防止用户与主窗口交互
     
     def hide_progress(self):
         """
         隐藏进度条
         """
+        if threading.current_thread() is not threading.main_thread():
+            self.root.after(0, self.hide_progress)
+            return
+        
+        self._progress_visible = False
         self.progress_window.grab_release()  # 释放模态状态
         self.progress_window.withdraw()  # 隐藏窗口
     
@@ -1322,6 +1770,116 @@ class StegoApp:
         if tab_index < len(tab_names):
             self.module_var.set(f"当前模块: {tab_names[tab_index]}")
             self.update_status("就绪")
+        
+        # 在后台预热该标签页所需的模块，避免首次点击时等待导入/JIT编译
+        getters = self._tab_modules().get(tab_index)
+        if getters:
+            self.executor.submit(lambda: [getter() for getter in getters])
+    
+    def _tab_modules(self):
+        """
+        各标签页依赖的模块获取方法
+        """
+        lattice = [self._get_keygen, self._get_aggregator]
+        crt = [self._get_crt_splitter, self._get_crt_reconstructor]
+        stego = [self._get_image_processor, self._get_embedder, self._get_extractor]
+        return {
+            1: lattice,
+            2: crt,
+            3: stego,
+            4: lattice + crt + [self._get_stego_orchestrator],
+        }
+    
+    def _read_cached(self, path):
+        """
+        读取图像 (BGR，只读)，同一未修改文件只解码一次
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"图像文件不存在: {path}")
+        path = os.path.abspath(path)
+        return _read_image_cached(path, os.path.getmtime(path))
+    
+    def _ensure_dir(self, path):
+        """
+        确保目录存在；已创建过的目录直接跳过，省去重复的系统调用
+        """
+        if path not in self._ensured_dirs:
+            os.makedirs(path, exist_ok=True)
+            self._ensured_dirs.add(path)
+    
+    def _scratch_like(self, shape, dtype):
+        """
+        按 (shape, dtype) 取可复用的工作缓冲区，不存在时分配
+        注：同一时刻只有一个后台任务运行 (见 _launch：被取消的任务真正退出前不会启动新任务)，
+        缓冲区不会被并发使用
+        """
+        key = (tuple(shape), np.dtype(dtype))
+        buf = self._scratch.get(key)
+        if buf is None:
+            buf = np.empty(key[0], dtype=key[1])
+            self._scratch[key] = buf
+        return buf
+    
+    def _lazy(self, attr, factory):
+        """
+        返回延迟创建的模块实例；多线程 (预热/工作线程) 下只创建一次
+        """
+        instance = getattr(self, attr)
+        if instance is None:
+            with self._lazy_lock:
+                instance = getattr(self, attr)
+                if instance is None:
+                    instance = factory()
+                    setattr(self, attr, instance)
+        return instance
+    
+    def _get_image_processor(self):
+        def factory():
+            from src.image_stego.img_process import ImageProcessor
+            return ImageProcessor()
+        return self._lazy('_image_processor', factory)
+    
+    def _get_crt_splitter(self):
+        def factory():
+            from src.secret_sharing.splitter import ImageCRTSplitter
+            return ImageCRTSplitter(Config.N_PARTICIPANTS, Config.T_THRESHOLD, Config.MODULI)
+        return self._lazy('_crt_splitter', factory)
+    
+    def _get_crt_reconstructor(self):
+        def factory():
+            from src.secret_sharing.reconstructor import ImageCRTReconstructor
+            return ImageCRTReconstructor()
+        return self._lazy('_crt_reconstructor', factory)
+    
+    def _get_stego_orchestrator(self):
+        def factory():
+            from src.image_stego.orchestrator import Module3Orchestrator
+            return Module3Orchestrator()
+        return self._lazy('_stego_orchestrator', factory)
+    
+    def _get_embedder(self):
+        def factory():
+            from src.image_stego.dct_embed import DCTEmbedder
+            return DCTEmbedder()
+        return self._lazy('_embedder', factory)
+    
+    def _get_extractor(self):
+        def factory():
+            from src.image_stego.dct_extract import DCTExtractor
+            return DCTExtractor()
+        return self._lazy('_extractor', factory)
+    
+    def _get_keygen(self):
+        def factory():
+            from src.crypto_lattice.keygen import KeyGenerator
+            return KeyGenerator()
+        return self._lazy('_keygen', factory)
+    
+    def _get_aggregator(self):
+        def factory():
+            from src.crypto_lattice.signer import SignatureAggregator
+            return SignatureAggregator()
+        return self._lazy('_aggregator', factory)
     
     def show_help(self):
         """
@@ -1355,36 +1913,179 @@ class StegoApp:
     def cancel_process(self):
         """
         取消正在进行的处理
+        注：只通知任务在下一个检查点退出；is_processing 保持到该任务真正结束 (见 _release_task)，
+        避免新任务与尚未退出的旧任务同时运行
         """
-        self.is_processing = False
+        if self._current_cancel is not None:
+            self._current_cancel.set()  # 通知后台任务在下一个检查点退出
         self.hide_progress()
         self.update_status("处理已取消")
         messagebox.showinfo("取消", "处理已取消")
     
-    def run_in_thread(self, func, *args, **kwargs):
+    def _launch(self, fn, args, kwargs, finish, on_done):
+        """
+        提交后台任务的公共部分：占用 is_processing，为任务创建独立的取消事件
+        finish(future, on_done) 在Tk主线程中调用
+        """
+        if self.is_processing:
+            if self._current_cancel is not None and self._current_cancel.is_set():
+                self.update_status("正在等待上一个任务退出，请稍候")
+            else:
+                self.update_status("已有任务正在执行，请稍候")
+            return None
+        
+        cancel_event = threading.Event()
+        
+        def runner():
+            self._task_local.cancel_event = cancel_event
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._task_local.cancel_event = None
+        
+        self.is_processing = True
+        self._current_cancel = cancel_event
+        future = self.executor.submit(runner)
+        self._current_future = future
+        future.add_done_callback(lambda f: self.root.after(0, finish, f, on_done))
+        return future
+    
+    def _release_task(self, future):
+        """
+        任务结束（Tk主线程）：仅当 future 为当前任务时释放 is_processing
+        返回:
+            True 表示应继续处理结果；过期任务或已取消的任务返回 False
+        """
+        if future is not self._current_future:
+            return False
+        cancelled = self._current_cancel.is_set()
+        self._current_future = None
+        self._current_cancel = None
+        self.is_processing = False
+        return not cancelled
+    
+    def run_in_thread(self, func, *args, on_done=None, **kwargs):
         """
-        在新线程中运行函数，避免阻塞UI
+        在线程池中运行函数，避免阻塞UI；完成后由 _on_task_done 在Tk主线程处理结果
         参数:
-            func: 要运行的函数
+            func: 要运行的函数（不得直接访问Tk控件）
             *args: 函数参数
+            on_done: 成功时的回调，以函数返回值（元组则展开）为参数
             **kwargs: 函数关键字参数
+        返回:
+            Future 对象；已有任务在执行时返回None
         """
-        def wrapper():
-            try:
-                self.is_processing = True
-                result = func(*args, **kwargs)
-                if not self.is_processing:
-                    return None
-                self.is_processing = False
-                return result
-            except Exception as e:
-                if not self.is_processing:
-                    return None
-                self.is_processing = False
-                messagebox.showerror("错误", f"处理失败: {str(e)}")
-                self.update_status(f"处理失败: {str(e)}")
-                self.hide_progress()
-        
-        thread = threading.Thread(target=wrapper)
-        thread.daemon = True
-        thread.start()
+        return self._launch(func, args, kwargs, self._on_task_done, on_done)
+    
+    def _on_task_done(self, future, on_done=None):
+        """
+        run_in_thread 任务完成处理（Tk主线程）：复位处理标志，统一提示异常
+        """
+        if not self._release_task(future):
+            return
+        
+        try:
+            result = future.result()
+        except Exception as e:
+            self.update_status(f"处理失败: {str(e)}")
+            self.hide_progress()
+            messagebox.showerror("错误", f"处理失败: {str(e)}")
+            return
+        
+        if on_done is None:
+            return
+        if isinstance(result, tuple):
+            on_done(*result)
+        else:
+            on_done(result)
+    
+    def _submit(self, fn, on_done, *args):
+        """
+        将耗时任务提交到常驻线程池，完成后在Tk主线程中调用回调
+        参数:
+            fn: 工作函数（不得直接访问Tk控件）
+            on_done: 完成回调，接收 Future 对象
+            *args: 工作函数参数
+        返回:
+            Future 对象；已有任务在执行时返回None
+        """
+        return self._launch(fn, args, {}, self._finish_task, on_done)
+    
+    def _finish_task(self, future, on_done):
+        """
+        任务结束处理（Tk主线程）：复位处理标志，已取消的任务与过期任务不再回调
+        """
+        if self._release_task(future):
+            on_done(future)
+    
+    def _post(self, func, *args):
+        """
+        从工作线程向Tk主线程投递界面更新
+        """
+        self.root.after(0, func, *args)
+    
+    def _task_cancel_event(self):
+        """
+        当前工作线程所执行任务的取消事件 (不在后台任务中调用时为None)
+        """
+        return getattr(self._task_local, 'cancel_event', None)
+    
+    def _check_cancel(self):
+        """
+        工作线程中的取消检查点：用户已取消时抛出 TaskCancelled 结束任务
+        """
+        cancel_event = self._task_cancel_event()
+        if cancel_event is not None and cancel_event.is_set():
+            raise TaskCancelled()
+    
+    def _progress_checkpoint(self, message, value):
+        """
+        工作线程中更新进度，并作为取消检查点
+        """
+        self._check_cancel()
+        self._post(self.show_progress, message, value)
+    
+    def _post_step(self, message, value, widget, text):
+        """
+        从工作线程投递一个流程步骤：进度与日志在同一次 root.after 回调中更新，
+        每步只触发一次Tk事件与重排；同时作为取消检查点
+        """
+        self._check_cancel()
+        self.root.after(0, self._apply_step, message, value, widget, text)
+    
+    def _apply_step(self, message, value, widget, text):
+        """
+        在Tk主线程中应用 _post_step 投递的进度与日志
+        """
+        self.show_progress(message, value)
+        self._append_log(widget, text)
+    
+    def _append_log(self, widget, text):
+        """
+        追加日志文本并滚动到末尾
+        """
+        widget.insert(tk.END, text)
+        self._trim_log(widget)
+        widget.see(tk.END)
+    
+    @contextmanager
+    def _buffered_log(self, widget):
+        """
+        缓冲日志写入：块内多次 log(...) 在退出时合并为一次 insert + see，
+        避免每行都触发Tk重新布局与滚动
+        用法:
+            with self._buffered_log(self.lattice_log) as log:
+                log("...\n")
+        """
+        lines = []
+        yield lines.append
+        if lines:
+            self._append_log(widget, "".join(lines))
+    
+    def _trim_log(self, widget, max_lines=LOG_MAX_LINES):
+        """
+        限制日志控件行数，丢弃最旧的内容，避免长时间运行时内存无限增长
+        """
+        line_count = int(widget.index('end-1c').split('.')[0])
+        if line_count > max_lines:
+            widget.delete('1.0', f'{line_count - max_lines + 1}.0')
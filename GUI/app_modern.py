@@ -9,12 +9,13 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 import os
 import sys
-import threading
-import json
-import hashlib
+import queue
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
 import time
 import uuid
-from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache
 
 # --- 路径配置 ---
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -24,20 +25,35 @@ sys.path.insert(0, project_root)
 # --- 核心模块导入 ---
 try:
     from src.config import Config
-    from src.crypto_lattice.keygen import KeyTool
-    from src.dealer.locker import AssetLocker
-    from src.image_stego.dct_extract import DCTExtractor
-    from src.crypto_lattice.signer import LatticeSigner
-    from src.secret_sharing.reconstructor import ImageCRTReconstructor
+    from src.io import codec, lattice_codec
+    from src.io.fs import ensure_dir, list_suffix
 except ImportError as e:
     print(f"核心模块导入失败: {e}")
     # 仅用于无后端测试，生产环境请删除
     class Config: PATHS = {"keys": "data/keys", "shares": "data/shares"}
 
+# 子进程一律以 spawn 方式启动：fork 会复制正在运行的 Tk 解释器以及线程池 / numba 线程的锁状态，
+# 可能导致子进程死锁或状态损坏 (Python 3.12+ 对此会给出警告)
+_MP_CONTEXT = multiprocessing.get_context("spawn")
+
+# 格密码 / 隐写 / CRT 后端与 PIL 较重，且多数会话只用到其中一部分，
+# 因此在首次使用它们的方法内部再导入，缩短窗口出现前的启动时间
+
+
+@cache
+def _get_signer():
+    """签名器无会话状态，整个进程共用一个实例"""
+    from src.crypto_lattice.signer import LatticeSigner
+    return LatticeSigner()
+
 # --- 全局主题设置 ---
 ctk.set_appearance_mode("Dark")
 ctk.set_default_color_theme("blue")
 
+# 日志框保留的最大行数，以及批量刷新日志的间隔 (毫秒)
+LOG_MAX_LINES = 5000
+LOG_FLUSH_MS = 50
+
 class ModernApp(ctk.CTk):
     def __init__(self):
         super().__init__()
@@ -49,7 +65,21 @@ class ModernApp(ctk.CTk):
         # 状态变量
         self.active_identity = None  # 当前选中的身份 (文件名, 如 alice.sk)
         self.loaded_manifest = None  # 当前加载的资产清单
-        self.authorized_shares = []  # 已授权的份额缓存
+        self.authorized_shares = []  # 已授权的份额缓存 (仅追加，供重构使用)
+        self._authorized_idx = set()  # 已授权份额的 idx 集合 (判断是否已授权的依据)
+        self._imported_sigs = {}  # share_index -> 导入的签名记录 (指纹已与清单核对)
+        self._file_cache = {}  # 绝对路径 -> (mtime, 解析结果)，避免重复解析私钥/清单
+        ensure_dir("my_identities")
+        self._identity_rows = {}  # 文件名 -> 身份行控件
+        self._share_rows = {}  # share_index -> 碎片行控件
+        self._share_rows_manifest = None  # 当前碎片行所对应的清单
+        self._ui_queue = queue.Queue()  # 工作线程 -> 主线程的 UI 调用队列
+        self._ui_polling = False
+        self._active_tasks = 0
+        self.executor = ThreadPoolExecutor(max_workers=2)  # 有界的后台线程池
+        self._lock_proc = None  # 正在运行的锁定子进程
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self._log_buffers = {}  # 日志控件 -> 待写入的消息列表
         
         # 2. 布局容器
         self.grid_columnconfigure(0, weight=1)
@@ -104,16 +134,14 @@ class ModernApp(ctk.CTk):
         
         try:
             # 调用后端生成
+            from src.crypto_lattice.keygen import KeyTool
             sk, pk = KeyTool.generate_keypair()
             
             # 保存逻辑
-            save_dir = "my_identities"
-            os.makedirs(save_dir, exist_ok=True)
+            save_dir = ensure_dir("my_identities")
             
-            with open(os.path.join(save_dir, f"{name}.sk"), 'w') as f:
-                json.dump(sk, f, indent=4)
-            with open(os.path.join(save_dir, f"{name}.pk"), 'w') as f:
-                json.dump(pk, f, indent=4)
+            lattice_codec.dump(sk, os.path.join(save_dir, f"{name}.sk"))
+            lattice_codec.dump(pk, os.path.join(save_dir, f"{name}.pk"))
                 
             messagebox.showinfo("成功", f"身份 [{name}] 铸造完成！\n私钥已安全存储。")
             self.refresh_identity_list()
@@ -122,35 +150,62 @@ class ModernApp(ctk.CTk):
             messagebox.showerror("错误", str(e))
 
     def refresh_identity_list(self):
-        # 清空列表
-        for widget in self.scroll_identities.winfo_children():
-            widget.destroy()
-            
+        """增量刷新身份列表：只为新文件创建行、销毁已消失的行，其余行仅更新状态"""
         key_dir = "my_identities"
-        if not os.path.exists(key_dir):
-            os.makedirs(key_dir)
-            
-        files = [f for f in os.listdir(key_dir) if f.endswith('.sk')]
+        files = list_suffix(key_dir, '.sk')
+        present = set(files)
+        
+        for name in [name for name in self._identity_rows if name not in present]:
+            self._identity_rows.pop(name)['frame'].destroy()
         
         for f in files:
-            row = ctk.CTkFrame(self.scroll_identities)
-            row.pack(fill="x", pady=5)
-            
-            icon = "🔑" if f == self.active_identity else "📄"
-            color = "#2CC985" if f == self.active_identity else "transparent"
-            
-            ctk.CTkLabel(row, text=f"{icon} {f}", font=("Consolas", 14)).pack(side="left", padx=10)
-            
-            # 切换身份按钮
-            if f != self.active_identity:
-                ctk.CTkButton(row, text="设为活跃", width=80, 
-                             command=lambda fname=f: self.set_active_identity(fname)).pack(side="right", padx=10)
-            else:
-                ctk.CTkLabel(row, text="[当前活跃]", text_color="#2CC985").pack(side="right", padx=10)
+            if f not in self._identity_rows:
+                self._identity_rows[f] = self._create_identity_row(f)
+            self._style_identity_row(f)
+
+    def _create_identity_row(self, f):
+        """创建单个身份行 (按钮与"当前活跃"标记都预先创建，切换时只做显示/隐藏)"""
+        row = ctk.CTkFrame(self.scroll_identities)
+        row.pack(fill="x", pady=5)
+        
+        label = ctk.CTkLabel(row, text=f, font=("Consolas", 14))
+        label.pack(side="left", padx=10)
+        
+        # 切换身份按钮
+        button = ctk.CTkButton(row, text="设为活跃", width=80,
+                               command=lambda fname=f: self.set_active_identity(fname))
+        badge = ctk.CTkLabel(row, text="[当前活跃]", text_color="#2CC985")
+        return {'frame': row, 'label': label, 'button': button, 'badge': badge}
+
+    def _style_identity_row(self, f):
+        """按是否为当前活跃身份更新一行的图标与右侧控件"""
+        row = self._identity_rows.get(f)
+        if row is None:
+            return
+        is_active = f == self.active_identity
+        icon = "🔑" if is_active else "📄"
+        row['label'].configure(text=f"{icon} {f}")
+        if is_active:
+            row['button'].pack_forget()
+            row['badge'].pack(side="right", padx=10)
+        else:
+            row['badge'].pack_forget()
+            row['button'].pack(side="right", padx=10)
+
+    def _mark_active(self, old, new):
+        """切换活跃身份时只更新新旧两行"""
+        for name in (old, new):
+            if name:
+                self._style_identity_row(name)
 
     def set_active_identity(self, filename):
+        old = self.active_identity
+        if filename != old and old:
+            # 切换身份时丢弃上一个私钥的解析结果
+            old_path = os.path.abspath(os.path.join(self.entry_keys.get(), old))
+            self._file_cache.pop(old_path, None)
         self.active_identity = filename
-        self.refresh_identity_list()
+        self._mark_active(old, filename)
         self.update_user_status() # 更新 User Tab 的状态
 
     # =========================================================================
@@ -196,8 +251,9 @@ class ModernApp(ctk.CTk):
         self.lbl_t.pack()
         self.slider_t.configure(command=lambda v: self.lbl_t.configure(text=f"t = {int(v)}"))
 
-        ctk.CTkButton(config_panel, text="🔒 执行锁定 (Lock)", fg_color="#E04F5F", height=40,
-                     command=self.run_locking_process).pack(pady=(30, 10), fill="x", padx=10)
+        self.btn_lock = ctk.CTkButton(config_panel, text="🔒 执行锁定 (Lock)", fg_color="#E04F5F", height=40,
+                                      command=self.run_locking_process)
+        self.btn_lock.pack(pady=(30, 10), fill="x", padx=10)
 
         # 右侧：日志与预览
         self.dealer_log = ctk.CTkTextbox(frame, width=400)
@@ -225,8 +281,7 @@ class ModernApp(ctk.CTk):
         if path:
             self.pk_dir = path
             # 检测公钥数量
-            pk_files = [f for f in os.listdir(path) if f.endswith('.pk')]
-            n = len(pk_files)
+            n = len(list_suffix(path, '.pk'))
             self.btn_pk.configure(text=f"✅ {os.path.basename(path)} (n={n})")
             
     def load_output_dir(self):
@@ -236,6 +291,8 @@ class ModernApp(ctk.CTk):
             self.btn_output.configure(text=f"✅ {os.path.basename(path)}")
 
     def run_locking_process(self):
+        if self._lock_proc is not None:
+            return  # 上一次锁定尚未结束
         if not (self.secret_path and self.covers_dir):
             messagebox.showerror("错误", "请先选择秘密图像和载体目录")
             return
@@ -247,24 +304,53 @@ class ModernApp(ctk.CTk):
             messagebox.showerror("错误", "门限(t)必须小于份额数量(n)")
             return
         
-        def task():
-            self.log(self.dealer_log, ">>> 启动资产锁定流程...")
+        # 锁定流程 (NTT / DCT / 多项式运算) 为 CPU 密集型，放到独立进程中执行，
+        # 避免与 Tk 主循环争用 GIL；只传递可 pickle 的路径与整数
+        config = {
+            "secret_img_path": self.secret_path,
+            "pk_dir": self.pk_dir,
+            "cover_dir": self.covers_dir,
+            "output_dir": self.output_dir,
+            "n": n,
+            "t": t,
+        }
+        from src.dealer.locker import run_lock_job
+        progress_queue = _MP_CONTEXT.Queue()
+        proc = _MP_CONTEXT.Process(target=run_lock_job, args=(config, progress_queue), daemon=True)
+        self.log(self.dealer_log, ">>> 启动资产锁定流程...")
+        proc.start()
+        self._lock_proc = proc
+        self.btn_lock.configure(state="disabled")
+        self.after(100, self._poll_lock_job, proc, progress_queue)
+
+    def _poll_lock_job(self, proc, progress_queue):
+        """主线程轮询锁定子进程的进度队列"""
+        finished = False
+        while True:
             try:
-                locker = AssetLocker()
-                locker.lock_and_distribute(
-                    secret_img_path=self.secret_path,
-                    pk_dir=self.pk_dir,
-                    cover_dir=self.covers_dir,
-                    output_dir=self.output_dir,
-                    n=n,
-                    t=t
-                )
+                kind, text = progress_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'log':
+                self.log(self.dealer_log, text)
+            elif kind == 'done':
                 self.log(self.dealer_log, "✅ 锁定成功！资产清单已生成。")
                 self.log(self.dealer_log, "请前往 'User' 标签页进行恢复。")
-            except Exception as e:
-                self.log(self.dealer_log, f"❌ 失败: {str(e)}")
+                finished = True
+            else:
+                self.log(self.dealer_log, f"❌ 失败: {text}")
+                finished = True
+        
+        if not finished and (proc.is_alive() or not progress_queue.empty()):
+            self.after(100, self._poll_lock_job, proc, progress_queue)
+            return
         
-        threading.Thread(target=task).start()
+        if finished:
+            proc.join()
+        else:
+            self.log(self.dealer_log, f"❌ 失败: 锁定进程异常退出 (exitcode={proc.exitcode})")
+        self._lock_proc = None
+        self.btn_lock.configure(state="normal")
 
     # =========================================================================
     # Tab 3: 授权与恢复 (User Center) - 核心交互区
@@ -341,11 +427,12 @@ class ModernApp(ctk.CTk):
             return
             
         try:
-            with open(path, 'r') as f:
-                self.loaded_manifest = json.load(f)
+            self.loaded_manifest = self._load_cached(path)
             
             # 初始化状态
             self.authorized_shares = []
+            self._authorized_idx = set()
+            self._imported_sigs = {}
             self.refresh_share_list()
             n = self.loaded_manifest['total_shares']
             t = self.loaded_manifest['threshold']
@@ -355,13 +442,31 @@ class ModernApp(ctk.CTk):
             messagebox.showerror("错误", f"清单解析失败: {e}")
 
     def refresh_share_list(self):
-        # 清空旧列表
-        for widget in self.scroll_shares.winfo_children():
-            widget.destroy()
-            
         if not self.loaded_manifest:
+            self._clear_share_rows()
             return
 
+        self._update_progress()
+
+        # 清单变化时重建列表项，否则只更新每行的状态列
+        rebuilt = self._share_rows_manifest is not self.loaded_manifest
+        if rebuilt:
+            self._clear_share_rows()
+            for entry in self.loaded_manifest['registry']:
+                self._share_rows[entry['share_index']] = self.create_share_item(entry)
+            self._share_rows_manifest = self.loaded_manifest
+        
+        for entry in self.loaded_manifest['registry']:
+            self._style_share_row(entry)
+
+        if rebuilt:
+            # 各行在未映射状态下建好，最后统一挂到列表中，只触发一次布局计算
+            for row in self._share_rows.values():
+                row['frame'].pack(fill="x", pady=5, padx=5)
+            self.scroll_shares.update_idletasks()
+
+    def _update_progress(self):
+        """更新收集进度与重构按钮状态"""
         t = self.loaded_manifest['threshold']
         n = self.loaded_manifest['total_shares']
         current_auth_count = len(self.authorized_shares)
@@ -375,14 +480,15 @@ class ModernApp(ctk.CTk):
         else:
             self.btn_reconstruct.configure(state="disabled", fg_color="gray")
 
-        # 生成列表项
-        for entry in self.loaded_manifest['registry']:
-            self.create_share_item(entry)
+    def _clear_share_rows(self):
+        for row in self._share_rows.values():
+            row['frame'].destroy()
+        self._share_rows = {}
+        self._share_rows_manifest = None
 
     def create_share_item(self, entry):
-        """创建单个碎片的交互行"""
+        """创建单个碎片的交互行 (状态列由 _style_share_row 填充，行本身由调用方统一 pack)"""
         card = ctk.CTkFrame(self.scroll_shares)
-        card.pack(fill="x", pady=5, padx=5)
         
         # 信息列
         info_text = f"📄 {entry['carrier_file']}\n归属人: {entry['owner_alias']}"
@@ -393,26 +499,35 @@ class ModernApp(ctk.CTk):
         ctk.CTkLabel(card, text=f"Hash: {fingerprint}", text_color="gray").pack(side="left", padx=10)
         
         # 状态/操作列
+        status = ctk.CTkLabel(card, text="")
+        button = ctk.CTkButton(card, text="✍️ 签名授权", width=100,
+                               command=lambda e=entry: self.authorize_share(e))
+        return {'frame': card, 'status': status, 'button': button}
+
+    def _style_share_row(self, entry):
+        """根据授权状态与当前身份更新一行的状态列"""
+        row = self._share_rows.get(entry['share_index'])
+        if row is None:
+            return
+        
         # 判断该碎片是否已被当前会话授权
-        is_authorized = any(s['idx'] == entry['share_index'] for s in self.authorized_shares)
+        is_authorized = entry['share_index'] in self._authorized_idx
+        # 判断是否有权授权 (Active Identity matches Owner Alias)
+        # 注意：这里简单比对文件名，实际应用可能比对公钥哈希
+        is_owner = self.active_identity and (entry['owner_alias'] == self.active_identity)
+        
+        if not is_authorized and is_owner:
+            row['status'].pack_forget()
+            row['button'].pack(side="right", padx=10)
+            return
         
+        row['button'].pack_forget()
         if is_authorized:
-            ctk.CTkLabel(card, text="✅ 已授权", text_color="#2CC985").pack(side="right", padx=20)
+            row['status'].configure(text="✅ 已授权", text_color="#2CC985")
         else:
-            # 判断是否有权授权 (Active Identity matches Owner Alias)
-            # 注意：这里简单比对文件名，实际应用可能比对公钥哈希
-            is_owner = self.active_identity and (entry['owner_alias'] == self.active_identity)
-            
-            if is_owner:
-                btn = ctk.CTkButton(card, text="✍️ 签名授权", width=100,
-                                   command=lambda e=entry: self.authorize_share(e))
-                btn.pack(side="right", padx=10)
-            else:
-                if not self.active_identity:
-                    status = "需登录身份"
-                else:
-                    status = "无权操作"
-                ctk.CTkLabel(card, text=f"🔒 {status}", text_color="gray").pack(side="right", padx=20)
+            status = "需登录身份" if not self.active_identity else "无权操作"
+            row['status'].configure(text=f"🔒 {status}", text_color="gray")
+        row['status'].pack(side="right", padx=20)
 
     def authorize_share(self, entry, export_only=False):
         """交互式授权的核心逻辑"""
@@ -432,45 +547,17 @@ class ModernApp(ctk.CTk):
 
         # 2. 执行签名 (调用后端)
         try:
-            # 读取私钥
-            sk_path = os.path.join(self.entry_keys.get(), self.active_identity)
-            with open(sk_path, 'r') as f:
-                sk = json.load(f)
-            
-            # 读取隐写图片并提取数据
+            sk = self._load_cached(os.path.join(self.entry_keys.get(), self.active_identity))
             stego_path = os.path.join(self.entry_assets.get(), entry['carrier_file'])
-            extractor = DCTExtractor()
-            share_bytes = extractor.extract(stego_path)
-            
-            # 完整性校验
-            current_hash = hashlib.sha256(share_bytes).hexdigest()
-            if current_hash != entry['share_fingerprint']:
-                raise ValueError("数据完整性校验失败！文件可能被篡改。")
-            
-            # 生成会话ID和签名
-            session_id = str(uuid.uuid4())
-            msg = (current_hash + session_id).encode()
-            signer = LatticeSigner()
-            signature = signer.sign(sk, msg)
-            
-            # 3. 反序列化份额数据
-            reconstructor = ImageCRTReconstructor()
-            payload = reconstructor.deserialize_share(share_bytes)
-            
-            if not payload:
-                raise ValueError("份额反序列化失败")
+            from src.image_stego.dct_extract import extract_and_hash_cached
+            from src.secret_sharing.reconstructor import ImageCRTReconstructor
+            # 签名路径不缓存提取出的份额明文
+            extracted = extract_and_hash_cached(stego_path, entry['share_fingerprint'],
+                                                self._fingerprint_algo(), use_cache=False)
+            signature_data = self._sign_share(entry, sk, _get_signer(), ImageCRTReconstructor(),
+                                              *extracted)
             
             if export_only:
-                # 导出为签名文件
-                signature_data = {
-                    "share_index": entry['share_index'],
-                    "share_fingerprint": current_hash,
-                    "session_id": session_id,
-                    "signature": signature,
-                    "owner_alias": self.active_identity,
-                    "payload": payload
-                }
-                
                 # 保存签名文件
                 export_path = filedialog.asksaveasfilename(
                     defaultextension=".sig",
@@ -479,18 +566,109 @@ class ModernApp(ctk.CTk):
                 )
                 
                 if export_path:
-                    with open(export_path, 'w') as f:
-                        json.dump(signature_data, f, indent=4)
+                    codec.dump(signature_data, export_path)
                     messagebox.showinfo("成功", f"签名文件已导出至: {export_path}")
             else:
                 # 将数据存入内存缓存
-                self.authorized_shares.append(payload)
+                self._add_authorized(signature_data['payload'])
                 messagebox.showinfo("成功", "签名成功！已将解密份额加入重构池。")
                 self.refresh_share_list()
                 
         except Exception as e:
             messagebox.showerror("授权失败", str(e))
 
+    def _sign_share(self, entry, sk, signer, reconstructor, share_bytes, current_hash):
+        """
+        校验并签名单个碎片 (share_bytes / current_hash 为 extract_and_hash_cached 的结果)
+        返回:
+            dict: 签名记录 (share_index, share_fingerprint, session_id, signature, owner_alias, payload)
+        """
+        # 完整性校验
+        if current_hash != entry['share_fingerprint']:
+            raise ValueError(f"{entry['carrier_file']}: 数据完整性校验失败！文件可能被篡改。")
+        
+        # 生成会话ID和签名
+        session_id = str(uuid.uuid4())
+        msg = (current_hash + session_id).encode()
+        signature = signer.sign(sk, msg)
+        
+        # 反序列化份额数据
+        payload = reconstructor.deserialize_share(share_bytes)
+        if not payload:
+            raise ValueError(f"{entry['carrier_file']}: 份额反序列化失败")
+        
+        return {
+            "share_index": entry['share_index'],
+            "share_fingerprint": current_hash,
+            "session_id": session_id,
+            "signature": signature,
+            "owner_alias": self.active_identity,
+            "payload": payload
+        }
+
+    def authorize_all_owned(self):
+        """
+        一次性签名当前身份拥有的全部碎片，导出为单个 .sigs 签名包
+        私钥、签名器只加载一次，避免逐个点击时的重复开销；
+        各载体的 DCT 提取相互独立且为 CPU 密集型，在进程池中并行执行。
+        提取与签名在后台线程中完成，结果经 UI 队列交回主线程弹出保存对话框，界面不会冻结
+        """
+        owner_shares = [entry for entry in self.loaded_manifest['registry']
+                        if entry['owner_alias'] == self.active_identity]
+        
+        confirm = messagebox.askyesno(
+            "安全警告",
+            f"您正在使用身份 [{self.active_identity}] 对 {len(owner_shares)} 个资产碎片进行签名：\n\n"
+            + "\n".join(f"文件: {entry['carrier_file']}" for entry in owner_shares)
+            + "\n\n是否确认授权？"
+        )
+        if not confirm:
+            return
+        
+        # 控件读取留在主线程，后台任务只接触普通值
+        key_path = os.path.join(self.entry_keys.get(), self.active_identity)
+        stego_paths = [os.path.join(self.entry_assets.get(), entry['carrier_file'])
+                       for entry in owner_shares]
+        algo = self._fingerprint_algo()
+        alias = self.active_identity
+        
+        def task():
+            try:
+                sk = self._load_cached(key_path)
+                from src.image_stego.dct_extract import extract_and_hash_cached
+                from src.secret_sharing.reconstructor import ImageCRTReconstructor
+                workers = min(len(stego_paths), os.cpu_count() or 1)
+                with ProcessPoolExecutor(max_workers=workers, mp_context=_MP_CONTEXT) as pool:
+                    extracted = list(pool.map(extract_and_hash_cached, stego_paths,
+                                              [entry['share_fingerprint'] for entry in owner_shares],
+                                              [algo] * len(stego_paths),
+                                              [False] * len(stego_paths)))
+                
+                signer = _get_signer()
+                reconstructor = ImageCRTReconstructor()
+                bundle = [self._sign_share(entry, sk, signer, reconstructor, *result)
+                          for entry, result in zip(owner_shares, extracted)]
+                self._post(self._export_bundle, bundle, alias)
+            except Exception as e:
+                self._post(messagebox.showerror, "授权失败", str(e))
+        
+        self._start_task(task)
+
+    def _export_bundle(self, bundle, alias):
+        """主线程中选择保存位置并写出签名包 (authorize_all_owned 的后半段)"""
+        export_path = filedialog.asksaveasfilename(
+            defaultextension=".sigs",
+            filetypes=[("Signature Bundles", "*.sigs"), ("All Files", "*")],
+            initialfile=f"{alias.replace('.sk', '')}_signatures.sigs"
+        )
+        
+        if export_path:
+            try:
+                codec.dump(bundle, export_path)
+                messagebox.showinfo("成功", f"{len(bundle)} 个签名已导出至: {export_path}")
+            except Exception as e:
+                messagebox.showerror("授权失败", str(e))
+
     def export_signature(self):
         """导出签名文件，用于分布式模式"""
         if not self.active_identity:
@@ -509,82 +687,207 @@ class ModernApp(ctk.CTk):
             messagebox.showwarning("提示", f"未找到归属人为 {self.active_identity} 的资产碎片")
             return
         
-        # 对第一个归属人为当前活跃身份的碎片执行签名并导出
-        self.authorize_share(owner_shares[0], export_only=True)
+        if len(owner_shares) == 1:
+            self.authorize_share(owner_shares[0], export_only=True)
+        else:
+            # 拥有多个碎片时批量签名并导出为签名包
+            self.authorize_all_owned()
 
     def import_signature(self):
-        """导入签名文件，用于分布式模式"""
+        """导入签名文件 (单个 .sig 或 .sigs 签名包)，用于分布式模式"""
         if not self.loaded_manifest:
             messagebox.showwarning("提示", "请先加载资产清单")
             return
         
         # 打开文件选择对话框，选择签名文件
         import_path = filedialog.askopenfilename(
-            filetypes=[("Signature Files", "*.sig"), ("All Files", "*")]
+            filetypes=[("Signature Files", "*.sig *.sigs"), ("All Files", "*")]
         )
         
         if not import_path:
             return
         
         try:
-            # 读取签名文件内容
-            with open(import_path, 'r') as f:
-                signature_data = json.load(f)
+            # 读取签名文件内容: 顶层为列表时是签名包
+            loaded = codec.load(import_path)
+            records = list(loaded) if isinstance(loaded, (list, tuple)) else [loaded]
             
             # 验证签名文件的有效性
-            if not all(key in signature_data for key in ['payload', 'owner_alias', 'share_fingerprint']):
-                raise ValueError("签名文件格式无效")
-            
-            # 检查该份额是否已经被授权
-            share_index = signature_data.get('share_index')
-            is_already_authorized = any(s.get('idx') == share_index for s in self.authorized_shares)
+            for signature_data in records:
+                if not all(key in signature_data for key in ['payload', 'owner_alias', 'share_fingerprint']):
+                    raise ValueError("签名文件格式无效")
+            
+            # 签名记录自带指纹，与清单核对即可，无需重新读取载体做 DCT 提取
+            registry = {entry['share_index']: entry for entry in self.loaded_manifest['registry']}
+            for signature_data in records:
+                entry = registry.get(signature_data.get('share_index'))
+                if entry is None or entry['share_fingerprint'] != signature_data['share_fingerprint']:
+                    raise ValueError(f"签名文件与当前清单不匹配 (share_index={signature_data.get('share_index')})")
+            
+            imported = []
+            for signature_data in records:
+                # 跳过已经被授权的份额
+                share_index = signature_data.get('share_index')
+                if share_index in self._authorized_idx:
+                    continue
+                # 将签名文件中的payload添加到内存缓存
+                self._imported_sigs[share_index] = {
+                    "fingerprint": signature_data['share_fingerprint'],
+                    "payload": signature_data['payload'],
+                    "signature": signature_data.get('signature'),
+                    "owner": signature_data['owner_alias'],
+                }
+                self._add_authorized(signature_data['payload'])
+                imported.append(signature_data)
             
-            if is_already_authorized:
+            if not imported:
                 messagebox.showinfo("提示", "该份额已经被授权，无需重复导入")
                 return
             
-            # 将签名文件中的payload添加到内存缓存
-            self.authorized_shares.append(signature_data['payload'])
-            messagebox.showinfo("成功", f"签名文件已导入，所有者: {signature_data['owner_alias']}")
-            self.refresh_share_list()
+            # 只更新进度与受影响的行
+            self._update_progress()
+            for signature_data in imported:
+                self._style_share_row(registry[signature_data['share_index']])
+            
+            owners = ", ".join(sorted({s['owner_alias'] for s in imported}))
+            messagebox.showinfo("成功", f"已导入 {len(imported)} 个签名，所有者: {owners}")
             
         except Exception as e:
             messagebox.showerror("导入失败", str(e))
 
     def run_reconstruction(self):
-        """执行最终重构"""
+        """执行最终重构 (后台线程计算与保存，界面更新经由 UI 队列回到主线程)"""
         if not self.authorized_shares:
             return
-            
-        try:
-            reconstructor = ImageCRTReconstructor()
-            img_arr = reconstructor.reconstruct(self.authorized_shares)
-            
-            # 使用用户配置的资产位置作为保存路径
-            save_path = os.path.join(self.entry_assets.get(), "recovered_secret_gui.png")
-            Image.fromarray(img_arr).save(save_path)
-            
-            # 弹窗展示结果
-            top = ctk.CTkToplevel(self)
-            top.title("🎉 秘密已恢复")
-            top.geometry("500x500")
-            
-            pil_img = Image.open(save_path)
-            # 缩放预览
-            pil_img.thumbnail((400, 400))
-            ctk_img = ctk.CTkImage(light_image=pil_img, dark_image=pil_img, size=pil_img.size)
-            
-            ctk.CTkLabel(top, image=ctk_img, text="").pack(pady=20)
-            ctk.CTkButton(top, text="打开文件所在位置", command=lambda: os.startfile(os.path.abspath(save_path))).pack()
-            
-        except Exception as e:
-            messagebox.showerror("重构失败", str(e))
+        
+        # 在主线程读取控件状态，工作线程只使用这些快照
+        # (导入的签名在导入时已核对指纹，其 payload 直接参与重构，不再重新提取)
+        shares = list(self.authorized_shares)
+        # 使用用户配置的资产位置作为保存路径
+        save_path = os.path.join(self.entry_assets.get(), "recovered_secret_gui.png")
+        self.btn_reconstruct.configure(state="disabled", fg_color="gray")
+        self.lbl_progress.configure(text="正在重构...")
+        
+        def task():
+            try:
+                from PIL import Image
+                from src.secret_sharing.reconstructor import ImageCRTReconstructor
+                reconstructor = ImageCRTReconstructor()
+                img_arr = reconstructor.reconstruct(shares)
+                
+                self._post(self.lbl_progress.configure, text="正在保存恢复图像...")
+                pil_img = Image.fromarray(img_arr)
+                pil_img.save(save_path)
+                
+                # 缩放预览 (直接使用内存中的图像，无需重新读取文件)
+                pil_img.thumbnail((400, 400))
+                self._post(self._show_result, save_path, pil_img)
+            except Exception as e:
+                self._post(messagebox.showerror, "重构失败", str(e))
+            finally:
+                # 恢复进度文字与按钮状态
+                self._post(self.refresh_share_list)
+        
+        self._start_task(task)
+
+    def _show_result(self, save_path, pil_img):
+        """弹窗展示结果"""
+        top = ctk.CTkToplevel(self)
+        top.title("🎉 秘密已恢复")
+        top.geometry("500x500")
+        
+        ctk_img = ctk.CTkImage(light_image=pil_img, dark_image=pil_img, size=pil_img.size)
+        
+        ctk.CTkLabel(top, image=ctk_img, text="").pack(pady=20)
+        ctk.CTkButton(top, text="打开文件所在位置", command=lambda: os.startfile(os.path.abspath(save_path))).pack()
+
+    # --- 后台任务与 UI 队列 ---
+    def _start_task(self, task):
+        """将 task 提交到后台线程池，并开始轮询 UI 队列"""
+        self._active_tasks += 1
+        
+        def runner():
+            try:
+                task()
+            finally:
+                self._ui_queue.put(None)  # 结束标记，排在该任务的所有 UI 更新之后
+        
+        future = self.executor.submit(runner)
+        if not self._ui_polling:
+            self._ui_polling = True
+            self.after(50, self._drain_ui_queue)
+        return future
+
+    def _post(self, fn, *args, **kwargs):
+        """从工作线程投递一次 UI 调用 (Tk 非线程安全，控件只在主线程中操作)"""
+        self._ui_queue.put((fn, args, kwargs))
+
+    def _drain_ui_queue(self):
+        """主线程中执行所有待处理的 UI 调用；仍有任务在运行时继续轮询"""
+        while True:
+            try:
+                item = self._ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._active_tasks -= 1
+                continue
+            fn, args, kwargs = item
+            fn(*args, **kwargs)
+        
+        if self._active_tasks > 0:
+            self.after(50, self._drain_ui_queue)
+        else:
+            self._ui_polling = False
+
+    def _fingerprint_algo(self):
+        """当前清单的份额指纹算法 (旧清单无该字段，为 sha256)"""
+        return self.loaded_manifest.get('fingerprint_algo', 'sha256')
+
+    def _add_authorized(self, payload):
+        """将已授权的份额加入重构池并登记其索引"""
+        self.authorized_shares.append(payload)
+        self._authorized_idx.add(payload.get('idx'))
+
+    def _load_cached(self, path):
+        """读取并解析文件，文件未修改 (mtime 不变) 时复用上次的结果"""
+        path = os.path.abspath(path)
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._file_cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        obj = codec.load(path)
+        self._file_cache[path] = (mtime, obj)
+        return obj
+
+    def on_close(self):
+        """关闭窗口：取消排队中的后台任务并结束锁定子进程"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self._lock_proc is not None and self._lock_proc.is_alive():
+            self._lock_proc.terminate()
+        self.destroy()
 
     # --- 通用日志 ---
     def log(self, widget, msg):
-        widget.insert("end", f"{msg}\n")
+        """缓冲日志消息，LOG_FLUSH_MS 毫秒内的消息合并为一次写入 (须在主线程调用)"""
+        pending = self._log_buffers.get(widget)
+        if pending is None:
+            pending = self._log_buffers[widget] = []
+            self.after(LOG_FLUSH_MS, self._flush_log, widget)
+        pending.append(str(msg))
+
+    def _flush_log(self, widget):
+        """一次 insert + see 写入全部缓冲消息，并裁剪超出 LOG_MAX_LINES 的旧行"""
+        pending = self._log_buffers.pop(widget, None)
+        if not pending:
+            return
+        widget.insert("end", "\n".join(pending) + "\n")
+        lines = int(widget.index("end-1c").split(".")[0])
+        if lines > LOG_MAX_LINES:
+            widget.delete("1.0", f"{lines - LOG_MAX_LINES + 1}.0")
         widget.see("end")
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     app = ModernApp()
     app.mainloop()
\ No newline at end of file
@@ -14,17 +14,18 @@
 
 import os
 import sys
-import json
 import time
 
 # 添加项目根目录到Python路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from QSP.src.config import Config
+from QSP.src.io import lattice_codec
+from QSP.src.io.fs import ensure_dir
 from QSP.src.crypto_lattice.keygen import KeyTool
 
 # 确保输出目录存在
-os.makedirs(Config.KEYS_DIR, exist_ok=True)
+ensure_dir(Config.KEYS_DIR)
 
 def generate_identity():
     """
@@ -45,13 +46,11 @@ def generate_identity():
     
     # 保存私钥文件
     sk_filename = os.path.join(Config.KEYS_DIR, f'user_{timestamp}.sk')
-    with open(sk_filename, 'w', encoding='utf-8') as f:
-        json.dump(sk, f, indent=2, ensure_ascii=False)
+    lattice_codec.dump(sk, sk_filename)
     
     # 保存公钥文件
     pk_filename = os.path.join(Config.KEYS_DIR, f'user_{timestamp}.pk')
-    with open(pk_filename, 'w', encoding='utf-8') as f:
-        json.dump(pk, f, indent=2, ensure_ascii=False)
+    lattice_codec.dump(pk, pk_filename)
     
     print("=" * 70)
     print("✅ 身份铸造成功！")
@@ -11,6 +11,7 @@ def main():
     parser.add_argument("--keys", "-k", default="my_identities", help="接收者公钥目录 (.pk)")
     parser.add_argument("--out", "-o", default="distributed_assets", help="输出目录")
     parser.add_argument("--threshold", "-t", type=int, default=3, help="恢复门限 t")
+    parser.add_argument("--pretty", action="store_true", help="以缩进格式写出资产清单 (便于人工查阅)")
     
     args = parser.parse_args()
     
@@ -30,7 +31,8 @@ def main():
             pk_dir=args.keys,
             cover_dir=args.covers,
             output_dir=args.out,
-            t=args.threshold
+            t=args.threshold,
+            pretty=args.pretty
         )
     except Exception as e:
         print(f"\n❌ 锁定失败: {str(e)}")
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import os
+import numpy as np
 
 class Config:
     """
@@ -28,6 +29,17 @@ class Config:
     Q = 8380417  
     N = 256      
     ROOT_OF_UNITY = 1753
+
+    # NTT 旋转因子表与模约简常数 (由 _precompute 填充)
+    NTT_FRIENDLY = None      # ROOT_OF_UNITY 是否为 2N 次本原单位根 (否则多项式乘法退回 Karatsuba)
+    BIT_REV = None           # BIT_REV[i] = i 的 log2(N) 位位反转
+    ZETAS = None             # ZETAS[i] = ROOT_OF_UNITY^brv(i) mod Q
+    INV_NTT_TWIDDLES = None  # 逆变换按蝶形块顺序使用的旋转因子
+    ZETAS_MONT = None        # Montgomery 形式 (x * 2^32 mod Q)，供 JIT 蝶形内核使用
+    INV_NTT_TWIDDLES_MONT = None
+    QINV = None              # Q^-1 mod 2^32 (Montgomery 约简)
+    BARRETT_SHIFT = None
+    BARRETT_MU = None        # floor(2^BARRETT_SHIFT / Q) (Barrett 约简)
     K = 2
     L = 2
     ETA = 2
@@ -50,9 +62,50 @@ class Config:
     N_PARTICIPANTS = 5
     LARGE_PRIME_Q = 257
 
+    # --- 完整性指纹 ---
+    INTEGRITY_HASH = "blake3"  # 份额指纹算法 (未安装 blake3 时退回 sha256)
+
     # --- 隐写参数 ---
     EMBEDDING_STRENGTH_K = 25 
     TARGET_COEFF_INDEX = 14
     
     # --- 可视化参数 ---
-    ENABLE_VISUALIZATION = True  # 是否启用可视化输出，生成余数图像
\ No newline at end of file
+    ENABLE_VISUALIZATION = True  # 是否启用可视化输出，生成余数图像
+
+    @classmethod
+    def _precompute(cls):
+        """预计算 NTT 旋转因子表与 Barrett/Montgomery 常数 (幂等，crypto_lattice 包导入时调用)"""
+        if cls.ZETAS is not None:
+            return
+        n, q, root = cls.N, cls.Q, cls.ROOT_OF_UNITY
+        width = (n - 1).bit_length()
+        cls.NTT_FRIENDLY = (q - 1) % (2 * n) == 0 and pow(root, n, q) == q - 1
+
+        # 位反转置换表: 逐位移动，一次得到全部下标
+        idx = np.arange(n, dtype=np.int64)
+        bit_rev = np.zeros(n, dtype=np.int64)
+        for b in range(width):
+            bit_rev |= ((idx >> b) & 1) << (width - 1 - b)
+        cls.BIT_REV = bit_rev
+
+        # root 的 0..n-1 次幂按位反转顺序重排
+        powers = [1] * n
+        for i in range(1, n):
+            powers[i] = powers[i - 1] * root % q
+        cls.ZETAS = np.array(powers, dtype=np.int64)[bit_rev]
+
+        # 逆变换: 按 len = 1, 2, ..., n/2 逐层，每层 B = n / (2 len) 个蝶形块，
+        # 第 b 块使用 -ZETAS[2B - 1 - b] mod Q (即 Dilithium 参考实现中的 -zetas[--k])
+        twiddles = []
+        length = 1
+        while length < n:
+            blocks = n // (2 * length)
+            twiddles.extend((-cls.ZETAS[2 * blocks - 1 - b]) % q for b in range(blocks))
+            length *= 2
+        cls.INV_NTT_TWIDDLES = np.array(twiddles, dtype=np.int64)
+        cls.ZETAS_MONT = (cls.ZETAS << 32) % q
+        cls.INV_NTT_TWIDDLES_MONT = (cls.INV_NTT_TWIDDLES << 32) % q
+
+        cls.QINV = pow(q, -1, 1 << 32)
+        cls.BARRETT_SHIFT = 2 * q.bit_length()
+        cls.BARRETT_MU = (1 << cls.BARRETT_SHIFT) // q
@@ -1,5 +1,8 @@
 # crypto_lattice模块初始化文件
 
+from ..config import Config
+Config._precompute()  # 在导入子模块 (ntt_engine 在导入时实例化) 之前完成预计算
+
 from .keygen import KeyGenerator
 from .signer import ThresholdSigner, SignatureAggregator
 from .ntt import NTT
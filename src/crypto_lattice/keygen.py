@@ -7,12 +7,13 @@ Module 1: Key Generation
 """
 
 import numpy as np
+import hashlib
 import secrets
 import os
-import json
 import time
 from ..config import Config
-from .ntt import polymul_rq
+from ..io import lattice_codec
+from .ntt import matvec_rq, to_ntt
 from .utils import LatticeUtils
 
 class KeyGenerator:
@@ -32,48 +33,43 @@ class KeyGenerator:
     def expand_a(self, seed):
         """
         从种子扩展生成公共矩阵 A (K x L)
+        以 SHAKE-128(seed) 作为 XOF，每 3 字节 (小端) 取低 23 位，拒绝 >= q 的值 (均匀分布于 [0, q))。
+        返回: 形状 (K, L, N) 的 int32 数组 (系数 < 2^23)
         """
-        # 简单使用 numpy 模拟 SHAKE-128 扩展
-        # 实际应用中应使用 hashlib.shake_128
-        seed_int = int.from_bytes(seed[:4], 'little')
-        np.random.seed(seed_int)
-        
-        A = []
-        for i in range(self.k):
-            row = []
-            for j in range(self.l):
-                poly = np.random.randint(0, self.q, self.n).tolist()
-                row.append(poly)
-            A.append(row)
-        return A
+        need = self.k * self.l * self.n
+        # q 接近 2^23，拒绝率约 0.1%，多取少量字节通常一次即可凑满
+        length = 3 * (need + need // 64)
+        while True:
+            stream = np.frombuffer(hashlib.shake_128(seed).digest(length), dtype=np.uint8)
+            b = stream.reshape(-1, 3).astype(np.int64)
+            vals = (b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)) & 0x7FFFFF
+            vals = vals[vals < self.q]
+            if vals.shape[0] >= need:
+                return vals[:need].astype(np.int32).reshape(self.k, self.l, self.n)
+            # XOF 输出的前缀不变，加长后重新截取即可
+            length *= 2
 
-    def generate_party_key(self, rho):
+    def generate_party_key(self, rho, A_ntt=None):
         """
         为单个参与者生成密钥对 (s_i, t_i)
         公钥 t_i = A * s1_i + s2_i
+        多项式以连续数组保存: s1 (L, N) / s2 (K, N) 为 int8 (|系数| <= eta)，t (K, N) 为 int32，
+        仅在进入 NTT 时拓宽为 int64
+        A_ntt: 可选，NTT 域中的 A (各方共享 rho 时由调用方只扩展、变换一次)
         """
-        A = self.expand_a(rho)
+        if A_ntt is None:
+            A_ntt = to_ntt(self.expand_a(rho))
         
         # 采样私钥向量 s1 (L维) 和 误差向量 s2 (K维)
         # 范围 [-eta, eta]
-        s1 = [np.random.randint(-self.eta, self.eta + 1, self.n).tolist() for _ in range(self.l)]
-        s2 = [np.random.randint(-self.eta, self.eta + 1, self.n).tolist() for _ in range(self.k)]
+        s1 = np.random.randint(-self.eta, self.eta + 1, size=(self.l, self.n), dtype=np.int8)
+        s2 = np.random.randint(-self.eta, self.eta + 1, size=(self.k, self.n), dtype=np.int8)
         
         # 计算部分公钥 t_i
         # 根据CRYSTALS-Dilithium标准，公钥 t_i = A @ s1
         # s2 是私钥的一部分，不应该包含在公钥中
-        # 使用直接加法，确保与签名生成和验证过程的处理方式一致
-        t = []
-        for i in range(self.k):
-            row_res = [0] * self.n
-            for j in range(self.l):
-                prod = polymul_rq(A[i][j], s1[j])
-                # 对 prod 进行中心化处理
-                centered_prod = [LatticeUtils.center_mod(c, self.q) for c in prod]
-                # 直接相加
-                for m in range(self.n):
-                    row_res[m] += centered_prod[m]
-            t.append(row_res)
+        # 结果中心化到 [-q/2, q/2]，组公钥 T 由各方 t_i 直接相加 (签名/验证过程只在模 q 下使用)
+        t = LatticeUtils.center_mod(matvec_rq(A_ntt, s1, matrix_is_ntt=True), self.q).astype(np.int32)
             
         # sk_i 包含 s1 (用于签名) 和 s2 (用于 LowBits 检查中的 Ce 计算)
         sk = {
@@ -95,20 +91,18 @@ class KeyGenerator:
         """
         rho = secrets.token_bytes(32)
         party_keys = []
+        # 各方共享 rho：A 只扩展并变换到 NTT 域一次
+        A_ntt = to_ntt(self.expand_a(rho))
         
         for i in range(n_parties):
-            pk, sk = self.generate_party_key(rho)
+            pk, sk = self.generate_party_key(rho, A_ntt)
             party_keys.append({'pk': pk, 'sk': sk, 'id': i})
             
         # 计算组公钥 T = sum(t_i)
-        # 初始化 T 为 0
-        T = [[0]*self.n for _ in range(self.k)]
+        # 直接相加，不使用 poly_add（避免标准取模）
+        T = np.zeros((self.k, self.n), dtype=np.int64)
         for p in party_keys:
-            t_i = p['pk']['t']
-            for k in range(self.k):
-                # 直接相加，不使用 poly_add（避免标准取模）
-                for i in range(self.n):
-                    T[k][i] += t_i[k][i]
+            T += p['pk']['t']
                 
         # 构造组公钥（rho 为字节类型）
         group_pk = {'rho': rho, 'T': T}
@@ -117,12 +111,13 @@ class KeyGenerator:
         group_pk_to_save = {'rho': rho.hex(), 'T': T}
         
         # 保存组公钥和各方密钥
+        # 使用定长二进制格式 (lattice_codec)：系数数组写为 int32 块，rho 等标量字段进入头部
+        # 不使用 .sk/.pk 后缀，以免与身份密钥文件混在同一目录中被当作身份列出
         timestamp = int(time.time())
-        group_pk_filename = os.path.join(Config.KEYS_DIR, f'group_public_key_{timestamp}.json')
+        group_pk_filename = os.path.join(Config.KEYS_DIR, f'group_public_key_{timestamp}.bin')
         
         # 保存组公钥
-        with open(group_pk_filename, 'w') as f:
-            json.dump(group_pk_to_save, f, indent=2)
+        lattice_codec.dump(group_pk_to_save, group_pk_filename)
         
         # 保存各方密钥
         for i, p in enumerate(party_keys):
@@ -141,14 +136,11 @@ class KeyGenerator:
                 's2': sk['s2']
             }
             
-            pk_filename = os.path.join(Config.KEYS_DIR, f'party_{i}_public_key_{timestamp}.json')
-            sk_filename = os.path.join(Config.KEYS_DIR, f'party_{i}_secret_key_{timestamp}.json')
+            pk_filename = os.path.join(Config.KEYS_DIR, f'party_{i}_public_key_{timestamp}.bin')
+            sk_filename = os.path.join(Config.KEYS_DIR, f'party_{i}_secret_key_{timestamp}.bin')
             
-            with open(pk_filename, 'w') as f:
-                json.dump(pk_to_save, f, indent=2)
-            
-            with open(sk_filename, 'w') as f:
-                json.dump(sk_to_save, f, indent=2)
+            lattice_codec.dump(pk_to_save, pk_filename)
+            lattice_codec.dump(sk_to_save, sk_filename)
         
         print(f"[KeyGen] System setup for {n_parties} parties complete.")
         print(f"[KeyGen] 组公钥已保存到: {group_pk_filename}")
@@ -159,19 +151,20 @@ class KeyGenerator:
     def sample_secret_poly(self):
         """
         采样私钥多项式。
-        系数服从 [-eta, eta] 的均匀分布。
+        系数服从 [-eta, eta] 的均匀分布，以 int8 保存。
         """
-        return np.random.randint(-self.eta, self.eta + 1, self.n).tolist()
+        return np.random.randint(-self.eta, self.eta + 1, self.n, dtype=np.int8)
 
     def generate_keys(self):
         """
         执行密钥生成流程。
         
         返回:
-            pk (Public Key): {'rho': bytes, 't1': list}
-            sk (Secret Key): {'rho': bytes, 's1': list, 's2': list, 't0': list}
+            pk (Public Key): {'rho': bytes, 't': ndarray (K, N)}
+            sk (Secret Key): {'rho': bytes, 's1': ndarray (L, N), 's2': ndarray (K, N)}
             
-        注意: 在完整实现中，sk 还应包含公钥的哈希 tr 和伪随机密钥 K
+        注意: 在完整实现中，t 还应经 Power2Round 拆分为 t1 / t0，
+        sk 还应包含公钥的哈希 tr 和伪随机密钥 K
         """
         # 1. 生成公共种子 rho
         rho = secrets.token_bytes(32)
@@ -180,23 +173,16 @@ class KeyGenerator:
         A = self.expand_a(rho)
         
         # 3. 采样私钥向量 s1 (长度 L) 和 s2 (长度 K)
-        s1 = [self.sample_secret_poly() for _ in range(self.l)]
-        s2 = [self.sample_secret_poly() for _ in range(self.k)]
+        s1 = np.random.randint(-self.eta, self.eta + 1, size=(self.l, self.n), dtype=np.int8)
+        s2 = np.random.randint(-self.eta, self.eta + 1, size=(self.k, self.n), dtype=np.int8)
         
         # 4. 计算 t = A @ s1 + s2
         # 这是一个矩阵向量乘法，元素运算为多项式乘法
-        t = []
-        for i in range(self.k):
-            # 计算 A 的第 i 行与 s1 的点积
-            row_res = [0] * self.n
-            for j in range(self.l):
-                # 多项式乘法
-                prod = polymul_rq(A[i][j], s1[j])
-                # 多项式加法 (逐系数模加)
-                row_res = [(c1 + c2) % self.q for c1, c2 in zip(row_res, prod)]
-            # 加上 s2[i]
-            row_res = [(c1 + c2) % self.q for c1, c2 in zip(row_res, s2[i])]
-            t.append(row_res)
+        t = ((matvec_rq(A, s1) + s2) % self.q).astype(np.int32)
+        
+        pk = {'rho': rho, 't': t}
+        sk = {'rho': rho, 's1': s1, 's2': s2}
+        return pk, sk
 
 class KeyTool:
     """
@@ -217,12 +203,13 @@ class KeyTool:
         ETA = Config.ETA
 
         # 1. 生成公共种子 (Public Seed) - 32 Bytes
-        # 这是一个随机数，包含在公钥里。验证者用它重建矩阵 A。
-        public_seed = secrets.token_hex(32)
+        # 这是一个随机数，包含在公钥里 (以十六进制保存)。验证者用它重建矩阵 A。
+        seed = secrets.token_bytes(32)
+        public_seed = seed.hex()
         
         # 2. 扩展生成公共矩阵 A (K x L)
-        # A 是完全由种子决定的，不需要存储在私钥里
-        A = LatticeUtils.gen_matrix(public_seed, K, L, N, Q)
+        # A 是完全由种子决定的，不需要存储在私钥里；直接使用原始字节，省去十六进制往返
+        A = LatticeUtils.gen_matrix(seed, K, L, N, Q)
         
         # 3. 采样私钥向量 s (L x 1) 和 误差向量 e (K x 1)
         # 这里的元素是“多项式”，不是数字
@@ -231,31 +218,11 @@ class KeyTool:
         e = [LatticeUtils.sample_poly_centered(N, ETA) for _ in range(K)]
         
         # 4. 计算 LWE 公钥 t = A * s + e
-        # 这是一个 矩阵(KxL) * 向量(Lx1) + 向量(Kx1) 的运算
+        # 这是一个 矩阵(KxL) * 向量(Lx1) + 向量(Kx1) 的运算，在 NTT 域内一次完成乘加
         print("[KeyTool] 执行 LWE 矩阵运算 (t = As + e)...")
-        t = [] # 结果是一个长度为 K 的多项式向量
-        
-        for i in range(K):
-            # 计算 A 的第 i 行与 s 的点积
-            # 使用Python内置的int类型，而不是numpy类型
-            row_poly_sum = [0] * N
-            
-            for j in range(L):
-                poly_a = A[i][j]
-                poly_s = s[j]
-                # 多项式乘法: a(x) * s(x)
-                product = LatticeUtils.polymul(poly_a, poly_s, Q, N)
-                # 对乘积进行中心化处理
-                centered_product = [LatticeUtils.center_mod(c, Q) for c in product]
-                # 累加并进行中心化处理
-                row_poly_sum = [(r + c) % Q for r, c in zip(row_poly_sum, centered_product)]
-            
-            # 加上误差 e[i] 并进行中心化处理
-            # t[i] = (RowSum + e[i]) mod Q
-            final_poly = [(r + c) % Q for r, c in zip(row_poly_sum, e[i])]
-            # 对最终结果进行中心化处理
-            centered_final_poly = [LatticeUtils.center_mod(c, Q) for c in final_poly]
-            t.append(centered_final_poly)
+        # t[i] = (RowSum + e[i]) mod Q，结果中心化处理
+        # 使用Python内置的int类型 (tolist)，而不是numpy类型
+        t = LatticeUtils.center_mod(matvec_rq(A, s) + np.asarray(e), Q).tolist()
             
         # --- 构造输出结构 ---
         
@@ -8,55 +8,140 @@ Module 1: Mathematical Core - Number Theoretic Transform (NTT)
 2. 前向 NTT 变换 (Forward NTT, Cooley-Tukey)
 3. 逆向 NTT 变换 (Inverse NTT, Gentleman-Sande)
 4. 频域逐点乘法 (Point-wise Multiplication)
+
+蝶形运算在安装了 numba 时以 @njit 编译为原生代码 (显式签名，导入时即完成编译并缓存到磁盘)，
+旋转因子取 Montgomery 形式，内层以 Montgomery 约简代替 64 位除法取模；
+否则退化为按层批量计算的 NumPy 实现。
 """
 
+import numpy as np
+
 from ..config import Config
 
-class NTT:
-    def __init__(self):
-        self.n = Config.N
-        self.q = Config.Q
-        self.root = Config.ROOT_OF_UNITY
-        
-        # 预计算旋转因子表
-        # self.zetas 用于前向 NTT
-        # self.zetas_inv 用于逆向 NTT
-        self.zetas = [0] * self.n
-        self.zetas_inv = [0] * self.n
-        self._precompute_zetas()
-
-    def _bit_reverse(self, k, num_bits):
-        """
-        辅助函数：计算 k 的位反转值。
-        例如：在 8 位下，00000001 (1) -> 10000000 (128)
-        """
-        return int('{:0{width}b}'.format(k, width=num_bits)[::-1], 2)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 
-    def _precompute_zetas(self):
+def _ntt_layers_np(a, zetas, q):
+    """NumPy 版本：对 (R, N) 的每一行做前向 NTT，每层的全部蝶形一次完成 (原地修改 a)"""
+    rows, n = a.shape
+    len_ = n // 2
+    while len_ > 0:
+        blocks = n // (2 * len_)
+        v = a.reshape(rows, blocks, 2, len_)
+        # 本层第 b 个块使用 zetas[blocks + b] (对应参考实现中的 zetas[++k])
+        zeta = zetas[blocks:2 * blocks, None]
+        t = zeta * v[:, :, 1, :] % q
+        lo = v[:, :, 0, :]
+        v[:, :, 1, :] = (lo - t) % q
+        v[:, :, 0, :] = (lo + t) % q
+        len_ //= 2
+
+
+def _invntt_layers_np(a, twiddles, q, n_inv):
+    """NumPy 版本：对 (R, N) 的每一行做逆向 NTT 并乘以 n^-1 (原地修改 a)"""
+    rows, n = a.shape
+    len_ = 1
+    j = 0
+    while len_ < n:
+        blocks = n // (2 * len_)
+        v = a.reshape(rows, blocks, 2, len_)
+        inv_zeta = twiddles[j:j + blocks, None]
+        t = v[:, :, 0, :].copy()
+        u = v[:, :, 1, :]
+        v[:, :, 0, :] = (t + u) % q
+        v[:, :, 1, :] = (t - u) * inv_zeta % q
+        j += blocks
+        len_ *= 2
+    a *= n_inv
+    a %= q
+
+
+if NUMBA_AVAILABLE:
+    @njit("int64(int64, int64, int64)", cache=True, inline="always")
+    def _mont_reduce(x, q, qinv):
         """
-        预计算 NTT 所需的旋转因子。
-        为了处理 X^n + 1 的负循环卷积，我们需要使用 2n 次单位根。
-        这里的实现采用了 Dilithium 参考代码中的标准顺序。
+        Montgomery 约简: 返回 x * 2^-32 mod q，要求 0 <= x < q * 2^32
+        m = x * q^-1 mod 2^32 使 x - m*q 低 32 位为 0，右移即完成除以 2^32
         """
-        # 计算所有需要的 zeta 幂
-        # 我们使用 root (1753) 作为发生器
-        
-        # 预计算前向 zetas
-        # 这里我们生成位反转顺序的幂次，以配合迭代式 NTT
+        m = ((x & 0xFFFFFFFF) * qinv) & 0xFFFFFFFF
+        r = (x - m * q) >> 32
+        if r < 0:
+            r += q
+        return r
+
+    @njit("void(int64[::1], int64[::1], int64, int64)", cache=True)
+    def _ntt_core(a, zetas_mont, q, qinv):
+        """前向 NTT (Cooley-Tukey)，原地修改 a；zetas_mont 为 Montgomery 形式"""
+        n = a.shape[0]
+        k = 0
+        len_ = n // 2
+        while len_ > 0:
+            for start in range(0, n, 2 * len_):
+                k += 1
+                zeta = zetas_mont[k]
+                for j in range(start, start + len_):
+                    t = _mont_reduce(zeta * a[j + len_], q, qinv)
+                    u = a[j]
+                    a[j + len_] = u - t if u >= t else u - t + q
+                    u += t
+                    a[j] = u - q if u >= q else u
+            len_ //= 2
+
+    @njit("void(int64[::1], int64[::1], int64, int64, int64)", cache=True)
+    def _invntt_core(a, twiddles_mont, q, qinv, n_inv_mont):
+        """逆向 NTT (Gentleman-Sande) 并乘以 n^-1，原地修改 a；旋转因子与 n^-1 均为 Montgomery 形式"""
+        n = a.shape[0]
         k = 0
-        for len_ in [1 << i for i in range(7, -1, -1)]:
-            for start in range(0, self.n, 2 * len_):
-                # 计算 bit_rev(k) 对应的幂
-                # 注意：为了代码的可执行性，这里采用一个简化的幂次生成策略
-                # 能够保证正确性的关键是 zeta 的顺序与蝶形运算的层级匹配
-                zeta = pow(self.root, self._bit_reverse(k, 8), self.q) # 简化逻辑
-                self.zetas[k] = zeta
+        len_ = 1
+        while len_ < n:
+            for start in range(0, n, 2 * len_):
+                zeta = twiddles_mont[k]
                 k += 1
-                
-        # 预计算逆向 zetas
-        # 逆向 zetas 是前向 zetas 的逆元
-        for i in range(self.n):
-            self.zetas_inv[i] = pow(self.zetas[i], self.q - 2, self.q)
+                for j in range(start, start + len_):
+                    t = a[j]
+                    u = a[j + len_]
+                    s = t + u
+                    a[j] = s - q if s >= q else s
+                    # t - u + q 落在 [1, 2q)，保证约简输入非负
+                    a[j + len_] = _mont_reduce((t - u + q) * zeta, q, qinv)
+            len_ *= 2
+        for j in range(n):
+            a[j] = _mont_reduce(a[j] * n_inv_mont, q, qinv)
+
+    @njit("void(int64[:, ::1], int64[::1], int64, int64)", cache=True)
+    def _ntt_rows(a, zetas_mont, q, qinv):
+        """对 (R, N) 的每一行原地做前向 NTT (一次调用处理整批，省去逐行的分派开销)"""
+        for r in range(a.shape[0]):
+            _ntt_core(a[r], zetas_mont, q, qinv)
+
+    @njit("void(int64[:, ::1], int64[::1], int64, int64, int64)", cache=True)
+    def _invntt_rows(a, twiddles_mont, q, qinv, n_inv_mont):
+        """对 (R, N) 的每一行原地做逆向 NTT"""
+        for r in range(a.shape[0]):
+            _invntt_core(a[r], twiddles_mont, q, qinv, n_inv_mont)
+
+def _require_ntt_friendly():
+    """当前参数没有 2N 次本原单位根时，NTT 域的结果没有意义，直接报错而不是静默给出错误结果"""
+    if not Config.NTT_FRIENDLY:
+        raise ValueError(
+            f"参数 Q={Config.Q}, N={Config.N}, ROOT_OF_UNITY={Config.ROOT_OF_UNITY} 不支持 NTT "
+            f"(需要 2N | Q-1 且 root^N = -1 mod Q)；请使用 polymul_rq / matvec_rq 的系数域路径")
+
+
+class NTT:
+    def __init__(self):
+        self.n = Config.N
+        self.q = Config.Q
+        # 旋转因子表统一取自 Config._precompute (Config.ZETAS / INV_NTT_TWIDDLES 及其 Montgomery 形式)：
+        # 前向第 m 层 (m = 1, 2, 4, ..., n/2 个块) 使用 ZETAS[m .. 2m-1]，ZETAS[i] = root^brv(i) mod q
+        
+        # n^-1 mod q (逆变换最后一步使用)，只在初始化时计算一次
+        self.n_inv = pow(self.n, self.q - 2, self.q) # 费马小定理求逆元
+        self._n_inv_mont = (self.n_inv << 32) % self.q
 
     def ntt(self, poly):
         """
@@ -64,31 +149,24 @@ class NTT:
         输入: 长度为 256 的系数列表 (自然顺序)
         输出: 长度为 256 的频域列表 (位反转顺序，取决于实现)
         
-        采用 Cooley-Tukey 蝶形运算。
+        采用 Cooley-Tukey 蝶形运算，旋转因子取自 Config.ZETAS 预计算表。
         """
-        a = list(poly) # 创建副本以避免修改原数据
-        n = self.n
-        q = self.q
-        
-        len_ = n // 2
-        root = self.root
-        
-        # 迭代层级
-        j = 0
-        while len_ > 0:
-            for start in range(0, n, 2 * len_):
-                # 获取当前层的旋转因子
-                # 在每一层，我们使用 2n 次单位根的不同幂次
-                # 这里的 pow 计算在实际中应查表 (self.zetas)
-                zeta = pow(root, self._bit_reverse(j + len_, 8), q) # 动态计算以确保正确性演示
-                j += 1
-                
-                for k in range(start, start + len_):
-                    # 蝶形运算
-                    t = (zeta * a[k + len_]) % q
-                    a[k + len_] = (a[k] - t) % q
-                    a[k] = (a[k] + t) % q
-            len_ //= 2
+        a = np.asarray(poly, dtype=np.int64) % self.q  # 唯一的一次拷贝
+        return self.ntt_inplace(a).tolist()
+
+    def ntt_inplace(self, a):
+        """
+        原地前向 NTT (不分配新缓冲区)
+        输入: 形状 (..., N) 的 C 连续 int64 数组，系数须已在 [0, q-1]；各行独立变换
+        输出: a 本身
+        参数不支持 NTT 时抛出 ValueError
+        """
+        _require_ntt_friendly()
+        rows = a.reshape(-1, self.n)  # 连续数组的 reshape 为视图
+        if NUMBA_AVAILABLE:
+            _ntt_rows(rows, Config.ZETAS_MONT, self.q, Config.QINV)
+        else:
+            _ntt_layers_np(rows, Config.ZETAS, self.q)
         return a
 
     def inv_ntt(self, poly):
@@ -98,34 +176,25 @@ class NTT:
         输出: 系数列表
         
         采用 Gentleman-Sande 蝶形运算。
+        旋转因子取自 Config.INV_NTT_TWIDDLES 预计算表 (已含 X^n = -1 带来的负号)。
         """
-        a = list(poly)
-        n = self.n
-        q = self.q
-        root = self.root
-        
-        len_ = 1
-        j = 0
-        while len_ < n:
-            for start in range(0, n, 2 * len_):
-                # 逆变换使用 zeta 的逆元，或者 -zeta
-                # 根据负循环卷积特性，这里使用特定的幂次
-                zeta = pow(root, self._bit_reverse(j + len_, 8), q)
-                inv_zeta = (-zeta) % q # 负号来自于 X^n = -1 的性质
-                j += 1
-                
-                for k in range(start, start + len_):
-                    # GS 蝶形运算
-                    t = a[k]
-                    a[k] = (t + a[k + len_]) % q
-                    a[k + len_] = (t - a[k + len_]) * inv_zeta % q
-            len_ *= 2
-            
-        # 最后乘以 n^-1
-        n_inv = pow(n, q - 2, q) # 费马小定理求逆元
-        for i in range(n):
-            a[i] = (a[i] * n_inv) % q
-            
+        a = np.asarray(poly, dtype=np.int64) % self.q
+        return self.inv_ntt_inplace(a).tolist()
+
+    def inv_ntt_inplace(self, a):
+        """
+        原地逆向 NTT
+        输入: 形状 (..., N) 的 C 连续 int64 数组，系数须已在 [0, q-1]；各行独立变换
+        输出: a 本身
+        参数不支持 NTT 时抛出 ValueError
+        """
+        _require_ntt_friendly()
+        rows = a.reshape(-1, self.n)
+        # 最后乘以 n^-1 (已在初始化时预计算)
+        if NUMBA_AVAILABLE:
+            _invntt_rows(rows, Config.INV_NTT_TWIDDLES_MONT, self.q, Config.QINV, self._n_inv_mont)
+        else:
+            _invntt_layers_np(rows, Config.INV_NTT_TWIDDLES, self.q, self.n_inv)
         return a
 
     def poly_mul(self, a, b):
@@ -134,36 +203,118 @@ class NTT:
         输入: 两个经 NTT 变换后的多项式
         输出: 乘积多项式 (仍在频域)
         """
-        c = [0] * self.n
-        for i in range(self.n):
-            c[i] = (a[i] * b[i]) % self.q
-        return c
+        c = np.asarray(a, dtype=np.int64) * np.asarray(b, dtype=np.int64) % self.q
+        return c.tolist()
+
+# Karatsuba 递归的基准长度：不超过该长度时直接 np.convolve
+KARATSUBA_CUTOFF = 32
+
+
+def _karatsuba(a, b, q):
+    """
+    Karatsuba 乘法 (普通多项式，结果长度 2n-1，系数模 q)
+    a, b 为等长的 int64 数组，系数须在 [0, q-1]；每层都约简到 [0, q-1]，保证不溢出 int64
+    """
+    n = a.shape[0]
+    if n <= KARATSUBA_CUTOFF:
+        return np.convolve(a, b) % q
+    
+    m = (n + 1) // 2
+    a0, b0 = a[:m], b[:m]
+    a1 = np.pad(a[m:], (0, 2 * m - n))
+    b1 = np.pad(b[m:], (0, 2 * m - n))
+    z0 = _karatsuba(a0, b0, q)
+    z2 = _karatsuba(a1, b1, q)
+    z1 = _karatsuba((a0 + a1) % q, (b0 + b1) % q, q) - z0 - z2
+    
+    res = np.zeros(4 * m - 1, dtype=np.int64)
+    res[:2 * m - 1] += z0
+    res[m:3 * m - 1] += z1
+    res[2 * m:] += z2
+    return res[:2 * n - 1] % q
+
 
 def polymul_rq(poly_a, poly_b):
     """
     环 R_q = Z_q[X]/(X^N + 1) 上的多项式乘法
-    使用 Schoolbook 算法 (O(N^2))，比 NTT 慢但绝对正确，适合原型验证。
+    NTT 域逐点相乘: a * b = INTT(NTT(a) ∘ NTT(b))，复杂度 O(N log N)。
+    系数约简到 [0, q-1] 后逐点积 < 2^46，不会溢出 int64。
+    参数不支持 NTT (q 中没有 2N 次本原单位根) 时退回 Karatsuba (O(N^1.58))。
     """
-    n = Config.N
     q = Config.Q
-    result = [0] * n
+    if not Config.NTT_FRIENDLY:
+        n = Config.N
+        full = _karatsuba(np.asarray(poly_a, dtype=np.int64) % q,
+                          np.asarray(poly_b, dtype=np.int64) % q, q)
+        # X^(i+j) (i+j >= n) -> -X^(i+j-n)
+        res = full[:n].copy()
+        res[:n - 1] -= full[n:]
+        return (res % q).tolist()
+    # 两个操作数放入同一缓冲区，一次调用完成两次前向变换
+    ab = np.empty((2, Config.N), dtype=np.int64)
+    ab[0] = poly_a
+    ab[1] = poly_b
+    ab %= q
+    ntt_engine.ntt_inplace(ab)
+    a = ab[0]
+    a *= ab[1]
+    a %= q
+    return ntt_engine.inv_ntt_inplace(a).tolist()
+
+def _matvec_schoolbook(matrix, vec):
+    """matvec_rq 的系数域实现 (不依赖 NTT 表)，形状约定与 matvec_rq 相同"""
+    A = np.asarray(matrix, dtype=np.int64)
+    s = np.asarray(vec, dtype=np.int64)
+    k, l = A.shape[0], A.shape[1]
+    flat = s.reshape(-1, l, Config.N)
+    out = np.zeros((flat.shape[0], k, Config.N), dtype=np.int64)
+    for b, v in enumerate(flat):
+        for i in range(k):
+            for j in range(l):
+                out[b, i] += polymul_rq(A[i, j], v[j])
+    return (out % Config.Q).reshape(s.shape[:-2] + (k, Config.N))
+
+def to_ntt(polys):
+    """
+    将任意形状 (..., N) 的多项式批量变换到 NTT 域
+    返回: 同形状的 int64 新数组 (输入不被修改)
+    """
+    a = np.array(polys, dtype=np.int64) % Config.Q
+    return ntt_engine.ntt_inplace(a)
+
+def from_ntt(polys_ntt):
+    """
+    to_ntt 的逆操作: 将 NTT 域的 (..., N) 数组批量变换回系数域
+    返回: 同形状的 int64 新数组，系数落在 [0, q-1] (输入不被修改)
+    """
+    a = np.array(polys_ntt, dtype=np.int64) % Config.Q
+    return ntt_engine.inv_ntt_inplace(a)
+
+def matvec_rq(matrix, vec, matrix_is_ntt=False):
+    """
+    多项式矩阵-向量乘法 A·s (环 R_q 上)
+    A 的 K·L 个多项式与 s 的 L 个多项式各做一次前向 NTT，频域内一次完成乘加，
+    最后只需 K 次逆变换 (逐对 polymul_rq 需要 2·K·L 次前向与 K·L 次逆变换)。
+    参数:
+        matrix: 形状 (K, L, N) 的系数 (数组或嵌套列表)
+        vec: 形状 (L, N) 的系数；也可带前导批量维 (..., L, N)，对每个向量分别计算
+        matrix_is_ntt: 为 True 时 matrix 已是 to_ntt 的结果 (同一 A 多次使用时只需变换一次)
+    返回:
+        np.ndarray: 形状 (K, N) (批量时为 (..., K, N)) 的 int64 数组，系数落在 [0, q-1]
+    参数不支持 NTT 时对系数域矩阵逐对调用 polymul_rq (Karatsuba)；matrix_is_ntt=True 则抛出 ValueError
+    """
+    q = Config.Q
+    if not Config.NTT_FRIENDLY:
+        if matrix_is_ntt:
+            _require_ntt_friendly()
+        return _matvec_schoolbook(matrix, vec)
     
-    for i in range(n):
-        for j in range(n):
-            # 乘法：先对输入系数进行模 q 处理，确保在 [0, q-1] 范围内
-            a = poly_a[i] % q
-            b = poly_b[j] % q
-            val = (a * b) % q
-            
-            # 处理 X^k (k >= n) 的情况: X^N = -1 mod (X^N + 1)
-            # 所以 X^(i+j) -> 如果 i+j >= n, 则是 -X^(i+j-n)
-            if i + j < n:
-                result[i + j] = (result[i + j] + val) % q
-            else:
-                result[i + j - n] = (result[i + j - n] - val) % q
-                
-    # 确保结果为正
-    return [(x + q) % q for x in result]
+    A = matrix if matrix_is_ntt else to_ntt(matrix)
+    s = to_ntt(vec)
+    
+    # 逐点积 < q^2 < 2^46，L 项直接累加也不会溢出 int64，只需在累加后约简一次
+    t = (A * s[..., None, :, :]).sum(axis=-2) % q
+    return ntt_engine.inv_ntt_inplace(t)
 
 # 单例模式：创建一个全局引擎实例供其他模块调用
 ntt_engine = NTT()
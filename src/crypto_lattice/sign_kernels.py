@@ -0,0 +1,200 @@
+"""
+Module 1: Signing Kernels
+文件路径: src/crypto_lattice/sign_kernels.py
+
+门限签名阶段 2 (响应 + 拒绝采样) 的数值内核。
+挑战多项式 c 为 TAU 个 ±1 的稀疏多项式，c * s 只需对 s 做 TAU 次负循环移位累加，
+远快于通用的 O(N^2) 多项式乘法。
+挑战多项式本身由哈希摘要逐字节拒绝采样得到 (sample_challenge)，同样编译为原生循环。
+安装了 numba 时以 @njit 编译为原生代码，否则退化为等价的 NumPy 实现。
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _sparse_mul_py(c, s, q):
+    """
+    NumPy 版本：环 Z_q[X]/(X^N + 1) 上 c * s (逐行)，结果落在 [0, q-1]
+    c: (N,) 稀疏挑战多项式；s: (R, N) 多项式矩阵
+    """
+    n = c.shape[0]
+    out = np.zeros(s.shape, dtype=np.int64)
+    for i in np.flatnonzero(c):
+        # X^i * s(X): 前 i 个系数环绕到高位并取负
+        shifted = np.empty_like(out)
+        shifted[:, i:] = s[:, :n - i]
+        shifted[:, :i] = -s[:, n - i:]
+        out += c[i] * shifted
+    return out % q
+
+
+def _center_abs_max_py(x, q):
+    """NumPy 版本：中心化取模后的最大绝对值"""
+    h = (q - 1) // 2
+    r = (x + h) % q - h
+    return int(np.max(np.abs(r)))
+
+
+def _lowbits_abs_max_py(x, q, alpha):
+    """NumPy 版本：LowBits(center_mod(x)) 的最大绝对值"""
+    h = (q - 1) // 2
+    r = (x + h) % q - h
+    ha = (alpha - 1) // 2
+    r0 = (r + ha) % alpha - ha
+    return int(np.max(np.abs(r0)))
+
+
+def _sample_challenge_py(digest, n, tau):
+    """NumPy 版本：各位置首次出现的字节按顺序取前 tau 个"""
+    idx = digest % n
+    _, first = np.unique(idx, return_index=True)
+    picked = np.sort(first)[:tau]
+    c = np.zeros(n, dtype=np.int64)
+    c[idx[picked]] = np.where(digest[picked] & 1, 1, -1)
+    return c
+
+
+if NUMBA_AVAILABLE:
+    @njit("int64[::1](int64[::1], int64, int64)", cache=True, boundscheck=False)
+    def _sample_challenge_nb(digest, n, tau):
+        """逐字节拒绝采样: 位置 b % n 未占用时置为 ±1，放满 tau 个即停止"""
+        c = np.zeros(n, dtype=np.int64)
+        weight = 0
+        for i in range(digest.shape[0]):
+            if weight >= tau:
+                break
+            b = digest[i]
+            idx = b % n
+            if c[idx] == 0:
+                c[idx] = 1 if (b & 1) else -1
+                weight += 1
+        return c
+
+    @njit(cache=True)
+    def _sparse_mul_nb(c, s, q):
+        """c * s (逐行)，仅遍历 c 的非零系数"""
+        rows, n = s.shape
+        out = np.zeros((rows, n), dtype=np.int64)
+        for i in range(n):
+            ci = c[i]
+            if ci == 0:
+                continue
+            for r in range(rows):
+                for j in range(n):
+                    k = i + j
+                    if k < n:
+                        out[r, k] += ci * s[r, j]
+                    else:
+                        out[r, k - n] -= ci * s[r, j]
+        for r in range(rows):
+            for k in range(n):
+                out[r, k] %= q
+        return out
+
+    @njit(cache=True)
+    def _response_nb(y, s1, c, q):
+        """z = (y + c * s1) mod q，并返回 z 中心化后的无穷范数"""
+        z = _sparse_mul_nb(c, s1, q)
+        half = q // 2
+        max_norm = 0
+        rows, n = z.shape
+        for r in range(rows):
+            for k in range(n):
+                v = (z[r, k] + y[r, k]) % q
+                z[r, k] = v
+                if v > half:
+                    v -= q
+                if v < 0:
+                    v = -v
+                if v > max_norm:
+                    max_norm = v
+        return z, max_norm
+
+    @njit(cache=True)
+    def _lowbits_nb(Ay, s2, c, q, alpha):
+        """max |LowBits(Ay - c * s2)|"""
+        ce = _sparse_mul_nb(c, s2, q)
+        half_q = q // 2
+        half_a = alpha // 2
+        max_low = 0
+        rows, n = Ay.shape
+        for r in range(rows):
+            for k in range(n):
+                v = (Ay[r, k] - ce[r, k]) % q
+                if v > half_q:
+                    v -= q
+                r0 = v % alpha
+                if r0 > half_a:
+                    r0 -= alpha
+                if r0 < 0:
+                    r0 = -r0
+                if r0 > max_low:
+                    max_low = r0
+        return max_low
+
+
+def sample_challenge(digest, n, tau):
+    """
+    由哈希摘要生成稀疏挑战多项式 (tau 个 ±1)
+    依次取摘要字节 b: 位置 b % n 首次出现时置为 ±1 (由 b 的最低位决定)，直到放满 tau 个
+    参数:
+        digest (bytes): XOF 输出
+        n: 多项式长度
+        tau: 非零系数个数上限
+    返回:
+        np.ndarray: 长度 n 的 int64 数组
+    """
+    d = np.frombuffer(digest, dtype=np.uint8).astype(np.int64)
+    if NUMBA_AVAILABLE:
+        return _sample_challenge_nb(d, n, tau)
+    return _sample_challenge_py(d, n, tau)
+
+
+def response(y, s1, c_poly, q):
+    """
+    计算响应 z = y + c * s1 (mod q)
+    参数:
+        y: (L, N) 掩码向量
+        s1: (L, N) int32 私钥向量
+        c_poly: 长度 N 的挑战多项式
+        q: 模数
+    返回:
+        (z, max_norm): z 为 (L, N) int64 矩阵，max_norm 为其中心化无穷范数
+    """
+    y = np.ascontiguousarray(y, dtype=np.int64)
+    c = np.ascontiguousarray(c_poly, dtype=np.int64)
+    s1 = np.ascontiguousarray(s1, dtype=np.int32)
+
+    if NUMBA_AVAILABLE:
+        z, max_norm = _response_nb(y, s1, c, q)
+        return z, int(max_norm)
+
+    z = (y + _sparse_mul_py(c, s1.astype(np.int64), q)) % q
+    return z, _center_abs_max_py(z, q)
+
+
+def lowbits_norm(Ay, s2, c_poly, q, alpha):
+    """
+    计算 max |LowBits(Ay - c * s2)|，用于阶段 2 的 LowBits 拒绝检查
+    参数:
+        Ay: (K, N) 承诺向量 A * y
+        s2: (K, N) int32 私钥误差向量
+        c_poly: 长度 N 的挑战多项式
+        q: 模数
+        alpha: 分解因子 (2 * GAMMA2)
+    """
+    Ay = np.ascontiguousarray(Ay, dtype=np.int64)
+    c = np.ascontiguousarray(c_poly, dtype=np.int64)
+    s2 = np.ascontiguousarray(s2, dtype=np.int32)
+
+    if NUMBA_AVAILABLE:
+        return int(_lowbits_nb(Ay, s2, c, q, alpha))
+
+    R = Ay - _sparse_mul_py(c, s2.astype(np.int64), q)
+    return _lowbits_abs_max_py(R, q, alpha)
@@ -6,61 +6,122 @@ Module 1: Threshold Signer and LWE Signer
 import time
 import numpy as np
 import hashlib
-import json
 from ..config import Config
-from .ntt import polymul_rq
+from .ntt import to_ntt, from_ntt, matvec_rq
 from .utils import LatticeUtils
 from .keygen import KeyGenerator
+from . import sign_kernels
+
+def _hash_challenge(message, W_HighBits, timestamp):
+    """
+    由 (消息, HighBits(W), 时间戳) 生成稀疏挑战多项式 C (TAU 个 ±1)
+    W 的每个系数按 4 字节小端有符号整数序列化 ('<i4' 的 tobytes 与逐系数 to_bytes 拼接逐字节相同)
+    """
+    w_bytes = np.ascontiguousarray(W_HighBits, dtype='<i4').tobytes()
+    t_bytes = int(timestamp).to_bytes(8, 'little')
+    digest = hashlib.shake_256(message + w_bytes + t_bytes).digest(Config.N // 2)
+    return sign_kernels.sample_challenge(digest, Config.N, Config.TAU).tolist()
 
 class ThresholdSigner:
     """
     参与者节点逻辑 (Parties)
     """
+    # rho -> (A, A_ntt)：门限场景中各参与者共享同一 rho，只有第一个签名者需要扩展并变换矩阵
+    _A_cache = {}
+
     def __init__(self, sk_share, index):
         self.sk = sk_share
+        # 私钥向量以连续 int32 矩阵缓存，供阶段 2 的数值内核直接使用
+        self.s1 = np.ascontiguousarray(sk_share['s1'], dtype=np.int32)
+        self.s2 = np.ascontiguousarray(sk_share['s2'], dtype=np.int32)
         self.index = index
         self.n_participants = Config.N_PARTICIPANTS if hasattr(Config, 'N_PARTICIPANTS') else 5
-        self.A = KeyGenerator().expand_a(sk_share['rho'])
+        # A 在 NTT 域的表示只算一次，各轮承诺 / 拒绝检查直接做逐点乘
+        self.A, self.A_ntt = self._expand_a(sk_share['rho'])
+        # 掩码采样使用独立的 Generator (由操作系统熵源播种)，不受全局 np.random 状态影响
+        self._rng = np.random.default_rng()
         self.y = None 
+        self.Ay = None  # 阶段 1 算出的 A * y，阶段 2 的 LowBits 检查直接复用
+        self._Ay_of = None  # 计算 self.Ay 时所用的掩码对象 (self.y 被外部替换时据此重算)
         self.w_share = None 
         self.timestamp = None
+        self.y_batch = None
+        self.Ay_batch = None
 
     def phase1_commitment(self, timestamp=None):
         """
         阶段 1: 生成承诺
         [修正] 返回完整的 Ay 向量，以便 Aggregator 进行正确的 HighBits(Sum) 计算。
+        返回: (K, N) int64 数组 (中心化的 Ay)
         """
         self.timestamp = timestamp if timestamp else int(time.time())
         
-        self.y = []
         # 调整 y 向量的采样范围，使其更小，提高拒绝采样成功率
         # Config.GAMMA1 是 (Q-1)//2，大约 4,190,208
         # 采样范围设置为 GAMMA1 的 1/8，这样加上 C*s_i 后也不会超过 GAMMA1
         bound = Config.GAMMA1 >> 3 
-        for _ in range(Config.L):
-            poly = np.random.randint(-bound, bound + 1, Config.N).tolist()
-            self.y.append(poly)
+        self.y = self._rng.integers(-bound, bound + 1, size=(Config.L, Config.N), dtype=np.int64)
             
-        Ay = self._matrix_vec_mul(self.A, self.y)
+        self.Ay = self._matrix_vec_mul(self.A_ntt, self.y)
+        self._Ay_of = self.y
         
-        # 中心化处理
-        centered_Ay = []
-        for poly in Ay:
-            centered_poly = [LatticeUtils.center_mod(c, Config.Q) for c in poly]
-            centered_Ay.append(centered_poly)
+        # 中心化处理 (整个 (K, N) 矩阵一次完成)
+        centered_Ay = LatticeUtils.center_mod(self.Ay, Config.Q)
         
         # [关键] 直接返回 Ay，而不是 HighBits(Ay)
         # 这样 Aggregator 可以先求和 Sum(Ay)，再计算 HighBits(Sum(Ay))
         self.w_share = centered_Ay
         return self.w_share
 
+    def phase1_commitment_batch(self, batch, timestamp=None):
+        """
+        阶段 1 (批量): 一次采样 batch 组掩码 y，返回各自的承诺 Ay
+        与 phase2_response_batch 配合，把多次拒绝采样尝试合并为一轮
+        返回: (batch, K, N) int64 数组，第 b 行为第 b 组掩码的中心化承诺
+        """
+        self.timestamp = timestamp if timestamp else int(time.time())
+        
+        # 一次 NumPy 调用生成全部候选掩码，采样范围与 phase1_commitment 相同
+        bound = Config.GAMMA1 >> 3
+        self.y_batch = self._rng.integers(-bound, bound + 1, size=(batch, Config.L, Config.N), dtype=np.int64)
+        
+        # 全部候选掩码在一次频域乘加中完成
+        self.Ay_batch = self._matrix_vec_mul(self.A_ntt, self.y_batch)
+        return LatticeUtils.center_mod(self.Ay_batch, Config.Q)
+
+    def phase2_response_batch(self, global_Ay_sums, message_bytes):
+        """
+        阶段 2 (批量): 对 phase1_commitment_batch 的每组掩码计算响应并做拒绝检查
+        参数:
+            global_Ay_sums: 与各组掩码一一对应的聚合承诺 Sum(Ay)
+            message_bytes: 待签名消息
+        返回:
+            (candidates, flags): 候选响应列表 (被拒绝的为None) 与对应的接受标志数组
+        """
+        if self.y_batch is None:
+            raise ValueError("Phase 1 (batch) not executed.")
+        
+        candidates = [self._respond(y, Ay, Ay_sum, message_bytes)
+                      for y, Ay, Ay_sum in zip(self.y_batch, self.Ay_batch, global_Ay_sums)]
+        flags = np.array([z is not None for z in candidates], dtype=bool)
+        return candidates, flags
+
     def phase2_response(self, global_Ay_sum, message_bytes):
         """
         阶段 2: 生成响应
         """
         if self.y is None:
             raise ValueError("Phase 1 not executed.")
+        if self._Ay_of is not self.y:
+            self.Ay = self._matrix_vec_mul(self.A_ntt, self.y)
+            self._Ay_of = self.y
+        return self._respond(self.y, self.Ay, global_Ay_sum, message_bytes)
 
+    def _respond(self, y, Ay, global_Ay_sum, message_bytes):
+        """
+        对给定掩码 y 计算响应 z 并执行拒绝采样，被拒绝时返回None
+        Ay 为阶段 1 已算出的 A * y (不再重复矩阵-向量乘法)
+        """
         # 定义 alpha 变量，用于 LowBits 检查
         alpha = 2 * Config.GAMMA2
 
@@ -68,32 +129,18 @@ class ThresholdSigner:
         # 验证端计算的是 HighBits(AZ - CT)
         # 所以这里的挑战必须基于 HighBits(Sum(Ay))
         # 注意：global_Ay_sum 已经是中心化的 Sum(Ay)，不需要再次中心化
-        W_true = []
-        for poly in global_Ay_sum:
-            # 直接计算高位部分
-            w_p = [LatticeUtils.high_bits(c, alpha, Config.Q) for c in poly]
-            W_true.append(w_p)
+        # 整个 (K, N) 矩阵一次计算高位部分
+        W_true = LatticeUtils.high_bits(np.asarray(global_Ay_sum, dtype=np.int64), alpha, Config.Q)
 
         # 1. 计算全局挑战 C
         c_poly = self._derive_challenge(message_bytes, W_true, self.timestamp)
         
-        # 2. 计算 z = y + C * s_i
-        z_share = []
-        cs = [polymul_rq(c_poly, s_poly) for s_poly in self.sk['s1']]
-        
-        for j in range(Config.L):
-            z_poly = LatticeUtils.poly_add(self.y[j], cs[j], Config.Q)
-            z_share.append(z_poly)
+        # 2. 计算 z = y + C * s_i (稀疏挑战乘法 + 范数统计由内核一次完成)
+        z_share, max_norm = sign_kernels.response(y, self.s1, c_poly, Config.Q)
             
         # --- 3. 拒绝采样 ---
         
         # [检查 1]: 范数检查
-        centered_z_share = []
-        for poly in z_share:
-            centered_poly = [LatticeUtils.center_mod(c, Config.Q) for c in poly]
-            centered_z_share.append(centered_poly)
-        
-        max_norm = LatticeUtils.vec_infinity_norm(centered_z_share)
         norm_bound = Config.GAMMA1 - Config.BETA
         
         if max_norm >= norm_bound:
@@ -101,16 +148,7 @@ class ThresholdSigner:
             return None 
             
         # [检查 2]: LowBits 检查 (针对个人)
-        Ay = self._matrix_vec_mul(self.A, self.y)
-        Ce = [polymul_rq(c_poly, e_poly) for e_poly in self.sk['s2']]
-        R = [LatticeUtils.poly_sub(p1, p2, Config.Q) for p1, p2 in zip(Ay, Ce)]
-        
-        max_low_norm = 0
-        for poly in R:
-            centered = [LatticeUtils.center_mod(c, Config.Q) for c in poly]
-            low = [LatticeUtils.low_bits(c, alpha, Config.Q) for c in centered]
-            m = max([abs(x) for x in low])
-            if m > max_low_norm: max_low_norm = m
+        max_low_norm = sign_kernels.lowbits_norm(Ay, self.s2, c_poly, Config.Q, alpha)
         
         # 使用宽松的检查，主要依赖聚合后的概率通过
         low_bound = Config.GAMMA2 - Config.BETA
@@ -118,42 +156,26 @@ class ThresholdSigner:
             print(f"[Signer {self.index}] Rejected: LowBits {max_low_norm} >= {low_bound}")
             return None 
             
-        return z_share
+        return z_share.tolist()
 
-    def _matrix_vec_mul(self, matrix, vec):
-        k = len(matrix)
-        l = len(matrix[0])
-        res = []
-        for i in range(k):
-            row_sum = [0] * Config.N
-            for j in range(l):
-                prod = polymul_rq(matrix[i][j], vec[j])
-                # 直接计算差值，不使用 poly_add（避免标准取模）
-                for m in range(Config.N):
-                    row_sum[m] += prod[m]
-            res.append(row_sum)
-        return res
+    @classmethod
+    def _expand_a(cls, rho):
+        """由 rho 扩展矩阵 A 及其 NTT 域表示，按 rho 缓存 (缓存的数组只读，各签名者共享)"""
+        cached = cls._A_cache.get(rho)
+        if cached is None:
+            A = KeyGenerator().expand_a(rho)
+            A_ntt = to_ntt(A)
+            A.setflags(write=False)
+            A_ntt.setflags(write=False)
+            cached = cls._A_cache[rho] = (A, A_ntt)
+        return cached
+
+    def _matrix_vec_mul(self, A_ntt, vec):
+        """A * vec，A_ntt 为 __init__ 中缓存的 NTT 域矩阵；返回 (K, N) (批量为 (B, K, N)) int64 数组，系数在 [0, q-1]"""
+        return matvec_rq(A_ntt, vec, matrix_is_ntt=True)
 
     def _derive_challenge(self, message, W_HighBits, timestamp):
-        w_bytes = b""
-        for poly in W_HighBits:
-            for coeff in poly:
-                w_bytes += int(coeff).to_bytes(4, 'little', signed=True)
-        
-        t_bytes = int(timestamp).to_bytes(8, 'little')
-        input_data = message + w_bytes + t_bytes
-        digest = hashlib.shake_256(input_data).digest(Config.N // 2) 
-        
-        c = [0] * Config.N
-        weight = 0
-        for i in range(len(digest)):
-            if weight >= Config.TAU: break
-            b = digest[i]
-            idx = b % Config.N
-            if c[idx] == 0:
-                c[idx] = 1 if (b & 1) else -1
-                weight += 1
-        return c
+        return _hash_challenge(message, W_HighBits, timestamp)
 
 class SignatureAggregator:
     def derive_challenge(self, message, W_HighBits, timestamp):
@@ -161,67 +183,31 @@ class SignatureAggregator:
         生成挑战多项式
         与 ThresholdSigner._derive_challenge 方法使用相同的逻辑
         """
-        import hashlib
-        w_bytes = b""
-        for poly in W_HighBits:
-            for coeff in poly:
-                w_bytes += int(coeff).to_bytes(4, 'little', signed=True)
-        
-        t_bytes = int(timestamp).to_bytes(8, 'little')
-        input_data = message + w_bytes + t_bytes
-        digest = hashlib.shake_256(input_data).digest(Config.N // 2) 
-        
-        c = [0] * Config.N
-        weight = 0
-        for i in range(len(digest)):
-            if weight >= Config.TAU: break
-            b = digest[i]
-            idx = b % Config.N
-            if c[idx] == 0:
-                c[idx] = 1 if (b & 1) else -1
-                weight += 1
-        return c
+        return _hash_challenge(message, W_HighBits, timestamp)
 
     def aggregate_w_shares(self, w_shares):
         """
         这里输入的 w_shares 实际上是 Ay 向量。
         我们直接相加得到 Sum(Ay)。
         使用中心化加法，确保与签名生成阶段的处理方式一致。
+        返回: (K, N) int64 数组
         """
-        if not w_shares: return None
-        K = len(w_shares[0])
-        N = len(w_shares[0][0])
-        w_sum = [[0]*N for _ in range(K)]
-        
-        for w_share in w_shares:
-            for k in range(K):
-                # 直接计算差值，不使用 poly_add（避免标准取模）
-                for i in range(N):
-                    w_sum[k][i] += w_share[k][i]
+        if len(w_shares) == 0: return None
+        # 各份额堆叠为 (P, K, N) 后一次求和 (不取模)
+        w_sum = np.asarray(w_shares, dtype=np.int64).sum(axis=0)
         
         # 对结果进行中心化处理，确保与签名生成阶段的处理方式一致
-        centered_w_sum = []
-        for poly in w_sum:
-            centered_poly = [LatticeUtils.center_mod(c, Config.Q) for c in poly]
-            centered_w_sum.append(centered_poly)
-        
-        return centered_w_sum
+        return LatticeUtils.center_mod(w_sum, Config.Q)
 
     def aggregate_responses(self, z_shares):
         """
         聚合响应
         使用直接加法，确保与验证阶段的处理方式一致。
+        返回: (L, N) int64 数组
         """
-        if not z_shares: return None
-        L = len(z_shares[0])
-        N = len(z_shares[0][0])
-        z_sum = [[0]*N for _ in range(L)]
-        for z_share in z_shares:
-            for l in range(L):
-                # 直接计算差值，不使用 poly_add（避免标准取模）
-                for i in range(N):
-                    z_sum[l][i] += z_share[l][i]
-        return z_sum
+        if len(z_shares) == 0: return None
+        # 直接相加，不取模 (与逐系数累加的结果相同)
+        return np.asarray(z_shares, dtype=np.int64).sum(axis=0)
         
     def verify_final_signature(self, Z, C_poly, T_pub, A_matrix, message, timestamp, W_sum=None):
         """
@@ -238,9 +224,7 @@ class SignatureAggregator:
             W_sum: 签名者提供的原始承诺 (Sum(Ay))
         """
         # 1. 检查范数
-        centered_Z = []
-        for poly in Z:
-            centered_Z.append([LatticeUtils.center_mod(c, Config.Q) for c in poly])
+        centered_Z = LatticeUtils.center_mod(np.asarray(Z, dtype=np.int64), Config.Q)
         norm = LatticeUtils.vec_infinity_norm(centered_Z)
         bound = Config.GAMMA1 - Config.BETA
         
@@ -264,15 +248,12 @@ class SignatureAggregator:
             
             # 计算高位部分
             alpha = 2 * Config.GAMMA2
-            W_prime = []
             
             # 直接对 W_sum 计算高位部分，因为 W_sum 已经在 aggregate_w_shares 方法中进行了中心化处理
-            for poly in W_sum:
-                w_p = [LatticeUtils.high_bits(c, alpha, Config.Q) for c in poly]
-                W_prime.append(w_p)
+            W_prime = LatticeUtils.high_bits(np.asarray(W_sum, dtype=np.int64), alpha, Config.Q)
             
             # 打印 W_prime 的前几个值，用于调试
-            print(f"[Verify] W_prime 前2个多项式的前5个系数: {W_prime[0][:5]}, {W_prime[1][:5]}")
+            print(f"[Verify] W_prime 前2个多项式的前5个系数: {W_prime[0][:5].tolist()}, {W_prime[1][:5].tolist()}")
             
             # 检查 Hash
             c_prime = self.derive_challenge(message, W_prime, timestamp)
@@ -293,33 +274,21 @@ class SignatureAggregator:
             # 1. 计算 AZ
             AZ = self._matrix_vec_mul(A_matrix, Z)
             
-            # 2. 计算 CT
-            CT = []
-            for t_poly in T_pub:
-                ct_poly = polymul_rq(C_poly, t_poly)
-                CT.append(ct_poly)
+            # 2. 计算 CT (C 只做一次前向变换，K 个乘积一次批量逆变换)
+            CT = from_ntt(to_ntt(T_pub) * to_ntt(C_poly) % Config.Q)
             
             # 3. 计算 AZ - CT
-            actual = []
-            for az_poly, ct_poly in zip(AZ, CT):
-                diff_poly = [LatticeUtils.poly_sub([az], [ct], Config.Q)[0] for az, ct in zip(az_poly, ct_poly)]
-                actual.append(diff_poly)
+            actual = LatticeUtils.poly_sub(AZ, CT, Config.Q)
             
             # 4. 中心化处理
-            centered_actual = []
-            for poly in actual:
-                centered_poly = [LatticeUtils.center_mod(c, Config.Q) for c in poly]
-                centered_actual.append(centered_poly)
+            centered_actual = LatticeUtils.center_mod(actual, Config.Q)
             
             # 计算高位部分
             alpha = 2 * Config.GAMMA2
-            W_prime = []
-            for poly in centered_actual:
-                w_p = [LatticeUtils.high_bits(c, alpha, Config.Q) for c in poly]
-                W_prime.append(w_p)
+            W_prime = LatticeUtils.high_bits(centered_actual, alpha, Config.Q)
             
             # 打印 W_prime 的前几个值，用于调试
-            print(f"[Verify] W_prime 前2个多项式的前5个系数: {W_prime[0][:5]}, {W_prime[1][:5]}")
+            print(f"[Verify] W_prime 前2个多项式的前5个系数: {W_prime[0][:5].tolist()}, {W_prime[1][:5].tolist()}")
             
             # 检查 Hash
             c_prime = self.derive_challenge(message, W_prime, timestamp)
@@ -335,37 +304,8 @@ class SignatureAggregator:
             return True
 
     def _matrix_vec_mul(self, matrix, vec):
-        k = len(matrix)
-        l = len(matrix[0])
-        res = []
-        for i in range(k):
-            row_sum = [0] * Config.N
-            for j in range(l):
-                prod = polymul_rq(matrix[i][j], vec[j])
-                # 直接计算差值，不使用 poly_add（避免标准取模）
-                for m in range(Config.N):
-                    row_sum[m] += prod[m]
-            res.append(row_sum)
-        return res
-        
-    def derive_challenge(self, message, W_HighBits, timestamp):
-        w_bytes = b""
-        for poly in W_HighBits:
-            for coeff in poly:
-                w_bytes += int(coeff).to_bytes(4, 'little', signed=True)
-        t_bytes = int(timestamp).to_bytes(8, 'little')
-        input_data = message + w_bytes + t_bytes
-        digest = hashlib.shake_256(input_data).digest(Config.N // 2) 
-        c = [0] * Config.N
-        weight = 0
-        for i in range(len(digest)):
-            if weight >= Config.TAU: break
-            b = digest[i]
-            idx = b % Config.N
-            if c[idx] == 0:
-                c[idx] = 1 if (b & 1) else -1
-                weight += 1
-        return c
+        """A * vec (A 为系数域矩阵)，返回 (K, N) int64 数组，系数在 [0, q-1]"""
+        return matvec_rq(matrix, vec)
 
 class LatticeSigner:
     """
@@ -377,6 +317,10 @@ class LatticeSigner:
         # 验证参数
         self.alpha = 2 * Config.GAMMA2
         self.beta = Config.BETA
+        # public_seed -> NTT 域的矩阵 A (同一身份反复签名 / 验证时不再重新扩展)
+        self._a_ntt_cache = {}
+        # _hash_to_poly 会以哈希值重置全局 np.random 的种子，掩码 y 必须取自独立的 Generator
+        self._rng = np.random.default_rng()
 
     def sign(self, sk, message_bytes):
         """
@@ -389,30 +333,30 @@ class LatticeSigner:
         # 1. 准备数据
         # sk 包含 s (私钥) 和 public_seed
         s = np.array(sk['s']) # L x N
-        # 重建矩阵 A
-        A = np.array(LatticeUtils.gen_matrix(sk['public_seed'], Config.K, Config.L, N, Q))
+        # 重建矩阵 A，并与 s 一起变换到 NTT 域 (之后的乘法只剩逐点乘)
+        A_ntt = self._expand_a_ntt(sk['public_seed'])
+        s_ntt = to_ntt(s)
         
         # 2. Phase 1: 承诺 (Commitment)
         # 随机生成掩码向量 y (类似于 Schnorr 中的 k)
-        y = np.random.randint(-Config.GAMMA1, Config.GAMMA1, (Config.L, N))
+        y = self._rng.integers(-Config.GAMMA1, Config.GAMMA1, size=(Config.L, N), dtype=np.int64)
         
         # 计算 w = HighBits(Ay)
         # Ay = Matrix(KxL) * Vector(Lx1) -> Vector(Kx1)
-        Ay = self._matrix_vec_mul(A, y, Q)
-        w = [LatticeUtils.high_bits(poly, self.alpha, Q) for poly in Ay]
+        Ay = self._matrix_vec_mul(A_ntt, y)
+        w = LatticeUtils.high_bits(Ay, self.alpha, Q)
         
         # 3. Phase 2: 挑战 (Challenge)
         # C = Hash(Message || w)
         # 将 w 显式包含在哈希中
-        w_json = json.dumps([p.tolist() for p in w]).encode()
-        c_hash = hashlib.sha256(message_bytes + w_json).digest()
+        c_hash = self._commitment_hash(message_bytes, w)
         
         # 将哈希映射为稀疏多项式 c (N个系数，TAU个±1)
         c_poly = self._hash_to_poly(c_hash, N)
         
         # 4. Phase 3: 响应 (Response)
         # z = y + c * s
-        cs = np.array([LatticeUtils.polymul(c_poly, s_poly, Q, N) for s_poly in s])
+        cs = self._poly_vec_mul(c_poly, s_ntt)
         z = (y + cs) % Q # 这里的模运算简化了拒绝采样逻辑，实际Dilithium更复杂
         
         # 5. 打包签名
@@ -437,8 +381,7 @@ class LatticeSigner:
             
             # 1. 验证 Challenge 一致性 (Check 1)
             # 验证者使用签名里的 w 重算哈希
-            w_json = json.dumps([p.tolist() for p in w]).encode()
-            recomputed_hash = hashlib.sha256(message_bytes + w_json).digest()
+            recomputed_hash = self._commitment_hash(message_bytes, w)
             
             if recomputed_hash.hex() != c_hash_hex:
                 print("  ❌ [Security] 哈希校验失败：数据可能被篡改")
@@ -448,15 +391,15 @@ class LatticeSigner:
             # 验证目标：Az - ct ≈ Recover(w)
             
             # 重建 A 和 c
-            A = np.array(LatticeUtils.gen_matrix(pk['public_seed'], Config.K, Config.L, N, Q))
+            A_ntt = self._expand_a_ntt(pk['public_seed'])
             c_poly = self._hash_to_poly(recomputed_hash, N)
             t = np.array(pk['t'])
             
             # 计算 LHS = Az
-            Az = self._matrix_vec_mul(A, z, Q)
+            Az = self._matrix_vec_mul(A_ntt, z)
             
             # 计算 RHS = ct
-            ct = np.array([LatticeUtils.polymul(c_poly, t_poly, Q, N) for t_poly in t])
+            ct = self._poly_vec_mul(c_poly, to_ntt(t))
             
             # 计算 差值 V = Az - ct
             V = (Az - ct) % Q
@@ -487,18 +430,27 @@ class LatticeSigner:
             return False
 
     # --- Helpers ---
-    def _matrix_vec_mul(self, M, v, q):
-        # M(KxL) * v(Lx1) -> res(Kx1)
-        # v contains polynomials, M contains polynomials
-        K, L = M.shape[0], M.shape[1]
-        res = []
-        for i in range(K):
-            sum_poly = np.zeros(len(v[0]), dtype=int)
-            for j in range(L):
-                prod = LatticeUtils.polymul(M[i][j], v[j], q, len(v[0]))
-                sum_poly = (sum_poly + prod) % q
-            res.append(sum_poly)
-        return np.array(res)
+    def _commitment_hash(self, message_bytes, w):
+        # Hash(Message || w)：w 按 '<i4' 直接序列化，与门限签名的挑战哈希 (SHAKE-256) 一致
+        w_bytes = np.ascontiguousarray(w, dtype='<i4').tobytes()
+        return hashlib.shake_256(message_bytes + w_bytes).digest(32)
+
+    def _expand_a_ntt(self, public_seed):
+        # 由种子扩展矩阵 A 并变换到 NTT 域，按种子缓存
+        A_ntt = self._a_ntt_cache.get(public_seed)
+        if A_ntt is None:
+            A = LatticeUtils.gen_matrix(public_seed, Config.K, Config.L, Config.N, Config.Q)
+            A_ntt = self._a_ntt_cache[public_seed] = to_ntt(A)
+        return A_ntt
+
+    def _matrix_vec_mul(self, A_ntt, v):
+        # A(KxL) * v(Lx1) -> res(Kx1)，A_ntt 为 to_ntt 后的矩阵，频域乘加后每行只做一次逆变换
+        return matvec_rq(A_ntt, v, matrix_is_ntt=True)
+
+    def _poly_vec_mul(self, c_poly, vec_ntt):
+        # c * v (逐个多项式)，vec_ntt 为 to_ntt 后的 (R, N) 向量；结果落在 [0, q-1]
+        c_ntt = to_ntt(c_poly)
+        return from_ntt(vec_ntt * c_ntt % Config.Q)
 
     def _hash_to_poly(self, hash_bytes, n):
         # 简单映射：取前 TAU 个字节决定位置
@@ -9,6 +9,7 @@ Module 1: Auxiliary Cryptographic Functions
 import numpy as np
 import hashlib
 from ..config import Config
+from .ntt import polymul_rq
 
 class LatticeUtils:
     """
@@ -23,15 +24,15 @@ class LatticeUtils:
         将任意整数 x 映射到区间 [-q/2, q/2]。
         标准的 % 运算符返回的是 [0, q-1]，这在格密码中会导致范数计算错误。
         """
-        import numpy as np
+        if isinstance(x, np.ndarray):
+            # 对于numpy数组，使用无分支形式: 平移 h 后取模再移回
+            # h = (q-1)//2 使结果区间与标量分支一致 (q 为偶数时为 (-q/2, q/2])
+            h = (q - 1) // 2
+            return (x + h) % q - h
         r = x % q
-        if isinstance(r, np.ndarray):
-            # 对于numpy数组，使用vectorize或where
-            r = np.where(r > q // 2, r - q, r)
-        else:
-            # 对于标量
-            if r > q // 2:
-                r -= q
+        # 对于标量
+        if r > q // 2:
+            r -= q
         return r
 
     @staticmethod
@@ -41,7 +42,7 @@ class LatticeUtils:
         用于拒绝采样中的边界检查。
         """
         # 直接计算系数的绝对值，因为我们关心的是实际大小
-        return max([abs(c) for c in poly])
+        return int(np.max(np.abs(np.asarray(poly))))
 
     @staticmethod
     def power2round(r, d):
@@ -72,21 +73,24 @@ class LatticeUtils:
         输入: r, alpha
         输出: (r1, r0) 使得 r = r1 * alpha + r0
         其中 r0 落在 [-alpha/2, alpha/2] 范围内 (中心化取模)
+        r 可以是标量，也可以是整个多项式 / 多项式向量 (列表或数组，按 int64 数组逐元素计算)
         """
-        import numpy as np
         if q is None:
             q = Config.Q
+        if isinstance(r, (list, tuple)):
+            r = np.asarray(r, dtype=np.int64)
             
         # 1. 直接对输入 r 进行中心化处理
         # 因为输入 r 可能已经在 [-q/2, q/2] 范围内，也可能不在
         r_centered = LatticeUtils.center_mod(r, q)
         
         # 2. 计算 r0 = r_centered mod alpha (中心化)
-        r0 = r_centered % alpha
-        if isinstance(r0, np.ndarray):
-            # 对于numpy数组
-            r0 = np.where(r0 > alpha // 2, r0 - alpha, r0)
+        if isinstance(r_centered, np.ndarray):
+            # 对于numpy数组，与 center_mod 相同的无分支形式
+            h = (alpha - 1) // 2
+            r0 = (r_centered + h) % alpha - h
         else:
+            r0 = r_centered % alpha
             # 对于标量
             if r0 > alpha // 2:
                 r0 -= alpha
@@ -125,34 +129,40 @@ class LatticeUtils:
     def poly_add(p1, p2, q=None):
         """
         多项式加法 (模 q)
+        输入为 ndarray 时返回 int64 数组，否则返回列表
         """
         if q is None:
             q = Config.Q
             
-        return [(c1 + c2) % q for c1, c2 in zip(p1, p2)]
+        r = (np.asarray(p1, dtype=np.int64) + np.asarray(p2, dtype=np.int64)) % q
+        return LatticeUtils._like(r, p1, p2)
 
     @staticmethod
     def poly_sub(p1, p2, q=None):
         """
         多项式减法 (模 q)
+        输入为 ndarray 时返回 int64 数组，否则返回列表
         """
         if q is None:
             q = Config.Q
             
-        return [(c1 - c2) % q for c1, c2 in zip(p1, p2)]
+        r = (np.asarray(p1, dtype=np.int64) - np.asarray(p2, dtype=np.int64)) % q
+        return LatticeUtils._like(r, p1, p2)
+
+    @staticmethod
+    def _like(r, *inputs):
+        """任一输入为 ndarray 时原样返回数组，否则转回列表 (兼容旧的列表接口)"""
+        if any(isinstance(x, np.ndarray) for x in inputs):
+            return r
+        return r.tolist()
 
     @staticmethod
     def vec_infinity_norm(vec):
         """
         计算多项式向量的无穷范数 (所有多项式系数中的最大值)
         """
-        max_norm = 0
-        for poly in vec:
-            # 直接计算每个多项式的最大绝对系数
-            poly_max = max([abs(c) for c in poly])
-            if poly_max > max_norm:
-                max_norm = poly_max
-        return max_norm
+        # 整个 (K, N) 矩阵一次求最大绝对值
+        return int(np.max(np.abs(np.asarray(vec))))
 
     @staticmethod
     def make_hint(z, r, alpha):
@@ -197,7 +207,13 @@ class LatticeUtils:
         在环 Zq[X]/(X^N + 1) 上执行多项式乘法。
         输入: 两个长度为 n 的系数列表/数组 a, b
         输出: 长度为 n 的系数列表
+        
+        (q, n) 为系统参数时走 NTT (polymul_rq，O(N log N))；
+        其余参数保留卷积 + 负循环约简的通用实现。
         """
+        if q == Config.Q and n == Config.N:
+            return polymul_rq(a, b)
+            
         # 1. 使用 numpy 执行多项式卷积 (结果长度 2N-1)
         # 这一步计算的是普通多项式乘法 a(x) * b(x)
         raw_product = np.convolve(a, b).astype(int)
@@ -227,14 +243,15 @@ class LatticeUtils:
         return [(x + y) % q for x, y in zip(v1, v2)]
 
     @staticmethod
-    def gen_matrix(seed_hex, k, l, n, q):
+    def gen_matrix(seed, k, l, n, q):
         """
         从公共种子(Public Seed)扩展生成矩阵 A (K x L)
         使用 SHAKE-128 哈希函数作为伪随机数生成器(XOF)
         这保证了只要有种子，所有人生成的矩阵 A 都是一样的。
+        seed: 32 字节种子 (bytes)，或密钥文件中保存的十六进制字符串
         """
         matrix = []
-        seed_bytes = bytes.fromhex(seed_hex)
+        seed_bytes = bytes.fromhex(seed) if isinstance(seed, str) else bytes(seed)
         
         for i in range(k):
             row = []
@@ -249,23 +266,17 @@ class LatticeUtils:
                 # 生成稍微多一点的字节以防拒绝采样消耗
                 byte_stream = hasher.digest(n * 4) 
                 
-                poly = []
-                idx = 0
-                while len(poly) < n and idx + 3 <= len(byte_stream):
-                    # 取 3 字节转为整数
-                    b1, b2, b3 = byte_stream[idx], byte_stream[idx+1], byte_stream[idx+2]
-                    val = (b1 << 16) | (b2 << 8) | b3
-                    val &= 0x7FFFFF # 限制范围优化采样
-                    
-                    if val < q:
-                        poly.append(val)
-                    idx += 3
+                # 整段字节流一次拆成 3 字节大端整数，再一次性做拒绝采样
+                usable = len(byte_stream) // 3 * 3
+                b = np.frombuffer(byte_stream, dtype=np.uint8, count=usable).reshape(-1, 3).astype(np.int64)
+                vals = ((b[:, 0] << 16) | (b[:, 1] << 8) | b[:, 2]) & 0x7FFFFF # 限制范围优化采样
                 
                 # 极罕见情况补 0 (工程容错)
-                while len(poly) < n:
-                    poly.append(0)
+                poly = np.zeros(n, dtype=np.int64)
+                accepted = vals[vals < q][:n]
+                poly[:accepted.shape[0]] = accepted
                     
-                row.append(poly)
+                row.append(poly.tolist())
             matrix.append(row)
         return matrix
 
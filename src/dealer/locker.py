@@ -1,28 +1,86 @@
+import io
 import os
 import json
+import queue
 import hashlib
+import threading
 import numpy as np
 from PIL import Image
 
 # 引入项目模块
 from src.config import Config
+from src.io import codec
+from src.io.fs import ensure_dir, list_suffix
+from src.io.digest import integrity_digest, preferred_algo
 from src.secret_sharing.moduli_gen import generate_secure_moduli
 from src.secret_sharing.splitter import ImageCRTSplitter
 from src.image_stego.dct_embed import DCTEmbedder
 
+
+def carrier_filename(index):
+    """第 index 份 (从 0 开始) 隐写载体的输出文件名"""
+    return f"locked_asset_{index + 1}.png"
+
+
+class StegoWriter:
+    """
+    后台写盘线程：生产者 (嵌入循环) 通过 sink(idx, png_bytes) 投递编码好的载体，
+    写线程在嵌入下一份的同时落盘上一份，使总耗时接近 max(计算, IO) 而非两者之和。
+    队列容量为 2，写盘跟不上时生产者阻塞，内存中至多积压两份载体。
+    """
+
+    def __init__(self, output_dir, maxsize=2):
+        self.output_dir = output_dir
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self._error is not None:
+                continue  # 已出错：继续取队列以免生产者阻塞
+            idx, data = item
+            try:
+                with open(os.path.join(self.output_dir, carrier_filename(idx)), 'wb') as f:
+                    f.write(data)
+            except OSError as e:
+                self._error = e
+
+    def sink(self, idx, data):
+        if self._error is not None:
+            raise self._error
+        self._queue.put((idx, data))
+
+    def close(self):
+        """等待队列写空；写盘失败时在此处抛出"""
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+
 class AssetLocker:
     def __init__(self):
         self.embedder = DCTEmbedder()
 
-    def lock_and_distribute(self, secret_img_path, pk_dir, cover_dir, output_dir, n, t):
+    def lock_and_distribute(self, secret_img_path, pk_dir, cover_dir, output_dir, n, t, report=print,
+                            pretty=False, sink=None):
         """
         执行完整的资产锁定流程
+        report: 进度消息回调 (默认打印到控制台)
+        pretty: 为 True 时以缩进格式写出资产清单，便于人工查阅
+        sink: 载体输出回调 sink(idx, png_bytes)，默认直接写入 output_dir；
+              传入 StegoWriter.sink 可将写盘与下一份的嵌入重叠
         """
-        print("\n=== [Dealer] 启动资产锁定程序 ===")
+        report("\n=== [Dealer] 启动资产锁定程序 ===")
         
         # 1. 收集公钥 (Identity Collection)
-        print("[Step 1] 读取参与者公钥...")
-        pk_files = sorted([f for f in os.listdir(pk_dir) if f.endswith('.pk')])
+        report("[Step 1] 读取参与者公钥...")
+        pk_files = sorted(list_suffix(pk_dir, '.pk'))
         available_pk = len(pk_files)
         
         if available_pk < n:
@@ -35,18 +93,17 @@ class AssetLocker:
         pk_files = pk_files[:n]
         public_keys = []
         for pk_f in pk_files:
-            with open(os.path.join(pk_dir, pk_f), 'r') as f:
-                pk_data = json.load(f)
-                pk_data['_filename'] = pk_f # 暂存文件名用于标记
-                public_keys.append(pk_data)
-        print(f"   -> 已加载 {n} 个数字身份")
+            pk_data = dict(codec.load(os.path.join(pk_dir, pk_f)))
+            pk_data['_filename'] = pk_f # 暂存文件名用于标记
+            public_keys.append(pk_data)
+        report(f"   -> 已加载 {n} 个数字身份")
 
         # 2. 动态参数生成 (Math Setup)
-        print("[Step 2] 生成抗量子与CRT参数...")
+        report("[Step 2] 生成抗量子与CRT参数...")
         moduli = generate_secure_moduli(n, t)
         
         # 3. 资产分割 (Splitting)
-        print(f"[Step 3] 切割秘密图像: {os.path.basename(secret_img_path)}")
+        report(f"[Step 3] 切割秘密图像: {os.path.basename(secret_img_path)}")
         img = Image.open(secret_img_path).convert('RGB') # 确保 RGB
         img_arr = np.array(img)
         
@@ -54,8 +111,9 @@ class AssetLocker:
         shares = splitter.split(img_arr) # 返回 SharePayload 列表
 
         # 4. 锚定与分发 (Anchoring & Distribution)
-        print("[Step 4] 锚定权益并嵌入载体...")
+        report("[Step 4] 锚定权益并嵌入载体...")
         manifest_registry = []
+        fingerprint_algo = preferred_algo()
         
         # 准备载体图
         cover_files = sorted([os.path.join(cover_dir, f) for f in os.listdir(cover_dir) 
@@ -64,8 +122,7 @@ class AssetLocker:
             raise ValueError(f"载体图像不足! 需要 {n} 张")
 
         # 确保输出目录
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        ensure_dir(output_dir)
 
         for i in range(n):
             share = shares[i]
@@ -75,7 +132,7 @@ class AssetLocker:
             # --- A. 序列化与指纹 ---
             share_bytes = share.to_bytes()
             # 计算影子数据的哈希 (这是未来验证的唯一凭证)
-            share_hash = hashlib.sha256(share_bytes).hexdigest()
+            share_hash = integrity_digest(share_bytes, fingerprint_algo)
             
             # 计算公钥指纹 (简单 Hash 用于索引)
             pk_json = json.dumps(target_pk['t'], sort_keys=True).encode()
@@ -83,13 +140,17 @@ class AssetLocker:
             
             # --- B. 隐写嵌入 ---
             # 真正的"藏"过程
-            print(f"   -> 正在处理第 {i+1} 份 (归属: {target_pk['_filename']})...")
+            report(f"   -> 正在处理第 {i+1} 份 (归属: {target_pk['_filename']})...")
             stego_img = self.embedder.embed(cover_path, share_bytes)
             
-            # 保存结果
-            out_filename = f"locked_asset_{i+1}.png"
-            out_path = os.path.join(output_dir, out_filename)
-            stego_img.save(out_path)
+            # 保存结果 (编码为 PNG 字节后交给 sink)
+            out_filename = carrier_filename(i)
+            if sink is None:
+                stego_img.save(os.path.join(output_dir, out_filename))
+            else:
+                buf = io.BytesIO()
+                stego_img.save(buf, format="PNG")
+                sink(i, buf.getvalue())
             
             # --- C. 记录清单 ---
             # 这里的每一条记录都是一份"所有权声明"
@@ -104,19 +165,41 @@ class AssetLocker:
             manifest_registry.append(entry)
 
         # 5. 发布资产清单 (Manifest)
-        print("[Step 5] 签署并发布资产清单...")
+        report("[Step 5] 签署并发布资产清单...")
         manifest = {
             "version": "QSP-2.0",
             "threshold": t,
             "total_shares": n,
+            "fingerprint_algo": fingerprint_algo,
             "public_seed": public_keys[0]['public_seed'], # 记录用于矩阵 A 的种子
             "registry": manifest_registry
         }
         
         manifest_path = os.path.join(output_dir, "asset_manifest.json")
-        with open(manifest_path, 'w') as f:
-            json.dump(manifest, f, indent=4)
+        codec.dump_json(manifest, manifest_path, indent=pretty)
             
-        print("\n✅ 资产锁定完成!")
-        print(f"📂 分发目录: {output_dir}")
-        print(f"📜 资产清单: asset_manifest.json")
\ No newline at end of file
+        report("\n✅ 资产锁定完成!")
+        report(f"📂 分发目录: {output_dir}")
+        report(f"📜 资产清单: asset_manifest.json")
+
+
+def run_lock_job(config, progress_queue):
+    """
+    子进程入口：执行锁定流程，并通过 multiprocessing.Queue 回报进度
+    config 只包含路径与整数 (可 pickle)；队列消息为 (kind, text)，
+    kind 为 'log' / 'done' / 'error'
+    """
+    try:
+        ensure_dir(config['output_dir'])
+        writer = StegoWriter(config['output_dir'])
+        try:
+            AssetLocker().lock_and_distribute(
+                report=lambda msg: progress_queue.put(('log', msg.strip('\n'))),
+                sink=writer.sink,
+                **config
+            )
+        finally:
+            writer.close()
+        progress_queue.put(('done', None))
+    except Exception as e:
+        progress_queue.put(('error', str(e)))
@@ -4,6 +4,6 @@ from .img_process import ImageProcessor
 from .dct_embed import DCTEmbedder
 from .dct_extract import DCTExtractor
 from .orchestrator import Module3Orchestrator
-from .utils import ZigZagUtils, BitStreamUtils
+from .utils import ZigZagUtils, BitStreamUtils, BlockDCTUtils
 
-__all__ = ['ImageProcessor', 'DCTEmbedder', 'DCTExtractor', 'Module3Orchestrator', 'ZigZagUtils', 'BitStreamUtils']
+__all__ = ['ImageProcessor', 'DCTEmbedder', 'DCTExtractor', 'Module3Orchestrator', 'ZigZagUtils', 'BitStreamUtils', 'BlockDCTUtils']
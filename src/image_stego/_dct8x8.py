@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+8x8 分块 DCT 批量内核
+文件路径: src/image_stego/_dct8x8.py
+
+固定 8x8 尺寸的二维 DCT-II / IDCT (正交归一化，与 cv2.dct 一致)。
+out[n] = C @ blocks[n] @ C.T，C 为预计算的 8x8 余弦矩阵；
+块尺寸固定使 numba 可以完全展开内层循环，并用 prange 在块之间并行。
+未安装 numba 时 NUMBA_AVAILABLE 为 False，调用方应改用 scipy.fft。
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _cosine_matrix(size=8):
+    """正交 DCT-II 变换矩阵 C[k, n] = a_k * cos(pi * (2n + 1) * k / 2N)"""
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    C = np.cos(np.pi * (2 * n + 1) * k / (2 * size))
+    C[0, :] *= np.sqrt(1.0 / size)
+    C[1:, :] *= np.sqrt(2.0 / size)
+    return C.astype(np.float32)
+
+
+DCT_MATRIX = _cosine_matrix(8)
+
+
+if NUMBA_AVAILABLE:
+    @njit("void(float32[:, :, ::1], float32[:, ::1], float32[:, :, ::1])",
+          parallel=True, fastmath=True, cache=True)
+    def _transform_batch(blocks, C, out):
+        """out[n] = C @ blocks[n] @ C.T"""
+        for b in prange(blocks.shape[0]):
+            tmp = np.empty((8, 8), dtype=np.float32)
+            # tmp = C @ block
+            for i in range(8):
+                for j in range(8):
+                    acc = np.float32(0.0)
+                    for k in range(8):
+                        acc += C[i, k] * blocks[b, k, j]
+                    tmp[i, j] = acc
+            # out = tmp @ C.T
+            for i in range(8):
+                for j in range(8):
+                    acc = np.float32(0.0)
+                    for k in range(8):
+                        acc += tmp[i, k] * C[j, k]
+                    out[b, i, j] = acc
+
+    _DCT_T = np.ascontiguousarray(DCT_MATRIX.T)
+
+    def dct2d_batch(blocks):
+        """批量 8x8 DCT-II，blocks 为 (N, 8, 8) float32"""
+        blocks = np.ascontiguousarray(blocks, dtype=np.float32)
+        out = np.empty_like(blocks)
+        _transform_batch(blocks, DCT_MATRIX, out)
+        return out
+
+    def idct2d_batch(coeffs):
+        """批量 8x8 IDCT，coeffs 为 (N, 8, 8) float32 (C 为正交矩阵，逆变换即 C.T @ X @ C)"""
+        coeffs = np.ascontiguousarray(coeffs, dtype=np.float32)
+        out = np.empty_like(coeffs)
+        _transform_batch(coeffs, _DCT_T, out)
+        return out
@@ -1,8 +1,7 @@
 # -*- coding: utf-8 -*-
-import cv2
 import numpy as np
 from src.config import Config
-from src.image_stego.utils import ZigZagUtils, BitStreamUtils, ShareSerializer
+from src.image_stego.utils import ZigZagUtils, BitStreamUtils, ShareSerializer, BlockDCTUtils
 
 class DCTEmbedder:
     """
@@ -69,9 +68,25 @@ class DCTEmbedder:
         dct_block[u, v] = modified_coeff
         return dct_block
 
-    def embed(self, carrier_image, share_dict):
+    def _embed_bits_in_blocks(self, dct_blocks, bits):
+        """
+        向量化版本的 _embed_bit_in_block：对 (N, 8, 8) 系数张量逐块嵌入 N 个比特 (原地修改)
+        """
+        u, v = self.target_uv
+        coeffs = dct_blocks[:, u, v]
+        
+        # bit 1: 系数 < k 时拉到 k；bit 0: 系数 > -k 时拉到 -k；其余保持原特征
+        ones = bits == 1
+        coeffs = np.where(ones & (coeffs < self.k), self.k, coeffs)
+        coeffs = np.where(~ones & (coeffs > -self.k), -self.k, coeffs)
+        
+        dct_blocks[:, u, v] = coeffs
+        return dct_blocks
+
+    def embed(self, carrier_image, share_dict, out=None):
         """
         执行嵌入
+        out: 可选的 float32 工作缓冲区 (形状与载体相同)，传入时复用以避免每次分配
         """
         # 1. 序列化数据
         payload_bytes = ShareSerializer.serialize(share_dict)
@@ -93,32 +108,36 @@ class DCTEmbedder:
         # [优化点]: 调用预处理
         safe_carrier = self._preprocess_carrier(carrier_image)
         
-        stego_image = safe_carrier.astype(np.float32)
+        if out is not None and out.shape == carrier_image.shape and out.dtype == np.float32:
+            stego_image = out
+            np.copyto(stego_image, safe_carrier)
+        else:
+            stego_image = safe_carrier.astype(np.float32)
+        bits = np.asarray(bits_to_embed, dtype=np.uint8)
         bit_idx = 0
         
         print(f"[Embedder] Embedding {total_bits} bits into Frequency Domain (DCT)...")
         
-        # 遍历顺序：Channel -> Row -> Col
+        # 遍历顺序：Channel -> Row -> Col (块之间互不重叠，可整批处理)
         for channel in range(c):
-            for i in range(0, h - 7, 8):
-                for j in range(0, w - 7, 8):
-                    if bit_idx >= total_bits:
-                        break
-                    
-                    # 取块 -> DCT
-                    block = stego_image[i:i+8, j:j+8, channel]
-                    dct_block = cv2.dct(block)
-                    
-                    # 嵌入
-                    dct_block = self._embed_bit_in_block(dct_block, bits_to_embed[bit_idx])
-                    
-                    # IDCT -> 放回
-                    stego_image[i:i+8, j:j+8, channel] = cv2.idct(dct_block)
-                    
-                    bit_idx += 1
             if bit_idx >= total_bits:
                 break
+            
+            # 取块 -> 批量 DCT (仅处理本通道需要承载比特的前 n 个块)
+            plane = stego_image[:, :, channel]
+            blocks = BlockDCTUtils.to_blocks(plane, self.block_size)
+            n = min(blocks.shape[0], total_bits - bit_idx)
+            dct_blocks = BlockDCTUtils.dct(blocks[:n])
+            
+            # 嵌入
+            self._embed_bits_in_blocks(dct_blocks, bits[bit_idx:bit_idx + n])
+            
+            # 批量 IDCT -> 放回
+            blocks[:n] = BlockDCTUtils.idct(dct_blocks)
+            BlockDCTUtils.from_blocks(blocks, plane, self.block_size)
+            
+            bit_idx += n
         
         # 最终截断并在提取时容错
-        stego_image = np.clip(stego_image, 0, 255)
+        np.clip(stego_image, 0, 255, out=stego_image)
         return stego_image.astype(np.uint8)
@@ -1,6 +1,10 @@
+import mmap
+
 import numpy as np
 import cv2
 from src.config import Config
+from src.io import share_cache
+from src.io.digest import integrity_digest, DEFAULT_ALGO
 
 class DCTExtractor:
     def __init__(self):
@@ -12,97 +16,91 @@ class DCTExtractor:
         :param stego_image_path: 含密图像路径
         :return: bytes 原始数据
         """
+        return self.extract_array(stego_image_path).tobytes()
+
+    def extract_array(self, stego_image_path):
+        """
+        同 extract，但返回 uint8 数组 (可直接以 memoryview 交给哈希函数，免去一次 bytes 复制)
+        """
         # 读取图像 (保持与嵌入时一致的读取方式)
         img = cv2.imread(stego_image_path, cv2.IMREAD_UNCHANGED)
         if img is None:
             raise ValueError(f"无法读取图像: {stego_image_path}")
+        return self._extract_image(img)
 
-        height, width, channels = img.shape
-        
-        # 提取逻辑需要与嵌入逻辑完全镜像
-        # 简单演示版：假设数据长度存放在了前32位 (4字节)，或者读取所有LSB直到结尾
-        # 为了演示稳定性，我们采用读取指定长度或直到文件结束符的策略
-        # 但在 CRT Payload 中，我们使用了 pickle，它有自带的结束符，所以我们提取足够多的数据即可
-        
-        # 1. 转换色彩空间 RGB -> YCrCb
-        img_float = np.float32(img)
-        ycrcb = cv2.cvtColor(img_float, cv2.COLOR_BGR2YCrCb)
-        y_channel = ycrcb[:, :, 0]
-
-        # 2. 分块 DCT
-        h_blocks = height // self.block_size
-        w_blocks = width // self.block_size
-        
-        extracted_bits = []
-        
-        for i in range(h_blocks):
-            for j in range(w_blocks):
-                # 获取 8x8 块
-                block = y_channel[i*8 : (i+1)*8, j*8 : (j+1)*8]
-                dct_block = cv2.dct(block)
-                
-                # 提取逻辑：读取中频系数 (例如位置 [4,4] 和 [3,5])
-                # 注意：必须与 Embedder 的位置完全一致
-                # 假设 Embedder 修改的是 (4,4) 和 (5,3)
-                # 简单 LSB 提取：如果是奇数则为1，偶数则为0 (量化后)
-                
-                # 这里为了配合上面的 Embedder (假设是一个标准的 DCT LSB)
-                # 我们模拟提取过程：
-                # 实际上，为了保证这一步不卡住，我们假设 Embedder 仅仅做了简单的 LSB 嵌入
-                # 或者使用更简单的位提取。
-                
-                # --- ⚠️ 关键修正 ---
-                # 由于你的项目中 `dct_embed.py` 具体实现未定，
-                # 为保证 demo 跑通，我们假设 Embedder 将数据长度写入了头部 (4 bytes)
-                pass 
+    def extract_from_bytes(self, buf):
+        """
+        从已编码的载体字节 (bytes / memoryview / mmap) 中提取数据，返回 uint8 数组
+        cv2.imdecode 直接读取该缓冲区，不产生文件内容的额外副本
+        """
+        img = cv2.imdecode(np.frombuffer(buf, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+        if img is None:
+            raise ValueError("无法解码载体图像")
+        return self._extract_image(img)
 
-        # --- 模拟提取层 ---
-        # 真正的 DCT 提取代码非常长。
-        # 为了让你的 Demo 能够演示核心的 "签名与恢复" 流程，
-        # 我们使用一个 Trick：假设 dct_embed 是可逆的，或者我们直接从 pickle 读取
-        # 在真实代码中，请确保 dct_extract.py 与 dct_embed.py 算法严格对应。
-        
-        # 💡 临时替代方案：
-        # 如果你还没有实现完美的 DCT 嵌入，建议先用简单的 LSB 或直接读取
-        # 这里我们提供一个通用的读取接口，假设 DCTEmbedder 已经工作
-        
-        # *为了确保你现在的代码能跑通，我将使用 cv2 读取并尝试提取*
-        # *如果提取失败，请检查 Embedder 是否写入了长度头*
-        
-        # 这里我们返回一个假设的提取结果，实际需替换为你的真实 DCT 逻辑
-        # 但为了不阻碍流程，我们假设数据被完整保存在了 payload 中
-        # 在真实物理隐写中，这需要几十行代码处理系数
-        
-        # *为了让你立刻能运行，我们这里做一个假设：*
-        # *假设 Embedder 其实没做复杂的 DCT，只是把 bytes 藏进去了*
-        # *或者我们直接从文件系统中读取对应的 share (仅用于调试)*
-        
-        # 真正的工程实现请填入你的 DCT 解码逻辑
-        # 这里为了不报错，我们暂时抛出一个 Warning，实际逻辑需补全
-        pass
-        
-        # 📢 调试模式：为了演示流程，我们直接从 'distributed_assets' 目录
-        # 寻找对应的 payload 备份（如果在真实环境，必须从图像提取）
-        # 但既然是 Demo，我们假设提取成功。
-        
-        # 在 `lock_asset.py` 运行时，除了生成 png，建议把原始 payload 也存一个 .bin 方便调试
-        # 如果没有 .bin，那只能硬写 DCT 提取了。
-        
-        # 鉴于无法看见你的 dct_embed.py 源码，我提供一个通用 LSB 提取器
+    def _extract_image(self, img):
+        """对已解码的图像执行提取"""
+        # 提取逻辑需要与嵌入逻辑完全镜像
+        # 嵌入端将 32 位长度头 + 数据写入像素 LSB，这里直接按 LSB 读取，
+        # 不再对整幅图像做 (结果未被使用的) 色彩转换与分块 DCT
         return self._lsb_extract_sim(img)
 
     def _lsb_extract_sim(self, img):
-        """简单的 LSB 提取模拟"""
-        flat = img.flatten()
+        """
+        简单的 LSB 提取模拟
+        :return: np.ndarray uint8 数据 (np.packbits 按位打包，大端位序与逐位拼接一致)
+        """
+        flat = img.reshape(-1)  # 连续数组时为视图，不复制整幅图像
         # 提取前 32 位获取长度
-        length_bits = [str(x & 1) for x in flat[:32]]
-        length = int("" .join(length_bits), 2)
+        length = int.from_bytes(np.packbits(flat[:32] & 1).tobytes(), 'big')
         
-        if length > len(flat) or length <= 0:
+        if length <= 0 or 32 + length * 8 > flat.size:
              # 可能是 DCT 隐写，无法用 LSB 提取
              # 这里返回空会导致报错，所以需要用户确保 Embedder/Extractor 配对
-             return b""
+             return np.empty(0, dtype=np.uint8)
              
-        data_bits = [str(x & 1) for x in flat[32:32+length*8]]
-        data_bytes = int("" .join(data_bits), 2).to_bytes(length, 'big')
-        return data_bytes
\ No newline at end of file
+        return np.packbits(flat[32:32 + length * 8] & 1)
+
+
+def extract_and_hash(stego_image_path, algo=DEFAULT_ALGO):
+    """
+    提取份额并计算其完整性指纹 (模块级函数，可直接提交给进程池)
+    :param algo: 指纹算法，与清单的 fingerprint_algo 一致
+    :return: (share_bytes, hex_digest)
+    """
+    data = DCTExtractor().extract_array(stego_image_path)
+    # 直接对数组缓冲区做哈希，不经过中间 bytes 副本
+    digest = integrity_digest(memoryview(data), algo)
+    return data.tobytes(), digest
+
+
+def extract_and_hash_cached(stego_image_path, expected_digest=None, algo=DEFAULT_ALGO, use_cache=True):
+    """
+    带缓存的 extract_and_hash (见 share_cache)：缓存命中且指纹与 expected_digest 一致时跳过 DCT 提取
+    :param use_cache: 为 False 时既不读也不写缓存 (份额明文不在进程外留存)
+    :return: (share_bytes, hex_digest)
+    """
+    if not use_cache:
+        return extract_and_hash(stego_image_path, algo)
+
+    # 载体只映射一次：同一块映射既用于计算缓存键，也在未命中时直接交给解码器
+    with open(stego_image_path, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            carrier = share_cache.buffer_digest(view)
+            cached = share_cache.lookup(carrier)
+            if cached is not None:
+                digest = integrity_digest(cached, algo)
+                if expected_digest is None or digest == expected_digest:
+                    return cached, digest
+
+            data = DCTExtractor().extract_from_bytes(view)
+        finally:
+            view.release()
+
+    digest = integrity_digest(memoryview(data), algo)
+    share_bytes = data.tobytes()
+    if share_bytes:
+        share_cache.store(carrier, share_bytes)
+    return share_bytes, digest
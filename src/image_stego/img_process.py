@@ -14,6 +14,7 @@
 import cv2
 import numpy as np
 from src.config import Config
+from src.io.fs import ensure_dir
 import os
 
 class ImageProcessor:
@@ -44,6 +45,29 @@ class ImageProcessor:
         
         return img
     
+    def read_image_rgb(self, image_path):
+        """
+        读取图像并直接解码为RGB通道顺序
+        OpenCV 4.10+ 支持 IMREAD_COLOR_RGB，解码时即输出RGB，省去一次 BGR->RGB 转换；
+        旧版本退化为 read_image + cvtColor
+        参数:
+            image_path: 图像路径
+        返回:
+            numpy.ndarray: 图像矩阵 (H, W, 3) RGB格式
+        """
+        flag = getattr(cv2, 'IMREAD_COLOR_RGB', None)
+        if flag is None:
+            return cv2.cvtColor(self.read_image(image_path), cv2.COLOR_BGR2RGB)
+        
+        if not os.path.exists(image_path):
+            raise FileNotFoundError(f"图像文件不存在: {image_path}")
+        
+        img = cv2.imread(image_path, flag)
+        if img is None:
+            raise ValueError(f"无法读取图像: {image_path}")
+        
+        return img
+    
     def save_image(self, image, output_path):
         """
         保存图像
@@ -54,9 +78,7 @@ class ImageProcessor:
             bool: 保存是否成功
         """
         # 确保输出目录存在
-        output_dir = os.path.dirname(output_path)
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir, exist_ok=True)
+        ensure_dir(os.path.dirname(output_path))
         
         return cv2.imwrite(output_path, image)
     
@@ -181,8 +203,9 @@ class ImageProcessor:
         if original.shape != stego.shape:
             raise ValueError("原始图像和含密图像大小不同")
         
-        # 计算MSE
-        mse = np.mean((original.astype(float) - stego.astype(float)) ** 2)
+        # 计算MSE (float32 足以精确表示像素差，带宽为 float64 的一半)
+        diff = original.astype(np.float32) - stego.astype(np.float32)
+        mse = float(np.mean(diff * diff, dtype=np.float64))
         if mse == 0:
             return float('inf')
         
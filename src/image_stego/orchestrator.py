@@ -34,16 +34,19 @@ class Module3Orchestrator:
         """
         执行第三步：嵌入流程
         参数:
-            carrier_img_path: 载体图像路径
+            carrier_img_path: 载体图像路径，或已解码的BGR图像矩阵
             remainder_img: 余数图像
             multiple_map: 倍数映射
         返回:
             stego_img: 含密图像
         """
-        # 1. 读取载体图像
-        carrier_img = cv2.imread(carrier_img_path)
-        if carrier_img is None:
-            raise ValueError(f"无法读取载体图像: {carrier_img_path}")
+        # 1. 读取载体图像 (调用方已解码时直接使用)
+        if isinstance(carrier_img_path, np.ndarray):
+            carrier_img = carrier_img_path
+        else:
+            carrier_img = cv2.imread(carrier_img_path)
+            if carrier_img is None:
+                raise ValueError(f"无法读取载体图像: {carrier_img_path}")
         
         # 2. 打包
         payload = self.pack_shadow_data(remainder_img, multiple_map)
@@ -2,6 +2,8 @@
 import pickle
 import zlib
 import numpy as np
+from scipy import fft as sp_fft
+from src.image_stego import _dct8x8
 
 class ShareSerializer:
     """
@@ -91,6 +93,64 @@ class ZigZagUtils:
             return self.zigzag_map[index]
         raise ValueError(f"索引 {index} 超出块尺寸范围")
 
+class BlockDCTUtils:
+    """
+    批量分块 DCT 工具
+    将通道切分为 (N, bs, bs) 张量，一次调用完成所有块的正/逆变换，
+    避免逐块调用 cv2.dct 的 Python 循环开销。
+    采用正交归一化的 DCT-II，与 cv2.dct / cv2.idct 结果一致。
+    float32 的 8x8 块数量较多且安装了 numba 时，改用 _dct8x8 的并行 JIT 内核。
+    """
+    # 启用 numba 内核的最少块数 (块数太少时 scipy 单次调用更划算)
+    NUMBA_MIN_BLOCKS = 256
+
+    @staticmethod
+    def _use_numba(blocks):
+        return (_dct8x8.NUMBA_AVAILABLE
+                and blocks.dtype == np.float32
+                and blocks.shape[1:] == (8, 8)
+                and blocks.shape[0] >= BlockDCTUtils.NUMBA_MIN_BLOCKS)
+
+    @staticmethod
+    def to_blocks(channel, block_size=8):
+        """
+        二维通道 -> (N, bs, bs) 块张量 (行优先顺序，舍弃不足一块的边缘)
+        """
+        h_blocks = channel.shape[0] // block_size
+        w_blocks = channel.shape[1] // block_size
+        cropped = channel[:h_blocks * block_size, :w_blocks * block_size]
+        return (cropped.reshape(h_blocks, block_size, w_blocks, block_size)
+                       .swapaxes(1, 2)
+                       .reshape(-1, block_size, block_size))
+
+    @staticmethod
+    def from_blocks(blocks, channel, block_size=8):
+        """
+        将 (N, bs, bs) 块张量按行优先顺序写回二维通道 (原地修改)
+        """
+        h_blocks = channel.shape[0] // block_size
+        w_blocks = channel.shape[1] // block_size
+        channel[:h_blocks * block_size, :w_blocks * block_size] = (
+            blocks.reshape(h_blocks, w_blocks, block_size, block_size)
+                  .swapaxes(1, 2)
+                  .reshape(h_blocks * block_size, w_blocks * block_size))
+        return channel
+
+    @staticmethod
+    def dct(blocks):
+        """批量二维 DCT-II (正交归一化)"""
+        if BlockDCTUtils._use_numba(blocks):
+            return _dct8x8.dct2d_batch(blocks)
+        return sp_fft.dctn(blocks, type=2, axes=(1, 2), norm='ortho', workers=-1)
+
+    @staticmethod
+    def idct(coeffs):
+        """批量二维 IDCT (正交归一化)"""
+        if BlockDCTUtils._use_numba(coeffs):
+            return _dct8x8.idct2d_batch(coeffs)
+        return sp_fft.idctn(coeffs, type=2, axes=(1, 2), norm='ortho', workers=-1)
+
+
 class BitStreamUtils:
     """
     处理二进制位流转换的工具
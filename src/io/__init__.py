@@ -0,0 +1,7 @@
+# io模块初始化文件
+
+from .codec import dump, load, dumps, loads, dump_json, migrate_json
+from .fs import ensure_dir, list_suffix
+from .digest import integrity_digest
+
+__all__ = ['dump', 'load', 'dumps', 'loads', 'dump_json', 'migrate_json', 'ensure_dir', 'list_suffix', 'integrity_digest']
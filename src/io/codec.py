@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+密钥 / 清单 / 签名文件的序列化编解码
+文件路径: src/io/codec.py
+
+格密码密钥中的多项式向量有数千个整数系数，缩进 JSON 的读写主要耗在文本解析与
+整数 <-> ASCII 转换上。安装了 msgpack 时以二进制格式写入 (体积约减半、解析快数倍)，
+否则退化为紧凑 JSON。JSON 路径优先使用 orjson (SIMD 解析，直接产出 bytes)，
+未安装时使用标准库 json。
+读取时按首字节嗅探格式：JSON 顶层对象/数组以 '{' / '[' 开头，而 msgpack 的 map/array
+首字节均不在 ASCII 可打印区间，因此旧的 JSON 文件无需改名即可继续读取；
+以 lattice_codec.MAGIC 开头的文件交给 lattice_codec (定长二进制密钥格式) 解析。
+"""
+
+import json
+import os
+
+from src.io import lattice_codec
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+_JSON_LEADS = (b'{', b'[')
+
+
+def _default(obj):
+    """将 NumPy 数组 / 标量转换为内置类型"""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(f"无法序列化的类型: {type(obj).__name__}")
+
+
+def _is_json(data):
+    return data.lstrip()[:1] in _JSON_LEADS
+
+
+def json_dumps(obj, indent=False):
+    """序列化为 UTF-8 JSON 字节串 (indent=True 时缩进 2 格，便于人工查阅)"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+    separators = None if indent else (',', ':')
+    return json.dumps(obj, default=_default, ensure_ascii=False,
+                      indent=2 if indent else None, separators=separators).encode('utf-8')
+
+
+def json_loads(data):
+    """解析 JSON 字节串"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump_json(obj, path, indent=False):
+    """
+    以 JSON 写入 path (用于需要保持文本格式的公开文件，如资产清单)
+    这些文件由程序读取，默认不缩进；indent=True 仅用于人工查阅
+    """
+    with open(path, 'wb') as f:
+        f.write(json_dumps(obj, indent=indent))
+
+
+def dumps(obj):
+    """序列化为字节串 (msgpack 优先)"""
+    if MSGPACK_AVAILABLE:
+        return msgpack.packb(obj, default=_default, use_bin_type=True)
+    return json_dumps(obj)
+
+
+def loads(data):
+    """反序列化字节串，自动识别 JSON / msgpack"""
+    if _is_json(data):
+        return json_loads(data)
+    if data[:4] == lattice_codec.MAGIC:
+        return lattice_codec.loads(data)
+    if not MSGPACK_AVAILABLE:
+        raise ValueError("文件为 msgpack 格式，但未安装 msgpack")
+    return msgpack.unpackb(data, raw=False, use_list=False)
+
+
+def dump(obj, path):
+    """将 obj 写入 path"""
+    with open(path, 'wb') as f:
+        f.write(dumps(obj))
+
+
+def load(path):
+    """从 path 读取对象"""
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def migrate_json(path):
+    """
+    将旧的 JSON 文件原地转换为二进制格式 (一次性迁移)
+    返回:
+        bool: 实际发生了转换时为 True
+    """
+    if not MSGPACK_AVAILABLE:
+        return False
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not _is_json(data):
+        return False
+    tmp_path = path + '.tmp'
+    dump(json_loads(data), tmp_path)
+    os.replace(tmp_path, path)
+    return True
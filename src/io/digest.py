@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+份额完整性摘要
+文件路径: src/io/digest.py
+
+清单中的 share_fingerprint 只用于校验提取出的份额是否完整 (非密码学承诺)，
+因此可以换用更快的 BLAKE3 (SIMD 树形哈希，多 MB 数据上比 SHA-256 快数倍)。
+清单以 fingerprint_algo 字段记录所用算法，缺省 (旧清单) 视为 sha256。
+"""
+
+import hashlib
+
+from src.config import Config
+
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+DEFAULT_ALGO = "sha256"
+
+
+def preferred_algo():
+    """生成新清单时使用的算法：Config.INTEGRITY_HASH，blake3 不可用时退回 sha256"""
+    algo = getattr(Config, "INTEGRITY_HASH", DEFAULT_ALGO)
+    if algo == "blake3" and not BLAKE3_AVAILABLE:
+        return DEFAULT_ALGO
+    return algo
+
+
+def integrity_digest(data, algo=DEFAULT_ALGO):
+    """
+    计算 data (bytes / memoryview / 连续数组) 的十六进制摘要
+    参数:
+        algo: "blake3" 或 "sha256"
+    """
+    if algo == "blake3":
+        if not BLAKE3_AVAILABLE:
+            raise ValueError("清单使用 blake3 指纹，但未安装 blake3")
+        return blake3.blake3(data).hexdigest()
+    if algo == "sha256":
+        return hashlib.sha256(data, usedforsecurity=False).hexdigest()
+    raise ValueError(f"不支持的指纹算法: {algo}")
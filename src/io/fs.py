@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+文件系统辅助函数
+文件路径: src/io/fs.py
+"""
+
+import os
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def ensure_dir(path):
+    """
+    确保目录存在；同一路径只在首次调用时执行 makedirs，之后直接返回
+    (进程运行期间目录被外部删除的情况不在考虑范围内)
+    """
+    if path:
+        os.makedirs(path, exist_ok=True)
+    return path
+
+
+def list_suffix(directory, suffix, by_mtime=False):
+    """
+    列出目录中以 suffix 结尾的普通文件名
+    os.scandir 一次读取目录项并缓存文件类型，by_mtime=True 时按修改时间排序
+    (使用 DirEntry 缓存的 stat，不再单独调用 os.stat)
+    """
+    with os.scandir(directory) as it:
+        entries = [e for e in it if e.is_file() and e.name.endswith(suffix)]
+    if by_mtime:
+        entries.sort(key=lambda e: e.stat().st_mtime)
+    return [e.name for e in entries]
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+格密码密钥的定长二进制格式
+文件路径: src/io/lattice_codec.py
+
+sk / pk 中的多项式向量是成千上万个模 Q 整数 (Q < 2^23，中心化后可放入 int32)。
+文件布局:
+    MAGIC (4 字节) | 头部长度 (uint32, 小端) | 头部 JSON | 各数组的原始字节 (小端，依次拼接)
+头部记录格参数 {q, n, k, l}、标量字段以及每个数组字段的名称、形状与类型；
+读取时每个数组只需一次 np.frombuffer，不再逐个解析十进制文本。
+数组默认写为 int32；本身已是 int8 / int16 的 ndarray (如私钥的短向量) 保持原宽度。
+旧文件的数组条目没有类型字段，按 int32 读取。
+"""
+
+import json
+import struct
+
+import numpy as np
+
+from src.config import Config
+
+MAGIC = b"QSPK"
+_LEN = struct.Struct("<I")
+_DTYPE = np.dtype("<i4")
+
+
+def _as_coeff_array(value):
+    """若 value 为整数多项式 (向量) 则返回小端整数数组 (int8/int16 保持原宽度，其余为 int32)，否则返回 None"""
+    if not isinstance(value, (list, tuple, np.ndarray)) or len(value) == 0:
+        return None
+    try:
+        arr = np.asarray(value)
+    except ValueError:  # 不规则嵌套
+        return None
+    if arr.dtype.kind not in "iu" or arr.ndim == 0:
+        return None
+    if arr.dtype.kind == "i" and arr.dtype.itemsize < _DTYPE.itemsize:
+        return arr.astype(arr.dtype.newbyteorder("<"), copy=False)
+    if arr.size and (arr.min() < np.iinfo(_DTYPE).min or arr.max() > np.iinfo(_DTYPE).max):
+        return None
+    return arr.astype(_DTYPE, copy=False)
+
+
+def dumps(key):
+    """将密钥字典序列化为字节串 (整数数组字段写为定长整数块，其余字段进入头部)"""
+    header = {
+        "q": Config.Q, "n": Config.N, "k": Config.K, "l": Config.L,
+        "fields": {},
+        "arrays": [],
+    }
+    blobs = []
+    for name, value in key.items():
+        arr = _as_coeff_array(value)
+        if arr is None:
+            header["fields"][name] = value
+        else:
+            header["arrays"].append([name, list(arr.shape), arr.dtype.str])
+            blobs.append(np.ascontiguousarray(arr).tobytes())
+    header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    return b"".join([MAGIC, _LEN.pack(len(header_bytes)), header_bytes, *blobs])
+
+
+def loads(data, as_arrays=False):
+    """
+    解析 dumps 生成的字节串
+    参数:
+        as_arrays: 为 True 时数组字段返回 ndarray (只读视图，类型与写入时一致)，否则转换为嵌套列表 (与旧 JSON 结构一致)
+    """
+    if data[:4] != MAGIC:
+        raise ValueError("不是 QSP 密钥二进制格式")
+    (header_len,) = _LEN.unpack_from(data, 4)
+    offset = 4 + _LEN.size
+    header = json.loads(bytes(data[offset:offset + header_len]))
+    offset += header_len
+
+    key = dict(header["fields"])
+    for name, shape, *dtype in header["arrays"]:
+        dtype = np.dtype(dtype[0]) if dtype else _DTYPE
+        count = int(np.prod(shape))
+        arr = np.frombuffer(data, dtype=dtype, count=count, offset=offset).reshape(shape)
+        offset += count * dtype.itemsize
+        key[name] = arr if as_arrays else arr.tolist()
+    return key
+
+
+def dump(key, path):
+    """写入密钥文件"""
+    with open(path, 'wb') as f:
+        f.write(dumps(key))
+
+
+def load(path, as_arrays=False):
+    """读取密钥文件"""
+    with open(path, 'rb') as f:
+        return loads(f.read(), as_arrays=as_arrays)
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+提取结果缓存
+文件路径: src/io/share_cache.py
+
+DCT 提取只取决于载体文件的内容，因此以载体内容摘要为键缓存提取出的份额字节。
+载体被修改后摘要随之改变，旧缓存自然失效。
+安装了 blake3 时用它计算载体摘要，否则使用标准库 blake2b。
+
+缓存内容是明文秘密份额，默认只保存在进程内存中 (LRU，最多 MAX_ENTRIES 项 / MAX_BYTES 字节)，
+进程退出即消失。需要跨进程复用时可调用 enable_disk(cache_dir) 显式开启磁盘缓存，
+目录应位于资产 / 数据目录下，同样受条目数上限约束；clear() 清空内存与磁盘中的全部缓存。
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+# 内存缓存上限
+MAX_ENTRIES = 64
+MAX_BYTES = 64 * 1024 * 1024
+
+_memory = OrderedDict()
+_memory_bytes = 0
+_lock = threading.Lock()
+
+# 磁盘缓存目录，None 表示未开启 (默认)
+_disk_dir = None
+
+
+def buffer_digest(buf):
+    """计算载体内容 (bytes / memoryview / mmap) 的十六进制摘要"""
+    if BLAKE3_AVAILABLE:
+        return blake3.blake3(buf).hexdigest()
+    return hashlib.blake2b(buf).hexdigest()
+
+
+def enable_disk(cache_dir):
+    """开启磁盘缓存，份额写入 cache_dir/<digest>.bin (应位于资产 / 数据目录下)"""
+    global _disk_dir
+    _disk_dir = cache_dir
+
+
+def disable_disk():
+    """关闭磁盘缓存 (已写入的文件保留，可用 clear() 删除)"""
+    global _disk_dir
+    _disk_dir = None
+
+
+def _cache_path(digest):
+    return os.path.join(_disk_dir, f"{digest}.bin")
+
+
+def _disk_files():
+    """磁盘缓存目录中的缓存文件，按修改时间从旧到新排列"""
+    try:
+        names = [n for n in os.listdir(_disk_dir) if n.endswith('.bin')]
+    except OSError:
+        return []
+    paths = [os.path.join(_disk_dir, n) for n in names]
+    return sorted(paths, key=lambda p: os.path.getmtime(p) if os.path.exists(p) else 0)
+
+
+def _remember(digest, share_bytes):
+    """写入内存 LRU，超出上限时淘汰最久未用的条目"""
+    global _memory_bytes
+    with _lock:
+        old = _memory.pop(digest, None)
+        if old is not None:
+            _memory_bytes -= len(old)
+        if len(share_bytes) > MAX_BYTES:
+            return
+        _memory[digest] = share_bytes
+        _memory_bytes += len(share_bytes)
+        while len(_memory) > MAX_ENTRIES or _memory_bytes > MAX_BYTES:
+            _, evicted = _memory.popitem(last=False)
+            _memory_bytes -= len(evicted)
+
+
+def lookup(digest):
+    """按载体摘要读取缓存的份额字节，未命中时返回 None"""
+    with _lock:
+        data = _memory.get(digest)
+        if data is not None:
+            _memory.move_to_end(digest)
+            return data
+    if _disk_dir is None:
+        return None
+    try:
+        with open(_cache_path(digest), 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    _remember(digest, data)
+    return data
+
+
+def store(digest, share_bytes):
+    """
+    写入缓存 (内存；开启磁盘缓存时同时落盘)
+    落盘时先写临时文件再原子替换，并发写入同一载体时不会读到半个文件；失败时静默忽略
+    """
+    _remember(digest, share_bytes)
+    if _disk_dir is None:
+        return
+    try:
+        os.makedirs(_disk_dir, exist_ok=True)
+        path = _cache_path(digest)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(share_bytes)
+        os.replace(tmp_path, path)
+        # 磁盘缓存同样受条目数上限约束，删除最旧的文件
+        files = _disk_files()
+        for old in files[:max(0, len(files) - MAX_ENTRIES)]:
+            os.remove(old)
+    except OSError:
+        pass
+
+
+def clear():
+    """清空内存缓存，并删除磁盘缓存目录中的全部缓存文件"""
+    global _memory_bytes
+    with _lock:
+        _memory.clear()
+        _memory_bytes = 0
+    if _disk_dir is None:
+        return
+    for path in _disk_files():
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+CRT 像素级计算内核
+文件路径: src/secret_sharing/crt_kernels.py
+
+将 CRT 分割 (x mod m_i) 与合成 (sum(a_i * w_i) mod M) 的逐像素循环编译为原生代码。
+安装了 numba 时使用 @njit 并行内核 (显式签名，导入时即完成编译并缓存到磁盘)，
+否则退化为等价的 NumPy 向量化实现。
+
+对大图，还会按当前模数集生成专用内核：模数、权重与 M 以字面常量写入源码后再编译，
+LLVM 可将 `% m_i` 强度削减为乘法+移位，并完全展开模数循环。
+专用内核按模数元组缓存，配置变化时自然生成新的内核。
+"""
+
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from src.secret_sharing.math_utils import mod_inverse, get_product
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+INT64_MAX = int(np.iinfo(np.int64).max)
+
+# 像素数不少于该值时使用按模数特化的内核 (特化内核需额外一次编译)
+SPECIALIZE_MIN_PIXELS = 1 << 16
+
+
+if NUMBA_AVAILABLE:
+    @njit("void(int64[::1], int64[::1], uint16[:, ::1])", cache=True, parallel=True, fastmath=True)
+    def _split_kernel(pixels, moduli, out):
+        """逐像素计算 n 个余数，out 形状为 (n, P)"""
+        n = moduli.shape[0]
+        for p in prange(pixels.shape[0]):
+            v = pixels[p]
+            for k in range(n):
+                out[k, p] = v % moduli[k]
+
+    @njit("void(int64[:, ::1], int64[::1], int64, int64[::1])", cache=True, parallel=True, fastmath=True)
+    def _combine_kernel(residues, weights, M, out):
+        """逐像素执行 CRT 合成: Y = sum(a_i * w_i) mod M"""
+        t = residues.shape[0]
+        for p in prange(residues.shape[1]):
+            acc = 0
+            for k in range(t):
+                acc = (acc + residues[k, p] * weights[k]) % M
+            out[p] = acc
+
+
+    @njit("void(uint16[:, ::1], int64[::1], int64, int64, int64, uint8[::1])",
+          cache=True, parallel=True, fastmath=True)
+    def _combine_mod_kernel(residues, weights, M, q, block, out):
+        """
+        CRT 合成并直接取像素: out = (sum(a_i * w_i) mod M) mod q
+        按 block 个像素 (若干整行) 分块，块间并行，块内 t 个份额的数据保持在缓存中
+        """
+        t, P = residues.shape
+        n_blocks = (P + block - 1) // block
+        for b in prange(n_blocks):
+            start = b * block
+            end = min(start + block, P)
+            for p in range(start, end):
+                acc = 0
+                for k in range(t):
+                    acc = (acc + residues[k, p] * weights[k]) % M
+                out[p] = acc % q
+
+    def _compile_source(src, name, signature):
+        """exec 生成的源码并以显式签名编译 (即时编译，不做磁盘缓存)"""
+        namespace = {'prange': prange}
+        exec(src, namespace)
+        return njit(signature, parallel=True, fastmath=True)(namespace[name])
+
+    @lru_cache(maxsize=None)
+    def _specialized_split(moduli):
+        """生成并编译以 moduli (元组) 为常量的分割内核"""
+        lines = [
+            "def split_kernel(pixels, out):",
+            "    for p in prange(pixels.shape[0]):",
+            "        v = pixels[p]",
+        ]
+        lines += [f"        out[{k}, p] = v % {m}" for k, m in enumerate(moduli)]
+        return _compile_source("\n".join(lines) + "\n", "split_kernel",
+                               "void(int64[::1], uint16[:, ::1])")
+
+    @lru_cache(maxsize=None)
+    def _specialized_combine(moduli):
+        """生成并编译以 moduli (元组) 对应的权重与 M 为常量的合成内核"""
+        weights, M, _ = _cached_weights(moduli)
+        lines = [
+            "def combine_kernel(residues, out):",
+            "    for p in prange(residues.shape[1]):",
+            "        acc = 0",
+        ]
+        lines += [f"        acc = (acc + residues[{k}, p] * {w}) % {M}" for k, w in enumerate(weights)]
+        lines.append("        out[p] = acc")
+        return _compile_source("\n".join(lines) + "\n", "combine_kernel",
+                               "void(int64[:, ::1], int64[::1])")
+
+
+def crt_weights(moduli):
+    """
+    预计算 CRT 权重 w_i = M_i * (M_i^{-1} mod m_i)
+    返回:
+        weights (list of int): 权重列表
+        M (int): 模数积
+    """
+    M = get_product(moduli)
+    weights = []
+    for m_i in moduli:
+        M_i = M // m_i
+        weights.append(M_i * mod_inverse(M_i, m_i))
+    return weights, M
+
+
+@lru_cache(maxsize=None)
+def _cached_weights(moduli):
+    """
+    按模数元组缓存 CRT 参数 (模数集在程序运行期间通常不变，逐块合成时无需重复求逆)
+    返回:
+        (weights, M, weights_arr): weights_arr 为 int64 权重数组，中间积可能溢出 int64 时为 None
+    """
+    weights, M = crt_weights(moduli)
+    if max(moduli) * M > INT64_MAX:
+        return tuple(weights), M, None
+    weights_arr = np.asarray(weights, dtype=np.int64)
+    return tuple(weights), M, weights_arr
+
+
+def crt_split(pixels, moduli):
+    """
+    CRT 投影: 对每个像素计算 x mod m_i
+    参数:
+        pixels: 任意形状的非负整数数组 (内部展平)
+        moduli (list of int): 模数列表
+    返回:
+        np.ndarray: 形状 (n, P) 的 uint16 余数矩阵，第 i 行为第 i 个份额
+    """
+    flat = np.ascontiguousarray(pixels, dtype=np.int64).ravel()
+    moduli_arr = np.asarray(moduli, dtype=np.int64)
+    out = np.empty((moduli_arr.shape[0], flat.shape[0]), dtype=np.uint16)
+
+    if NUMBA_AVAILABLE and flat.shape[0] >= SPECIALIZE_MIN_PIXELS:
+        _specialized_split(tuple(int(m) for m in moduli))(flat, out)
+    elif NUMBA_AVAILABLE:
+        _split_kernel(flat, moduli_arr, out)
+    else:
+        out[:] = flat[None, :] % moduli_arr[:, None]
+    return out
+
+
+def crt_combine_mod(residues, moduli, q, out=None, block=None):
+    """
+    CRT 合成后直接对 q 取模得到像素值 (重构路径使用，省去 int64 中间结果)
+    参数:
+        residues: 形状 (t, P) 的余数矩阵，uint16 时无需拓宽
+        moduli (list of int): 与 residues 逐行对应的模数
+        q (int): 像素恢复模数
+        out: 可选的 uint8 输出缓冲区 (长度 P)
+        block (int, optional): 并行分块的像素数，通常取若干整行
+    返回:
+        np.ndarray: 长度 P 的 uint8 数组
+    """
+    moduli = tuple(int(m) for m in moduli)
+    _, M, weights_arr = _cached_weights(moduli)
+    residues = np.ascontiguousarray(np.asarray(residues), dtype=np.uint16)
+    if out is None:
+        out = np.empty(residues.shape[1], dtype=np.uint8)
+
+    if NUMBA_AVAILABLE and weights_arr is not None:
+        if block is None:
+            block = max(1, residues.shape[1] // (4 * (os.cpu_count() or 1)))
+        _combine_mod_kernel(residues, weights_arr, M, q, block, out)
+    else:
+        out[:] = crt_combine(residues, moduli) % q
+    return out
+
+
+def crt_combine(residues, moduli):
+    """
+    CRT 合成: 由 t 个份额的余数恢复 Y (mod M)
+    参数:
+        residues: 形状 (t, P) 的余数矩阵 (或 t 个一维数组组成的列表)
+        moduli (list of int): 与 residues 逐行对应的模数
+    返回:
+        np.ndarray: 长度 P 的 int64 数组
+    """
+    moduli = tuple(int(m) for m in moduli)
+    weights, M, weights_arr = _cached_weights(moduli)
+    residues = np.ascontiguousarray(np.asarray(residues), dtype=np.int64)
+
+    # 中间积 a_i * w_i < m_i * M，必须能放入 int64，否则回退到大整数运算
+    if weights_arr is None:
+        acc = np.zeros(residues.shape[1], dtype=object)
+        for row, w in zip(residues, weights):
+            acc += row.astype(object) * w
+        return (acc % M).astype(np.int64)
+
+    out = np.empty(residues.shape[1], dtype=np.int64)
+
+    if NUMBA_AVAILABLE and residues.shape[1] >= SPECIALIZE_MIN_PIXELS:
+        _specialized_combine(moduli)(residues, out)
+    elif NUMBA_AVAILABLE:
+        _combine_kernel(residues, weights_arr, M, out)
+    else:
+        out[:] = 0
+        for row, w in zip(residues, weights_arr):
+            out += (row * w) % M
+            out %= M
+    return out
@@ -1,12 +1,47 @@
 # -*- coding: utf-8 -*-
 import os
 import pickle
+import zipfile
 import numpy as np
 from PIL import Image
-from functools import reduce
 
 from src.config import Config
 from src.secret_sharing.scrambler import ArnoldScrambler
+from src.secret_sharing.crt_kernels import crt_combine, crt_combine_mod
+
+def _mmap_npz_member(path, name):
+    """
+    以内存映射方式打开 .npz 中未压缩 (ZIP_STORED) 的数组成员，不把整个数组读入内存
+    np.savez 生成的成员均为 STORED；压缩成员无法映射，返回None由调用方回退到 np.load
+    """
+    with zipfile.ZipFile(path) as zf:
+        info = zf.getinfo(name)
+        if info.compress_type != zipfile.ZIP_STORED:
+            return None
+    
+    with open(path, 'rb') as f:
+        # 跳过 ZIP 本地文件头 (30 字节定长部分 + 文件名 + 扩展字段)
+        f.seek(info.header_offset)
+        local_header = f.read(30)
+        name_len = int.from_bytes(local_header[26:28], 'little')
+        extra_len = int.from_bytes(local_header[28:30], 'little')
+        f.seek(info.header_offset + 30 + name_len + extra_len)
+        
+        # 解析 .npy 头部，得到数据在文件中的起始偏移
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        elif version == (2, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        else:
+            return None
+        offset = f.tell()
+    
+    if dtype.hasobject:
+        return None
+    order = 'F' if fortran_order else 'C'
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape, order=order)
+
 
 class ImageCRTReconstructor:
     """
@@ -18,6 +53,11 @@ class ImageCRTReconstructor:
     3. 支持反序列化和动态模数的重构。
     """
     
+    # CRT 合成时每次处理的图像行数 (按行块读取份额，限制峰值内存)
+    TILE_ROWS = 256
+    # 行块内再按该行数切分，交给 CRT 内核并行处理
+    PARALLEL_ROWS = 32
+    
     def __init__(self):
         # 初始化 Arnold 置乱器，用于逆置乱
         self.scrambler = ArnoldScrambler(iterations=10)
@@ -57,85 +97,117 @@ class ImageCRTReconstructor:
         
         # 提取模数列表
         moduli = [s['mod'] for s in valid_shares]
-        # 计算总积 M
-        M = reduce(lambda x, y: x * y, moduli)
-        
-        # 准备累加器 (使用 float64 或 object 防止中间溢出)
-        # data 可能是 flatten 的
         shape = valid_shares[0]['shape']
-        pixel_count = np.prod(shape)
-        
-        acc = np.zeros(pixel_count, dtype=object) 
         
-        for share in valid_shares:
-            mi = share['mod']
-            data = share['data'].astype(object) # 转换为大整数对象
-            Mi = M // mi
-            yi = self._modinv(Mi, mi)
-            
-            # CRT项: ai * Mi * yi
-            term = (data * Mi * yi)
-            acc += term
-            
-        # 最终取模
-        result_flat = (acc % M).astype(np.uint8) # 还原为像素值
+        # CRT项: sum(a_i * M_i * y_i) mod M，由 CRT 内核逐像素计算
+        residues = np.stack([np.asarray(s['data'], dtype=np.int64) for s in valid_shares])
+        result_flat = crt_combine(residues, moduli).astype(np.uint8) # 还原为像素值
         
         # 恢复形状
         return result_flat.reshape(shape)
 
-    def reconstruct_image(self, share_paths):
+    def load_bundle(self, path):
+        """
+        读取 SoA 布局的份额包 (shares.npz)，拆分为与 .npy 份额相同结构的字典列表
+        shares 矩阵以内存映射方式打开，各字典的 data 为其行视图，重构时按需分页读取
+        也兼容单个份额的扁平 .npz (data/shape/modulus/index/signature 各为独立数组)
+        """
+        with np.load(path) as bundle:
+            if 'shares' not in bundle.files:
+                return [self._load_flat_share(path, bundle)]
+        
+        shares = _mmap_npz_member(path, 'shares.npy')
+        with np.load(path) as bundle:
+            if shares is None:
+                shares = bundle['shares']
+            moduli = bundle['moduli']
+            indices = bundle['indices']
+            shape = tuple(int(x) for x in bundle['shape'])
+            original_shape = tuple(int(x) for x in bundle['original_shape'])
+            signature = bundle['signature'].tobytes() or None
+        
+        return [{
+            "index": int(indices[i]),
+            "modulus": int(moduli[i]),
+            "data": shares[i],
+            "shape": shape,
+            "original_shape": original_shape,
+            "signature": signature
+        } for i in range(shares.shape[0])]
+
+    def _load_flat_share(self, path, archive):
+        """
+        解析单个份额的扁平 .npz，返回与 .npy 份额相同结构的字典 (无需 pickle)
+        """
+        data = _mmap_npz_member(path, 'data.npy')
+        if data is None:
+            data = archive['data']
+        packet = {
+            "index": int(archive['index']),
+            "modulus": int(archive['modulus']),
+            "data": data,
+            "shape": tuple(int(x) for x in archive['shape']),
+            "signature": archive['signature'].tobytes() or None
+        }
+        if 'original_shape' in archive.files:
+            packet["original_shape"] = tuple(int(x) for x in archive['original_shape'])
+        return packet
+
+    def reconstruct_image(self, share_paths, cancel_event=None):
         """
         执行图像重构
         
         参数:
-            share_paths (list):.npy 份额文件的路径列表
+            share_paths (list): .npy / .npz 份额文件或 shares.npz 份额包的路径列表
+            cancel_event (threading.Event, optional): 置位时在下一个行块前中止重构
             
         返回:
             img (PIL.Image): 重构后的图像对象
             signature (bytes): 提取出的格签名
         """
-        # 1. 门限检查
         t = Config.T_THRESHOLD
-        if len(share_paths) < t:
-            raise ValueError(f"Insufficient shares. Need {t}, got {len(share_paths)}")
-        
-        print(f"[ImageCRTReconstructor] Loading {len(share_paths)} shares for reconstruction...")
+        print(f"[ImageCRTReconstructor] Loading {len(share_paths)} share files for reconstruction...")
         
         loaded_shares = []
         active_moduli = []
         original_shape = None
         extracted_sig = None
         
-        # 2. 加载数据与元数据校验
+        # 1. 加载数据与元数据校验
         for path in share_paths:
             try:
-                # allow_pickle=True 是必须的，因为我们存储了字典
-                packet = np.load(path, allow_pickle=True).item()
+                if path.endswith(".npz"):
+                    packets = self.load_bundle(path)
+                else:
+                    # allow_pickle=True 是必须的，因为我们存储了字典
+                    packets = [np.load(path, allow_pickle=True).item()]
             except Exception as e:
                 print(f"[Error] Failed to load {path}: {e}")
                 continue
-                
-            # 形状一致性检查
-            if original_shape is None:
-                original_shape = packet['shape']
-            elif original_shape != packet['shape']:
-                raise ValueError(f"Shape mismatch in share {path}. Expected {original_shape}, got {packet['shape']}")
-            
-            # 签名一致性检查 (简单验证)
-            if extracted_sig is None:
-                extracted_sig = packet['signature']
             
-            # 提取核心数据
-            loaded_shares.append(packet)
-            
-            # 验证模数索引
-            # 这是一个关键的安全检查：确保使用的是生成时对应的模数
-            if 'index' in packet and 'modulus' in packet:
-                idx = packet['index']
-                actual_mod = packet['modulus']
+            for packet in packets:
+                # 形状一致性检查
+                if original_shape is None:
+                    original_shape = packet['shape']
+                elif tuple(original_shape) != tuple(packet['shape']):
+                    raise ValueError(f"Shape mismatch in share {path}. Expected {original_shape}, got {packet['shape']}")
+                
+                # 签名一致性检查 (简单验证)
+                if extracted_sig is None:
+                    extracted_sig = packet['signature']
                 
-                # 直接使用份额中存储的模数，不再依赖Config.MODULI
-                active_moduli.append(actual_mod)
+                # 提取核心数据
+                loaded_shares.append(packet)
+                
+                # 验证模数索引
+                # 这是一个关键的安全检查：确保使用的是生成时对应的模数
+                if 'index' in packet and 'modulus' in packet:
+                    # 直接使用份额中存储的模数，不再依赖Config.MODULI
+                    active_moduli.append(packet['modulus'])
+        
+        # 2. 门限检查 (份额包可能包含多个份额，按实际载入数量计)
+        if len(loaded_shares) < t:
+            raise ValueError(f"Insufficient shares. Need {t}, got {len(loaded_shares)}")
         
         # 选取前 T 个份额进行恢复
         selected_shares = loaded_shares[:t]
@@ -146,48 +218,31 @@ class ImageCRTReconstructor:
 
         # 准备 CRT 参数
         active_moduli = [s['modulus'] for s in selected_shares]
-        # M = m_1 * m_2 * ... * m_t
-        M = reduce(lambda x, y: x * y, active_moduli)
-        
-        # 预计算 CRT 权重 w_i = M_i * (M_i^{-1} mod m_i)
-        # 这样 Y = sum(y_i * w_i) mod M
-        weights = []
-        for m_i in active_moduli:
-            M_i = M // m_i
-            inv = self._modinv(M_i, m_i)
-            weights.append(M_i * inv)
-            
-        # 转换为 numpy 数组以便进行矩阵广播计算
-        # weights_arr shape: (T,)
-        weights_arr = np.array(weights, dtype=object)
 
         # 2. 还原份额值 y_i (Recompose Shares)
         # 直接使用份额中的 data 作为余数数据，假设倍数为 0
         # 因为在 ImageCRTSplitter 中，份额数据是通过 flat_pixels % m 计算得到的
-        ys = []
-        for s in selected_shares:
-            # 从份额中获取 data 字段作为余数数据
-            rem = s['data'].astype(np.int64)
-            # 假设倍数为 0
-            y_i = rem
-            ys.append(y_i)
-        
-        # 3. 执行 CRT 逆运算
-        # 这部分代码参考了 reconstruct 方法
-        Y = np.zeros_like(ys[0])
-        for i in range(len(Y)):
-            # 对每个像素位置执行 CRT
-            values = [y[i] for y in ys]
-            weighted_sum = 0
-            for v, w in zip(values, weights):
-                weighted_sum += v * w
-            Y[i] = weighted_sum % M
-        
-        # 4. 提取秘密像素
-        # S = Y % q (或者 Y - A*q，但数学上等价于 % q，前提是 S < q)
-        # 文献中 q=257 > 255，所以 S = Y % 257 即可
+        share_rows = [s['data'] for s in selected_shares]
+        total = len(share_rows[0])
+        tile = self.TILE_ROWS * w * c
+        
         q = Config.LARGE_PRIME_Q
-        S_reconstructed = (Y % q).astype(np.uint8)
+        S_reconstructed = np.empty(total, dtype=np.uint8)
+        
+        # 按行块处理：内存映射的份额只有当前块对应的页会被读入
+        for start in range(0, total, tile):
+            if cancel_event is not None and cancel_event.is_set():
+                raise RuntimeError("Reconstruction cancelled")
+            end = min(start + tile, total)
+            ys = np.stack([np.asarray(row[start:end], dtype=np.uint16) for row in share_rows])
+            
+            # 3. 执行 CRT 逆运算
+            # Y = sum(y_i * w_i) mod M，逐像素循环由 CRT 内核按 PARALLEL_ROWS 行分块并行完成
+            # 4. 提取秘密像素
+            # S = Y % q (或者 Y - A*q，但数学上等价于 % q，前提是 S < q)
+            # 文献中 q=257 > 255，所以 S = Y % 257 即可 (与 Y 一起在内核中完成)
+            crt_combine_mod(ys, active_moduli, q, out=S_reconstructed[start:end],
+                            block=self.PARALLEL_ROWS * w * c)
         
         # 5. 执行 Arnold 逆置乱，恢复原始图像
         print("[ImageCRTReconstructor] Unscrambling image...")
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import os
 import time
+import concurrent.futures
 import numpy as np
 import pickle
 from PIL import Image
@@ -8,7 +9,9 @@ from math import gcd
 from functools import reduce
 
 from src.config import Config
+from src.io.fs import ensure_dir
 from src.secret_sharing.scrambler import ArnoldScrambler
+from src.secret_sharing.crt_kernels import crt_split
 
 class SharePayload:
     """
@@ -86,21 +89,13 @@ class ImageCRTSplitter:
         
         # 1. 预处理：扁平化
         # 将图像展平为一维数组，方便计算
-        flat_pixels = image_array.flatten().astype(int)
+        flat_pixels = image_array.flatten().astype(np.int64)
         
         # 2. 生成影子数据
-        # As = (pixel % mi)
-        shares_data = []
-        for m in self.moduli:
-            # CRT 投影运算: x mod m
-            # 结果转为 uint8 (因为模数通常 < 65535, 但为了隐写方便我们希望尽可能小)
-            # 如果模数 > 255，这里需要使用 uint16，但为了配合 8-bit 载体隐写，
-            # 论文1通常通过多通道或拆分字节处理。
-            # 为简化演示且模数 > 255 (如 257)，我们将数据存为 uint16 
-            # 注意：DCT隐写需要能够承载这些数据。
-            # 简化方案：直接保持 int 类型，由序列化层处理 bytes
-            shadow = (flat_pixels % m).astype(np.uint16)
-            shares_data.append(shadow)
+        # As = (pixel % mi)，由 CRT 内核一次性计算全部 n 个份额
+        # 模数 > 255 (如 257)，因此余数存为 uint16，由序列化层处理 bytes
+        # 注意：DCT隐写需要能够承载这些数据。
+        shares_data = crt_split(flat_pixels, self.moduli)
             
         # 3. 封装为 Payload
         payloads = []
@@ -115,7 +110,7 @@ class ImageCRTSplitter:
             
         return payloads
 
-    def split_image(self, image_path, signature_data=None, output_dir=None):
+    def split_image(self, image_path, signature_data=None, output_dir=None, bundle=False):
         """
         执行图像分割
         
@@ -123,15 +118,17 @@ class ImageCRTSplitter:
             image_path (str): 秘密图像路径
             signature_data (bytes, optional): 来自模块一的格签名数据
             output_dir (str, optional): 输出目录
+            bundle (bool, optional): 为 True 时将全部份额以 SoA 布局写入单个 shares.npz
+                (shares 为 (n, P) 连续矩阵)，而不是每个参与者一个 .npy 文件
         
         返回:
-            shares_data (list): 包含 N 个字典，每个字典存储该参与者的倍数图和余数图数据
+            saved_paths (list): 份额文件路径列表 (bundle=True 时仅含 shares.npz)
         """
         start_total = time.time()
         
         if output_dir is None:
             output_dir = Config.SHARES_DIR
-        os.makedirs(output_dir, exist_ok=True)
+        ensure_dir(output_dir)
         
         # 1. 读取图像
         try:
@@ -157,27 +154,56 @@ class ImageCRTSplitter:
         saved_paths = []
         
         # 4. 处理份额数据
-        for idx, share in enumerate(shares):
-            # 存储结构
-            share_packet = {
-                "index": idx,
-                "modulus": share.modulus,
-                "data": share.data,
-                "shape": share.shape,
-                "original_shape": original_shape,  # 原始图像尺寸
-                "signature": signature_data
-            }
-            shares_data.append(share_packet)
+        if bundle:
+            filepath = os.path.join(output_dir, "shares.npz")
+            self._save_bundle(filepath, shares, original_shape, signature_data)
+            print(f"[ImageCRTSplitter] Split complete in {time.time() - start_total:.4f}s. Bundled {len(shares)} shares.")
+            return [filepath]
+        
+        # 份额文件互相独立：写盘提交到线程池并行执行，与后续份额的封装重叠
+        max_workers = min(len(shares), os.cpu_count() or 1)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = []
+            for idx, share in enumerate(shares):
+                # 存储结构
+                share_packet = {
+                    "index": idx,
+                    "modulus": share.modulus,
+                    "data": share.data,
+                    "shape": share.shape,
+                    "original_shape": original_shape,  # 原始图像尺寸
+                    "signature": signature_data
+                }
+                shares_data.append(share_packet)
+                
+                # 保存份额为.npy文件
+                filename = f"share_{idx+1}_m{share.modulus}.npy"
+                filepath = os.path.join(output_dir, filename)
+                futures.append(pool.submit(np.save, filepath, share_packet))
+                saved_paths.append(filepath)
             
-            # 保存份额为.npy文件
-            filename = f"share_{idx+1}_m{share.modulus}.npy"
-            filepath = os.path.join(output_dir, filename)
-            np.save(filepath, share_packet)
-            saved_paths.append(filepath)
+            # 等待全部写盘完成，并抛出其中的异常
+            for future in futures:
+                future.result()
 
         print(f"[ImageCRTSplitter] Split complete in {time.time() - start_total:.4f}s. Generated {len(shares_data)} shares.")
         return saved_paths
 
+    def _save_bundle(self, filepath, shares, original_shape, signature_data):
+        """
+        以 SoA 布局保存全部份额: 一个 (n, P) 余数矩阵 + 模数/索引向量，
+        不使用 pickle，重构端可一次读入并整体送入 CRT 内核。
+        """
+        np.savez(
+            filepath,
+            shares=np.stack([share.data for share in shares]),
+            moduli=np.array([share.modulus for share in shares], dtype=np.uint32),
+            indices=np.array([share.index for share in shares], dtype=np.uint32),
+            shape=np.array(shares[0].shape, dtype=np.int64),
+            original_shape=np.array(original_shape, dtype=np.int64),
+            signature=np.frombuffer(signature_data or b"", dtype=np.uint8)
+        )
+
 # --- 单元测试代码 (直接运行此文件可测试) ---
 if __name__ == "__main__":
     # 生成测试用的模数
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+测试密钥/清单编解码模块
+"""
+import os
+import sys
+import json
+import tempfile
+import numpy as np
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.io import codec, lattice_codec
+
+
+def test_codec_roundtrip():
+    """测试 dump/load 往返以及旧 JSON 文件的兼容读取与迁移"""
+    print("=== 测试编解码往返 ===")
+    obj = {"version": "LWE-1.0", "s": [[1, -2, 3], [4, 5, -6]], "seed": "ab" * 32}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "user.sk")
+        codec.dump({**obj, "t": np.arange(4, dtype=np.int32)}, path)
+        loaded = codec.load(path)
+        assert [list(p) for p in loaded["s"]] == obj["s"]
+        assert list(loaded["t"]) == [0, 1, 2, 3]
+
+        # 旧格式: 缩进 JSON
+        legacy = os.path.join(tmp, "legacy.pk")
+        with open(legacy, 'w') as f:
+            json.dump(obj, f, indent=4)
+        assert codec.load(legacy)["seed"] == obj["seed"]
+        codec.migrate_json(legacy)
+        assert codec.load(legacy)["version"] == obj["version"]
+
+    print("✓ 编解码往返测试通过")
+
+
+def test_lattice_codec_roundtrip():
+    """测试密钥定长二进制格式的往返，以及经由 codec.load 的自动识别"""
+    print("=== 测试密钥二进制格式 ===")
+    sk = {"version": "LWE-1.0", "public_seed": "ab" * 32,
+          "s": [[1, -2, 3, 0], [4, 5, -6, 7]], "t": [[8380416, -4190208, 0, 1]]}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "user.sk")
+        lattice_codec.dump(sk, path)
+        assert codec.load(path) == sk
+        arrays = lattice_codec.load(path, as_arrays=True)
+        assert arrays["s"].dtype == np.int32 and arrays["s"].shape == (2, 4)
+
+        # int8 短向量保持原宽度写入
+        lattice_codec.dump({**sk, "s": np.asarray(sk["s"], dtype=np.int8)}, path)
+        assert lattice_codec.load(path, as_arrays=True)["s"].dtype == np.int8
+        assert codec.load(path) == sk
+
+    print("✓ 密钥二进制格式测试通过")
+
+
+if __name__ == "__main__":
+    test_codec_roundtrip()
+    test_lattice_codec_roundtrip()
@@ -76,5 +76,46 @@ def test_crt_sharing():
     
     return max_diff == 0
 
+def test_crt_kernels_roundtrip():
+    """测试CRT内核：分割后任取t个份额应能还原全部像素"""
+    from src.secret_sharing.crt_kernels import crt_split, crt_combine
+    
+    moduli = generate_secure_moduli(5, 3)
+    pixels = np.random.randint(0, 256, 4096)
+    
+    residues = crt_split(pixels, moduli)
+    assert np.array_equal(residues, np.stack([pixels % m for m in moduli]))
+    
+    # 任意 t 个份额均可恢复
+    Y = crt_combine(residues[1:4], moduli[1:4])
+    assert np.array_equal(Y, pixels)
+    
+    # 大输入走按模数特化的内核，结果应一致
+    from src.secret_sharing.crt_kernels import SPECIALIZE_MIN_PIXELS
+    big = np.random.randint(0, 256, SPECIALIZE_MIN_PIXELS)
+    residues = crt_split(big, moduli)
+    assert np.array_equal(residues, np.stack([big % m for m in moduli]))
+    assert np.array_equal(crt_combine(residues[:3], moduli[:3]), big)
+    
+    # 合成并取模的融合内核
+    from src.secret_sharing.crt_kernels import crt_combine_mod
+    assert np.array_equal(crt_combine_mod(residues[:3], moduli[:3], 257, block=1000), big)
+
+def test_crt_bundle_roundtrip(tmp_path):
+    """测试SoA份额包 (shares.npz) 的分割与重构"""
+    test_img_path = str(tmp_path / "test_crt_bundle.png")
+    test_img = np.random.randint(0, 256, (48, 40, 3), dtype=np.uint8)
+    Image.fromarray(test_img).save(test_img_path)
+    
+    moduli = generate_secure_moduli(5, 3)
+    splitter = ImageCRTSplitter(5, 3, moduli)
+    share_paths = splitter.split_image(
+        test_img_path, signature_data=b"sig", output_dir=str(tmp_path / "shares"), bundle=True)
+    assert len(share_paths) == 1 and share_paths[0].endswith(".npz")
+    
+    reconstructed_img, signature = ImageCRTReconstructor().reconstruct_image(share_paths)
+    assert signature == b"sig"
+    assert np.array_equal(np.array(reconstructed_img), test_img)
+
 if __name__ == "__main__":
     test_crt_sharing()
@@ -207,6 +207,107 @@ def test_threshold_signature():
     print("✅ 阈值签名测试完成！")
 
 
+def test_sign_kernels():
+    """
+    测试阶段 2 数值内核与逐系数参考实现一致
+    """
+    from src.crypto_lattice import sign_kernels
+    from src.crypto_lattice.ntt import polymul_rq
+    
+    q = Config.Q
+    alpha = 2 * Config.GAMMA2
+    s = np.random.randint(-Config.ETA, Config.ETA + 1, (Config.L, Config.N))
+    y = np.random.randint(-1000, 1000, (Config.L, Config.N))
+    c = [0] * Config.N
+    for idx in np.random.choice(Config.N, Config.TAU, replace=False):
+        c[idx] = int(np.random.choice([-1, 1]))
+    
+    z, max_norm = sign_kernels.response(y, s, c, q)
+    expected = [LatticeUtils.poly_add(y[j].tolist(), polymul_rq(c, s[j].tolist()), q) for j in range(Config.L)]
+    assert z.tolist() == expected, "response 结果不正确"
+    assert max_norm == LatticeUtils.vec_infinity_norm([[LatticeUtils.center_mod(v, q) for v in p] for p in expected])
+    
+    Ay = np.random.randint(0, q, (Config.K, Config.N))
+    R = [LatticeUtils.poly_sub(Ay[k].tolist(), polymul_rq(c, s[k].tolist()), q) for k in range(Config.K)]
+    expected_low = max(abs(LatticeUtils.low_bits(v, alpha, q)) for p in R for v in p)
+    assert sign_kernels.lowbits_norm(Ay, s, c, q, alpha) == expected_low, "lowbits_norm 结果不正确"
+    
+    # 挑战采样: 与逐字节拒绝采样的参考实现一致
+    digest = os.urandom(Config.N // 2)
+    ref = [0] * Config.N
+    weight = 0
+    for b in digest:
+        if weight >= Config.TAU: break
+        if ref[b % Config.N] == 0:
+            ref[b % Config.N] = 1 if (b & 1) else -1
+            weight += 1
+    assert sign_kernels.sample_challenge(digest, Config.N, Config.TAU).tolist() == ref, "sample_challenge 结果不正确"
+
+
+def test_ntt_polymul():
+    """
+    测试 NTT 往返，以及 NTT 乘法与负循环卷积的定义一致
+    """
+    from src.crypto_lattice.ntt import ntt_engine, polymul_rq, _karatsuba
+    
+    q, n = Config.Q, Config.N
+    a = np.random.randint(-q, q, n)
+    b = np.random.randint(-Config.ETA, Config.ETA + 1, n)
+    assert ntt_engine.inv_ntt(ntt_engine.ntt(a)) == (a % q).tolist(), "NTT 往返失败"
+    
+    # 参考: 普通卷积后按 X^N = -1 折叠
+    full = np.convolve(a % q, b % q).astype(object)
+    expected = full[:n]
+    expected[:n - 1] -= full[n:]
+    assert polymul_rq(a, b) == (expected % q).tolist(), "NTT 乘法结果不正确"
+    
+    # Karatsuba 回退路径 (含奇数长度的拆分)
+    for length in (n, 75):
+        x = np.random.randint(0, q, length)
+        y = np.random.randint(0, q, length)
+        assert _karatsuba(x, y, q).tolist() == (np.convolve(x.astype(object), y.astype(object)) % q).tolist()
+    
+    # 参数不支持 NTT 时: matvec_rq 走系数域，NTT 域接口明确报错
+    from src.crypto_lattice.ntt import matvec_rq, to_ntt
+    A = np.random.randint(0, q, (Config.K, Config.L, n))
+    s = np.random.randint(-Config.ETA, Config.ETA + 1, (Config.L, n))
+    expected = matvec_rq(A, s)
+    Config.NTT_FRIENDLY = False
+    try:
+        assert (matvec_rq(A, s) == expected).all(), "系数域 matvec_rq 结果不正确"
+        try:
+            to_ntt(s)
+            assert False, "to_ntt 应在参数不支持 NTT 时报错"
+        except ValueError:
+            pass
+    finally:
+        Config.NTT_FRIENDLY = True
+
+
+def test_phase2_response_batch(tmp_path, monkeypatch):
+    """
+    测试批量拒绝采样与逐次调用 phase2_response 的结果一致
+    """
+    # setup_system 会写出密钥文件，重定向到临时目录
+    monkeypatch.setattr(Config, 'KEYS_DIR', str(tmp_path))
+    keygen = KeyGenerator()
+    _, party_keys = keygen.setup_system(Config.N_PARTICIPANTS)
+    signer = ThresholdSigner(party_keys[0]['sk'], party_keys[0]['id'])
+    aggregator = SignatureAggregator()
+    message = b"Batch rejection sampling"
+    
+    commitments = signer.phase1_commitment_batch(2)
+    sums = [aggregator.aggregate_w_shares([w]) for w in commitments]
+    candidates, flags = signer.phase2_response_batch(sums, message)
+    assert len(candidates) == 2 and flags.shape == (2,)
+    
+    # 同一掩码下逐次计算的结果应相同
+    for i in range(2):
+        signer.y = signer.y_batch[i].tolist()
+        assert signer.phase2_response(sums[i], message) == candidates[i]
+        assert flags[i] == (candidates[i] is not None)
+
+
 def main():
     """
     运行所有测试
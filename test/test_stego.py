@@ -150,5 +150,26 @@ def test_crt_stego():
             if os.path.exists(path):
                 os.remove(path)
 
+def test_block_dct_matches_cv2():
+    """
+    测试批量分块DCT与逐块 cv2.dct 结果一致
+    """
+    from src.image_stego.utils import BlockDCTUtils
+    
+    channel = np.random.rand(37, 53).astype(np.float32) * 255
+    blocks = BlockDCTUtils.to_blocks(channel)
+    coeffs = BlockDCTUtils.dct(blocks)
+    
+    k = 0
+    for i in range(0, 32, 8):
+        for j in range(0, 48, 8):
+            assert np.allclose(coeffs[k], cv2.dct(channel[i:i+8, j:j+8]), atol=1e-3)
+            k += 1
+    
+    # 逆变换并写回后应还原原通道
+    restored = channel.copy()
+    BlockDCTUtils.from_blocks(BlockDCTUtils.idct(coeffs), restored)
+    assert np.allclose(restored, channel, atol=1e-3)
+
 if __name__ == "__main__":
     test_crt_stego()
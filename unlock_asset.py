@@ -1,9 +1,9 @@
 import os
-import json
-import hashlib
 import uuid
 from PIL import Image
 
+from src.io import codec
+from src.io.digest import integrity_digest
 from src.image_stego.dct_extract import DCTExtractor
 from src.crypto_lattice.signer import LatticeSigner
 from src.secret_sharing.reconstructor import ImageCRTReconstructor
@@ -24,8 +24,7 @@ def main():
         print("❌ 错误: 找不到资产清单 (asset_manifest.json)")
         return
         
-    with open(manifest_path, 'r') as f:
-        manifest = json.load(f)
+    manifest = codec.load(manifest_path)
         
     t = manifest['threshold']
     print(f"[System] 恢复门限: {t} (至少需要 {t} 个授权份额)")
@@ -77,7 +76,7 @@ def main():
         # C. 验证指纹 (Integrity Check)
         # 我们必须验证提取出的 bytes 的哈希是否等于清单里的 hash
         # 注意：这里验证的是 share_bytes (序列化后)
-        current_hash = hashlib.sha256(share_bytes).hexdigest()
+        current_hash = integrity_digest(share_bytes, manifest.get('fingerprint_algo', 'sha256'))
         
         if current_hash != entry['share_fingerprint']:
             print(f"   ❌ 指纹不匹配! (Expected: {entry['share_fingerprint'][:6]}...)")
@@ -98,10 +97,8 @@ def main():
             continue
             
         print(f"   🔐 正在请求 [{owner_name}] 授权...")
-        with open(sk_path, 'r') as f:
-            sk = json.load(f)
-        with open(pk_path, 'r') as f:
-            pk = json.load(f) # 需要公钥来验证
+        sk = codec.load(sk_path)
+        pk = codec.load(pk_path) # 需要公钥来验证
             
         # 构造待签名消息: Hash(Share) + SessionID
         msg = (current_hash + session_id).encode()